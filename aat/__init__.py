@@ -6,13 +6,15 @@ from .core import (  # noqa: F401
     ExchangeType,
     Data,
     Event,
+    EventBatch,
     Order,
     Account,
     Position,
     Trade,
     OrderBook,
+    runInExecutor,
 )
-from .engine import TradingEngine  # noqa: F401
+from .engine import TradingEngine, BacktestEngine  # noqa: F401
 from .strategy import *  # noqa: F401, F403
 
 __version__ = "0.1.0"
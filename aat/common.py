@@ -3,7 +3,6 @@ from typing import Callable, List
 import os
 import itertools
 import functools
-import pandas as pd  # type: ignore
 
 
 class AATException(Exception):
@@ -50,6 +49,8 @@ def id_generator() -> Callable[[], int]:
 
 def _merge(lst1: List, lst2: List, sum: bool = True) -> List:
     """merge two lists of (val, datetime) and accumulate"""
+    import pandas as pd  # type: ignore
+
     df1 = pd.DataFrame(lst1, columns=("val1", "date1"))
     df1.set_index("date1", inplace=True)
     # df1.drop_duplicates(inplace=True)
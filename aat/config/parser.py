@@ -45,6 +45,8 @@ def _args_to_dict(args: Any) -> dict:
     ret["general"]["load_accounts"] = args.load_accounts
     ret["general"]["api"] = args.api
     ret["general"]["timezone"] = args.timezone
+    ret["general"]["checkpoint"] = args.checkpoint
+    ret["general"]["restore"] = args.restore
     ret["exchange"] = {
         "exchanges": list(
             _.split(",") for _ in itertools.chain.from_iterable(args.exchanges)
@@ -63,6 +65,11 @@ def getStrategies(strategies: List) -> List:
         raise Exception("Must provide strategies")
 
     for strategy in strategies:
+        if not isinstance(strategy, (str, list)):
+            # already constructed
+            strategy_instances.append(strategy)
+            continue
+
         if isinstance(strategy, list):
             mod, clazz = strategy[0].split(":")
             args = strategy[1:]
@@ -126,6 +133,19 @@ def parseConfig(argv: Optional[list] = None) -> dict:
         default=False,
     )
 
+    parser.add_argument(
+        "--checkpoint",
+        help="File to periodically save order and portfolio state to",
+        default="",
+    )
+
+    parser.add_argument(
+        "--restore",
+        action="store_true",
+        help="Restore order and portfolio state from the checkpoint",
+        default=False,
+    )
+
     parser.add_argument(
         "--trading_type",
         help='Trading Type in ("live", "sandbox", "simulation", "backtest")',
@@ -153,6 +173,13 @@ def parseConfig(argv: Optional[list] = None) -> dict:
 
     # Every engine run requires a static config object
     if args.config:
-        return _config_to_dict(args.config)
+        config = _config_to_dict(args.config)
+
+        # warm restart with the same config
+        if args.checkpoint:
+            config.setdefault("general", {})["checkpoint"] = args.checkpoint
+        if args.restore:
+            config.setdefault("general", {})["restore"] = "1"
+        return config
 
     return _args_to_dict(args)
@@ -1,8 +1,9 @@
-from .data import Data, Error, Event, Order, Trade
+from .clock import Clock, clock, currentClock, useClock
+from .data import Data, Error, Event, EventBatch, Order, Trade
 from .exchange import ExchangeType
 
 # from .execution import OrderManager
-from .handler import EventHandler, PrintHandler
+from .handler import EventHandler, PrintHandler, runInExecutor
 from .instrument import Instrument, TradingDay
 from .order_book import OrderBook
 from .position import Account, CashPosition, Position
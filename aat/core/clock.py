@@ -0,0 +1,96 @@
+import time
+from contextvars import ContextVar
+from datetime import datetime, tzinfo
+from typing import Optional
+
+
+class Clock(object):
+    """Clock owned by an engine, and shared with its exchanges, journal, and
+    data constructed while it runs (e.g. the default timestamp of an
+    `Order`, see `currentClock`).
+
+    While an engine runs live, the clock is ticked once per event, caching
+    the monotonic and wall clock times in nanoseconds, and `now` converts
+    the wall clock time to a datetime at most once per tick. Everything
+    handling the same event sees the same time, and strategies can call
+    `now` in tight loops. Offline, the engine sets the simulated time, which
+    `now` hands out instead.
+
+    Outside of a running engine, the clock just reads the current time"""
+
+    def __init__(self) -> None:
+        self._tz: Optional[tzinfo] = None
+        self._ticking = False
+        self._simulated: Optional[datetime] = None
+        self._monotonic_ns = 0
+        self._time_ns = 0
+        self._now: Optional[datetime] = None
+
+        # the last whole second converted, as timezone conversion is slow
+        self._second = -1
+        self._second_now = datetime.fromtimestamp(0)
+
+    def live(self, tz: Optional[tzinfo] = None) -> None:
+        """cache the time as of each `tick`, converting it into timezone `tz`"""
+        self._tz = tz
+        self._second = -1
+        self._ticking = True
+        self._simulated = None
+        self.tick()
+
+    def simulate(self, when: datetime) -> None:
+        """hand out the simulated time `when`, e.g. of the last event replayed"""
+        self._simulated = when
+
+    def reset(self) -> None:
+        """stop caching or simulating, and read the current time again"""
+        self._tz = None
+        self._ticking = False
+        self._simulated = None
+        self._now = None
+
+    def tick(self) -> None:
+        """advance the cached time to the current time"""
+        self._monotonic_ns = time.monotonic_ns()
+        self._time_ns = time.time_ns()
+        self._now = None
+
+    def monotonic_ns(self) -> int:
+        """monotonic time in nanoseconds, as of the last tick"""
+        return self._monotonic_ns if self._ticking else time.monotonic_ns()
+
+    def time_ns(self) -> int:
+        """wall clock time in nanoseconds since the epoch, as of the last tick"""
+        return self._time_ns if self._ticking else time.time_ns()
+
+    def now(self) -> datetime:
+        """the simulated time, or the wall clock time as of the last tick"""
+        if self._simulated is not None:
+            return self._simulated
+        if not self._ticking:
+            return datetime.now()
+        if self._now is None:
+            seconds, nanoseconds = divmod(self._time_ns, 1_000_000_000)
+            if seconds != self._second:
+                self._second = seconds
+                self._second_now = datetime.fromtimestamp(seconds, tz=self._tz)
+            self._now = self._second_now.replace(microsecond=nanoseconds // 1000)
+        return self._now
+
+
+# process wide default, for code running outside of an engine
+clock = Clock()
+
+# clock of the engine running in the current context
+_current: ContextVar[Clock] = ContextVar("clock", default=clock)
+
+
+def currentClock() -> Clock:
+    """the clock of the engine running in this context (e.g. for a strategy
+    constructing an `Order`), or the process wide `clock` outside of one"""
+    return _current.get()
+
+
+def useClock(clock: Clock) -> None:
+    """make `clock` the current clock of this context, and the tasks it creates"""
+    _current.set(clock)
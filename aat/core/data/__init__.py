@@ -1,3 +1,4 @@
+from .batch import EventBatch  # noqa: F401
 from .data import Data  # noqa: F401
 from .error import Error  # noqa: F401
 from .event import Event  # noqa: F401
@@ -0,0 +1,96 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, TYPE_CHECKING
+
+from .event import Event
+from ..instrument import Instrument
+from ...config import EventType
+
+if TYPE_CHECKING:
+    import numpy as np  # type: ignore
+
+
+def _datetime64(timestamp: Optional[datetime]) -> "np.datetime64":
+    import numpy as np  # type: ignore
+
+    if timestamp is None:
+        return np.datetime64("NaT", "ns")
+    if timestamp.tzinfo:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(timestamp, "ns")
+
+
+class EventBatch(object):
+    """A run of consecutive events of the same type, delivered together to
+    batch callbacks like `onTradeBatch`. Iterating yields the underlying
+    events, while `prices`, `volumes`, and `timestamps` give a columnar
+    view of their targets as numpy arrays"""
+
+    __slots__ = ["__type", "__events", "__columns"]
+
+    def __init__(self, type: EventType, events: List[Event]) -> None:
+        self.__type = type
+        self.__events = events
+        self.__columns: Dict[str, Any] = {}
+
+    # ******** #
+    # Readonly #
+    # ******** #
+    @property
+    def type(self) -> EventType:
+        return self.__type
+
+    @property
+    def events(self) -> List[Event]:
+        return self.__events
+
+    @property
+    def instruments(self) -> List[Optional[Instrument]]:
+        return [getattr(e.target, "instrument", None) for e in self.__events]
+
+    @property
+    def prices(self) -> "np.ndarray":
+        """price of each event's target, or NaN if it has none"""
+        return self._column("price")
+
+    @property
+    def volumes(self) -> "np.ndarray":
+        """volume of each event's target, or NaN if it has none"""
+        return self._column("volume")
+
+    @property
+    def timestamps(self) -> "np.ndarray":
+        """timestamp of each event's target as `datetime64[ns]` (timezone aware
+        timestamps are converted to UTC), or NaT if it has none"""
+        import numpy as np  # type: ignore
+
+        if "timestamp" not in self.__columns:
+            self.__columns["timestamp"] = np.array(
+                [
+                    _datetime64(getattr(e.target, "timestamp", None))
+                    for e in self.__events
+                ],
+                dtype="datetime64[ns]",
+            )
+        return self.__columns["timestamp"]
+
+    def _column(self, attr: str) -> "np.ndarray":
+        import numpy as np  # type: ignore
+
+        if attr not in self.__columns:
+            self.__columns[attr] = np.array(
+                [getattr(e.target, attr, np.nan) for e in self.__events],
+                dtype=np.float64,
+            )
+        return self.__columns[attr]
+
+    def __len__(self) -> int:
+        return len(self.__events)
+
+    def __iter__(self) -> Iterator[Event]:
+        return iter(self.__events)
+
+    def __getitem__(self, index: int) -> Event:
+        return self.__events[index]
+
+    def __repr__(self) -> str:
+        return f"EventBatch(type={self.type}, events={len(self)})"
@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING, Any, List, Optional
 from aat.common import _in_cpp
 from aat.config import EventType, OrderFlag, OrderType, Side
 
+from ..clock import currentClock
 from ..exchange import ExchangeType
 from ..instrument import Instrument
 
@@ -56,7 +57,7 @@ def _make_cpp_order(
     """helper method to ensure all arguments are setup"""
     return OrderCpp(
         id or "0",
-        timestamp or datetime.now(),
+        timestamp or currentClock().now(),
         volume,
         price,
         side,
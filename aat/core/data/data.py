@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import Mapping, Union, Type, Optional, Any, cast
 
 from .cpp import _CPP, _make_cpp_data
+from ..clock import currentClock
 from ..exchange import ExchangeType
 from ..instrument import Instrument
 from ...common import id_generator
@@ -34,7 +35,8 @@ class Data(object):
     ) -> None:
         self.__id: int = cast(int, kwargs.get("id", _ID_GENERATOR()))
         self.__timestamp: datetime = cast(
-            datetime, kwargs.get("timestamp", datetime.now())
+            datetime,
+            kwargs["timestamp"] if "timestamp" in kwargs else currentClock().now(),
         )
 
         assert instrument is None or isinstance(instrument, Instrument)
@@ -2,6 +2,7 @@ from datetime import datetime
 from traceback import format_exception
 from typing import Any, Callable, Dict, Union
 from ...config import DataType
+from ..clock import currentClock
 
 
 class Error(object):
@@ -22,7 +23,9 @@ class Error(object):
         handler: Callable,
         **kwargs: Any,
     ) -> None:
-        self.__timestamp = kwargs.get("timestamp", datetime.now())
+        self.__timestamp = (
+            kwargs["timestamp"] if "timestamp" in kwargs else currentClock().now()
+        )
         self.__type = DataType.ERROR
         self.__target = target
         self.__exception = exception
@@ -33,7 +36,7 @@ class Error(object):
     # Readonly #
     # ******** #
     @property
-    def timestamp(self) -> int:
+    def timestamp(self) -> datetime:
         return self.__timestamp
 
     @timestamp.setter
@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import Any, Mapping, Optional, Type, Union, cast
 
 from ...config import DataType, OrderFlag, OrderType, Side
+from ..clock import currentClock
 from ..exchange import ExchangeType
 from ..instrument import Instrument
 from .cpp import _CPP, _make_cpp_order
@@ -51,7 +52,7 @@ class Order(object):
         self.__id = kwargs.get(
             "id", 0
         )  # on construction, provide no ID until exchange assigns one
-        self.__timestamp = kwargs.get("timestamp") or datetime.now()
+        self.__timestamp = kwargs.get("timestamp") or currentClock().now()
         self.__type = DataType.ORDER
 
         assert isinstance(instrument, Instrument)
@@ -233,9 +234,9 @@ class Order(object):
             "filled": self.filled,
             "order_type": self.order_type.value,
             "flag": self.flag.value,
-            "stop_target": self.stop_target.json()  # type: ignore
-            if self.stop_target
-            else "",
+            "stop_target": (
+                self.stop_target.json() if self.stop_target else ""  # type: ignore
+            ),
         }
 
     @staticmethod
@@ -1,2 +1,2 @@
-from .handler import EventHandler  # noqa: F401
+from .handler import EventHandler, runInExecutor  # noqa: F401
 from .print import PrintHandler  # noqa: F401
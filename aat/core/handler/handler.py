@@ -1,7 +1,7 @@
 from abc import ABCMeta, abstractmethod
 from inspect import isabstract
 from typing import TYPE_CHECKING, Callable, Optional, Tuple
-from ..data import Event
+from ..data import Event, EventBatch
 from ...config import EventType
 
 if TYPE_CHECKING:
@@ -9,6 +9,14 @@ if TYPE_CHECKING:
     from aat.engine import StrategyManager
 
 
+def runInExecutor(function: Callable) -> Callable:
+    """decorator to mark a synchronous callback as needing to run in the
+    engine's thread pool executor. By default, synchronous callbacks run
+    inline on the event loop"""
+    setattr(function, "_executor", True)
+    return function
+
+
 class EventHandler(metaclass=ABCMeta):
     _manager: "StrategyManager"
 
@@ -64,6 +72,12 @@ class EventHandler(metaclass=ABCMeta):
             EventType.CANCELED: (self._valid_callback("onCanceled"),),
         }.get(event_type, tuple())
 
+    def batchCallback(self, event_type: EventType) -> Optional[Callable]:
+        return {
+            EventType.TRADE: self._valid_callback("onTradeBatch"),
+            EventType.DATA: self._valid_callback("onDataBatch"),
+        }.get(event_type, None)
+
     ################################################
     # Event Handler Methods                        #
     #                                              #
@@ -97,6 +111,14 @@ class EventHandler(metaclass=ABCMeta):
     async def onData(self, event: Event) -> None:
         """Called whenever other data is received"""
 
+    async def onTradeBatch(self, batch: EventBatch) -> None:
+        """Called with a batch of consecutive `Trade` events, in place of `onTrade`"""
+        pass
+
+    async def onDataBatch(self, batch: EventBatch) -> None:
+        """Called with a batch of consecutive data events, in place of `onData`"""
+        pass
+
     async def onHalt(self, event: Event) -> None:
         """Called whenever an exchange `Halt` event is received, i.e. an event to stop trading"""
         pass
@@ -158,6 +180,8 @@ setattr(EventHandler.onCancel, "_original", 1)
 setattr(EventHandler.onChange, "_original", 1)
 setattr(EventHandler.onFill, "_original", 1)
 setattr(EventHandler.onData, "_original", 1)
+setattr(EventHandler.onTradeBatch, "_original", 1)
+setattr(EventHandler.onDataBatch, "_original", 1)
 setattr(EventHandler.onHalt, "_original", 1)
 setattr(EventHandler.onContinue, "_original", 1)
 setattr(EventHandler.onError, "_original", 1)
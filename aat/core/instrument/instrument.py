@@ -391,6 +391,34 @@ class Instrument(object):
     def __hash__(self) -> int:
         return hash(str(self))
 
+    def __reduce__(self) -> Tuple:
+        # rebuild through the constructor rather than restoring slots, so
+        # unpickled instruments are looked up in (or added to) the instrumentdb
+        kwargs = {
+            "trading_day": self.tradingDay,
+            "broker_exchange": self.brokerExchange,
+            "broker_id": self.brokerId,
+            "currency": self.currency,
+            "underlying": self.underlying,
+            "leg1": self.leg1,
+            "leg2": self.leg2,
+            "leg1_side": self.leg1Side,
+            "leg2_side": self.leg2Side,
+            "expiration": self.expiration,
+            "price_increment": self.priceIncrement,
+            "unit_value": self.unitValue,
+            "option_type": self.optionType,
+        }
+        return (
+            _unpickle,
+            (
+                self.name,
+                self.type,
+                list(self.exchanges),
+                {k: v for k, v in kwargs.items() if v is not None},
+            ),
+        )
+
     def json(self) -> dict:
         return {
             "name": self.name,
@@ -457,3 +485,22 @@ class Instrument(object):
 
     def __repr__(self) -> str:
         return f"Instrument({self.name}-{self.type})"
+
+
+def _unpickle(
+    name: str, type: InstrumentType, exchanges: List[ExchangeType], kwargs: Dict
+) -> Instrument:
+    exchange = exchanges[0] if exchanges else ExchangeType("")
+
+    # avoid scanning the instrumentdb for instruments seen before
+    instrument = Instrument._instrumentdb._by_type_and_exchange.get(
+        (name, type, exchange)
+    )
+    if instrument is not None and all(e in instrument.exchanges for e in exchanges):
+        return instrument
+
+    instrument = Instrument(name, type, exchange, **kwargs)
+    for exchange in exchanges[1:]:
+        # add the other exchanges
+        instrument.__init__(name, type, exchange)  # type: ignore
+    return instrument
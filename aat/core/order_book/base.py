@@ -1,10 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Iterator, List, Optional, Tuple, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union, TYPE_CHECKING
 
 from .price_level import PriceLevelRO
 from ..data import Order
 from ...config import Side
 
+if TYPE_CHECKING:
+    import numpy as np  # type: ignore
+
 
 class OrderBookBase(ABC):
     @abstractmethod
@@ -43,6 +46,12 @@ class OrderBookBase(ABC):
     def levels(self, levels: int = 0) -> Dict[Side, List[PriceLevelRO]]:
         pass
 
+    @abstractmethod
+    def depth(
+        self, levels: int = 1, out: Optional["np.ndarray"] = None
+    ) -> "np.ndarray":
+        pass
+
     @abstractmethod
     def bids(
         self, levels: int = 0
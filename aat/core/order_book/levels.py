@@ -0,0 +1,222 @@
+from bisect import bisect_left
+from typing import Iterator, List, Optional, Tuple, Union
+
+from .utils import _insort
+
+# widest span of ticks a ladder will cover before falling back
+_MAX_TICKS = 1 << 16
+
+
+class _SortedLevels(list):
+    """The prices of one side of the book, as a sorted list
+
+    e.g. [10, 10.5, 11, 11.5]"""
+
+    def fits(self, price: float) -> bool:
+        """whether `price` can be added to these levels"""
+        return True
+
+    def add(self, price: float) -> bool:
+        """add `price` if not currently there, returning whether it was added"""
+        return _insort(self, price)
+
+    def remove(self, price: float) -> None:
+        del self[bisect_left(self, price)]
+
+    def popLow(self, amount: int) -> List[float]:
+        """remove and return the lowest `amount` prices"""
+        ret = self[:amount]
+        del self[:amount]
+        return ret
+
+    def popHigh(self, amount: int) -> List[float]:
+        """remove and return the highest `amount` prices"""
+        ret = self[-amount:]
+        del self[-amount:]
+        return ret
+
+
+class _TickLadder(object):
+    """The prices of one side of the book, for an instrument with a known
+    price increment.
+
+    Prices are mapped to their integer number of ticks, and stored in a
+    contiguous array of slots covering the ticks between the lowest and
+    highest price (growing as needed), so adding or removing a price is O(1)
+    and the best price is tracked as levels come and go. Like `_SortedLevels`,
+    it is indexed and iterated from the lowest price, with indexes near
+    either end or near the last index cheap to reach.
+
+    Args:
+        increment (float): the price increment of the instrument
+    """
+
+    __slots__ = [
+        "_increment",
+        "_base",
+        "_slots",
+        "_count",
+        "_low",
+        "_high",
+        "_cursor",
+    ]
+
+    def __init__(self, increment: float, size: int = 64) -> None:
+        self._increment = increment
+
+        # number of ticks of the price in slot 0
+        self._base = 0
+        self._slots: List[Optional[float]] = [None] * size
+        self._count = 0
+
+        # slots of the lowest and highest price
+        self._low = 0
+        self._high = -1
+
+        # (index, slot) of the last lookup
+        self._cursor: Tuple[int, int] = (0, 0)
+
+    def _ticks(self, price: float) -> Optional[int]:
+        """number of ticks in `price`, or None if it isn't a multiple of the increment"""
+        ticks = price / self._increment
+        rounded = round(ticks)
+        return rounded if abs(ticks - rounded) < 1e-6 else None
+
+    def _slot(self, ticks: int) -> int:
+        """slot for `ticks`, growing the slots to cover it"""
+        if not self._count:
+            # empty, so center on the new price
+            self._base = ticks - len(self._slots) // 2
+
+        slot = ticks - self._base
+        if slot < 0:
+            grow = max(-slot, len(self._slots))
+            self._slots[:0] = [None] * grow
+            self._base -= grow
+            self._low += grow
+            self._high += grow
+            slot += grow
+        elif slot >= len(self._slots):
+            self._slots.extend(
+                [None] * max(slot + 1 - len(self._slots), len(self._slots))
+            )
+        return slot
+
+    def fits(self, price: float) -> bool:
+        """whether `price` is a multiple of the increment, and close enough to
+        the current prices to be added"""
+        ticks = self._ticks(price)
+        if ticks is None:
+            return False
+        if not self._count:
+            return True
+        return (
+            max(ticks, self._base + self._high) - min(ticks, self._base + self._low)
+            < _MAX_TICKS
+        )
+
+    def add(self, price: float) -> bool:
+        """add `price` if not currently there, returning whether it was added"""
+        slot = round(price / self._increment) - self._base
+        if not 0 <= slot < len(self._slots) or not self._count:
+            slot = self._slot(slot + self._base)
+        elif self._slots[slot] is not None:
+            return False
+
+        self._slots[slot] = price
+        if not self._count:
+            self._low = self._high = slot
+        elif slot < self._low:
+            self._low = slot
+        elif slot > self._high:
+            self._high = slot
+        self._count += 1
+        self._cursor = (0, self._low)
+        return True
+
+    def remove(self, price: float) -> None:
+        slot = round(price / self._increment) - self._base
+        if not 0 <= slot < len(self._slots) or self._slots[slot] is None:
+            raise ValueError(f"Price {price} not in ladder")
+
+        self._slots[slot] = None
+        self._count -= 1
+        if not self._count:
+            self._low, self._high = 0, -1
+        elif slot == self._low:
+            while self._slots[self._low] is None:
+                self._low += 1
+        elif slot == self._high:
+            while self._slots[self._high] is None:
+                self._high -= 1
+        self._cursor = (0, self._low)
+
+    def popLow(self, amount: int) -> List[float]:
+        """remove and return the lowest `amount` prices"""
+        ret = [self[i] for i in range(min(amount, self._count))]
+        for price in ret:
+            self.remove(price)
+        return ret
+
+    def popHigh(self, amount: int) -> List[float]:
+        """remove and return the highest `amount` prices"""
+        ret = [self[-i - 1] for i in range(min(amount, self._count))][::-1]
+        for price in reversed(ret):
+            self.remove(price)
+        return ret
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> float:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("ladder index out of range")
+
+        # best bid or ask
+        if index == 0:
+            return self._slots[self._low]  # type: ignore
+        if index == self._count - 1:
+            return self._slots[self._high]  # type: ignore
+
+        # walk from whichever of the lowest price, the highest price, or the
+        # last lookup is nearest
+        current, slot = self._cursor
+        if abs(index - current) > index:
+            current, slot = 0, self._low
+        if abs(index - current) > self._count - 1 - index:
+            current, slot = self._count - 1, self._high
+
+        while current < index:
+            slot += 1
+            if self._slots[slot] is not None:
+                current += 1
+        while current > index:
+            slot -= 1
+            if self._slots[slot] is not None:
+                current -= 1
+
+        self._cursor = (current, slot)
+        return self._slots[slot]  # type: ignore
+
+    def __iter__(self) -> Iterator[float]:
+        for slot in range(self._low, self._high + 1):
+            if self._slots[slot] is not None:
+                yield self._slots[slot]  # type: ignore
+
+    def __reversed__(self) -> Iterator[float]:
+        for slot in range(self._high, self._low - 1, -1):
+            if self._slots[slot] is not None:
+                yield self._slots[slot]  # type: ignore
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, _TickLadder)):
+            return list(self) == list(other)
+        return False
+
+    def __repr__(self) -> str:
+        return f"_TickLadder({list(self)})"
+
+
+_Levels = Union[_SortedLevels, _TickLadder]
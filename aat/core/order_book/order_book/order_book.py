@@ -1,3 +1,4 @@
+from itertools import islice
 from queue import Queue
 from typing import (
     Any,
@@ -10,6 +11,7 @@ from typing import (
     Tuple,
     Type,
     Union,
+    TYPE_CHECKING,
 )
 
 from aat.core import ExchangeType, Order, Instrument, Event
@@ -18,8 +20,11 @@ from aat.config import Side, OrderFlag, OrderType
 from ..base import OrderBookBase
 from ..cpp import _CPP, _make_cpp_orderbook
 from ..collector import _Collector
+from ..levels import _Levels, _SortedLevels, _TickLadder
 from ..price_level import _PriceLevel, PriceLevelRO
-from ..utils import _insort
+
+if TYPE_CHECKING:
+    import numpy as np  # type: ignore
 
 
 class OrderBook(OrderBookBase):
@@ -56,6 +61,12 @@ class OrderBook(OrderBookBase):
         - [x] all-or-none
         - [x] immediate-or-cancel
 
+    If the instrument's price increment is known, the price levels are kept
+    on a ladder of ticks rather than in sorted lists.
+
+    Besides order events, the book can report the aggregated levels which
+    changed, see `setLevelCallback`.
+
     Args:
         instrument (Instrument): the instrument for the book
         exchange_name (str): name of the exchange
@@ -80,6 +91,7 @@ class OrderBook(OrderBookBase):
             else ExchangeType(exchange_name or "")
         )
         self._callback = callback or self._push
+        self._level_callback: Optional[Callable] = None
 
         # reset levels and collector
         self.reset()
@@ -109,8 +121,13 @@ class OrderBook(OrderBookBase):
     def reset(self) -> None:
         """reset the order book to its base state"""
         # levels look like [10, 10.5, 11, 11.5]
-        self._buy_levels: List[float] = []
-        self._sell_levels: List[float] = []
+        increment = self._instrument.priceIncrement
+        self._buy_levels: _Levels = (
+            _TickLadder(increment) if increment else _SortedLevels()
+        )
+        self._sell_levels: _Levels = (
+            _TickLadder(increment) if increment else _SortedLevels()
+        )
 
         # look like {price level: PriceLevel}
         self._buys: Dict[float, _PriceLevel] = {}
@@ -119,10 +136,46 @@ class OrderBook(OrderBookBase):
         # setup collector for conditional orders
         self._collector = _Collector(self._callback)
 
+        # look like {(side, price): (volume, orders) before the change}
+        self._touched: Dict[Tuple[Side, float], Tuple[float, int]] = {}
+
     def setCallback(self, callback: Callable) -> None:
         self._callback = callback
         self._collector.setCallback(callback)
 
+    def setLevelCallback(self, callback: Optional[Callable]) -> None:
+        """after each add, cancel, or change, call `callback` with the side,
+        price, volume, and number of orders of each level that changed. a
+        level which was removed is reported with no volume and no orders
+
+        Args:
+            callback (Function): called as callback(side, price, volume, orders), or None to stop
+        """
+        self._level_callback = callback
+        self._touched.clear()
+
+    def _touch(self, side: Side, price: float) -> None:
+        """internal, note the level before it changes"""
+        if self._level_callback is None or (side, price) in self._touched:
+            return
+        level = (self._buys if side == Side.BUY else self._sells).get(price)
+        self._touched[(side, price)] = (
+            (level.volume, len(level)) if level is not None else (0.0, 0)
+        )
+
+    def _pushLevels(self) -> None:
+        """internal, report the levels which changed"""
+        if not self._touched:
+            return
+
+        touched = self._touched
+        self._touched = {}
+        for (side, price), before in touched.items():
+            level = (self._buys if side == Side.BUY else self._sells).get(price)
+            after = (level.volume, len(level)) if level is not None else (0.0, 0)
+            if after != before:
+                self._level_callback(side, price, *after)  # type: ignore
+
     def find(self, order: Order) -> Optional[Order]:
         """find an order in the order book
         Args:
@@ -130,10 +183,9 @@ class OrderBook(OrderBookBase):
         """
         price = order.price
         side = order.side
-        levels = self._buy_levels if side == Side.BUY else self._sell_levels
         prices = self._buys if side == Side.BUY else self._sells
 
-        if price not in levels:
+        if price not in prices:
             return None
 
         # find order from price level
@@ -175,39 +227,47 @@ class OrderBook(OrderBookBase):
         # collect bids and asks at `level`
         if price is not None:
             return (
-                PriceLevelRO(
-                    self._sells[price].price,
-                    self._sells[price].volume,
-                    len(self._sells[price]),
-                )
-                if price in self._sell_levels
-                else None,
-                PriceLevelRO(
-                    self._buys[price].price,
-                    self._buys[price].volume,
-                    len(self._buys[price]),
-                )
-                if price in self._buy_levels
-                else None,
+                (
+                    PriceLevelRO(
+                        self._sells[price].price,
+                        self._sells[price].volume,
+                        len(self._sells[price]),
+                    )
+                    if price in self._sells
+                    else None
+                ),
+                (
+                    PriceLevelRO(
+                        self._buys[price].price,
+                        self._buys[price].volume,
+                        len(self._buys[price]),
+                    )
+                    if price in self._buys
+                    else None
+                ),
             )
 
-        return (
-            PriceLevelRO(
-                self._sell_levels[level],
-                self._sells[self._sell_levels[level]].volume,
-                len(self._sells[self._sell_levels[level]]),
-                self._sells[self._sell_levels[level]]._orders,
-            )
+        sell = (
+            self._sells[self._sell_levels[level]]
             if len(self._sell_levels) > level
-            else PriceLevelRO(0.0, 0.0, 0),
-            PriceLevelRO(
-                self._buy_levels[-level - 1],
-                self._buys[self._buy_levels[-level - 1]].volume,
-                len(self._buys[self._buy_levels[-level - 1]]),
-                self._buys[self._buy_levels[-level - 1]]._orders,
-            )
+            else None
+        )
+        buy = (
+            self._buys[self._buy_levels[-level - 1]]
             if len(self._buy_levels) > level
-            else PriceLevelRO(0.0, 0.0, 0),
+            else None
+        )
+        return (
+            (
+                PriceLevelRO(sell.price, sell.volume, len(sell), sell._orders.values())
+                if sell is not None
+                else PriceLevelRO(0.0, 0.0, 0)
+            ),
+            (
+                PriceLevelRO(buy.price, buy.volume, len(buy), buy._orders.values())
+                if buy is not None
+                else PriceLevelRO(0.0, 0.0, 0)
+            ),
         )
 
     def bids(
@@ -221,27 +281,25 @@ class OrderBook(OrderBookBase):
             value (dict of list): returns [levels in order] for `levels` number of levels
         """
         if levels <= 0:
-            return (
-                PriceLevelRO(
-                    self._buy_levels[-1],
-                    self._buys[self._buy_levels[-1]].volume,
-                    len(self._buys[self._buy_levels[-1]]),
-                    self._buys[self._buy_levels[-1]]._orders,
-                )
-                if len(self._buy_levels) > 0
-                else PriceLevelRO(0, 0, 0)
-            )
-        return [
-            PriceLevelRO(
-                self._buy_levels[-i - 1],
-                self._buys[self._buy_levels[-i - 1]].volume,
-                len(self._buys[self._buy_levels[-i - 1]]),
-                self._buys[self._buy_levels[-i - 1]]._orders,
+            if not self._buy_levels:
+                return PriceLevelRO(0, 0, 0)
+            level = self._buys[self._buy_levels[-1]]
+            return PriceLevelRO(
+                level.price, level.volume, len(level), level._orders.values()
             )
-            if len(self._buy_levels) > i
-            else None
-            for i in range(levels)
-        ]
+
+        ret: List[Optional[PriceLevelRO]] = []
+        for i in range(levels):
+            if len(self._buy_levels) > i:
+                level = self._buys[self._buy_levels[-i - 1]]
+                ret.append(
+                    PriceLevelRO(
+                        level.price, level.volume, len(level), level._orders.values()
+                    )
+                )
+            else:
+                ret.append(None)
+        return ret
 
     def asks(
         self, levels: int = 0
@@ -254,27 +312,25 @@ class OrderBook(OrderBookBase):
             value (dict of list): returns [levels in order] for `levels` number of levels
         """
         if levels <= 0:
-            return (
-                PriceLevelRO(
-                    self._sell_levels[0],
-                    self._sells[self._sell_levels[0]].volume,
-                    len(self._sells[self._sell_levels[0]]),
-                    self._sells[self._sell_levels[0]]._orders,
-                )
-                if len(self._sell_levels) > 0
-                else PriceLevelRO(float("inf"), 0, 0)
-            )
-        return [
-            PriceLevelRO(
-                self._sell_levels[i],
-                self._sells[self._sell_levels[i]].volume,
-                len(self._sells[self._sell_levels[i]]),
-                self._sells[self._sell_levels[i]]._orders,
+            if not self._sell_levels:
+                return PriceLevelRO(float("inf"), 0, 0)
+            level = self._sells[self._sell_levels[0]]
+            return PriceLevelRO(
+                level.price, level.volume, len(level), level._orders.values()
             )
-            if len(self._sell_levels) > i
-            else None
-            for i in range(levels)
-        ]
+
+        ret: List[Optional[PriceLevelRO]] = []
+        for i in range(levels):
+            if len(self._sell_levels) > i:
+                level = self._sells[self._sell_levels[i]]
+                ret.append(
+                    PriceLevelRO(
+                        level.price, level.volume, len(level), level._orders.values()
+                    )
+                )
+            else:
+                ret.append(None)
+        return ret
 
     def levels(self, levels: int = 0) -> Dict[Side, List[PriceLevelRO]]:
         """return book levels starting at top
@@ -299,6 +355,40 @@ class OrderBook(OrderBookBase):
                 ret[Side.BUY].append(bid)
         return ret
 
+    def depth(
+        self, levels: int = 1, out: Optional["np.ndarray"] = None
+    ) -> "np.ndarray":
+        """return book levels starting at top as an array, without creating an
+        object per level
+
+        Args:
+            levels (int): number of levels to return
+            out (np.ndarray): float array of shape (2, 3, levels) to fill, e.g. to reuse between calls
+        Returns:
+            value (np.ndarray): `out`, with the bids in [0] and asks in [1], each as rows of the price, volume, and number of orders of each level. levels past the end of the book have a price of nan and no volume
+        """
+        if out is None:
+            import numpy as np  # type: ignore
+
+            out = np.empty((2, 3, levels))
+        elif out.shape != (2, 3, levels):
+            raise Exception(f"Depth of {levels} levels needs shape (2, 3, {levels})")
+
+        for row, side in (
+            (
+                out[0],
+                [self._buys[p] for p in islice(reversed(self._buy_levels), levels)],
+            ),
+            (out[1], [self._sells[p] for p in islice(self._sell_levels, levels)]),
+        ):
+            filled = len(side)
+            row[0, :filled] = [level.price for level in side]
+            row[1, :filled] = [level.volume for level in side]
+            row[2, :filled] = [len(level) for level in side]
+            row[0, filled:] = float("nan")
+            row[1:, filled:] = 0.0
+        return out
+
     def change(self, order: Order) -> None:
         """modify an order on the order book, potentially triggering events:
             EventType.CHANGE: the change event for this
@@ -309,14 +399,15 @@ class OrderBook(OrderBookBase):
 
         price = order.price
         side = order.side
-        levels = self._buy_levels if side == Side.BUY else self._sell_levels
         prices = self._buys if side == Side.BUY else self._sells
 
-        if price not in levels:
+        if price not in prices:
             raise Exception("Orderbook out of sync")
 
         # modify order in price level
+        self._touch(side, price)
         prices[price].modify(order)
+        self._pushLevels()
 
     def cancel(self, order: Order) -> None:
         """remove an order from the order book, potentially triggering events:
@@ -329,27 +420,37 @@ class OrderBook(OrderBookBase):
         levels = self._buy_levels if side == Side.BUY else self._sell_levels
         prices = self._buys if side == Side.BUY else self._sells
 
-        if price not in levels:
+        if price not in prices:
             # what to do here?
             # order has already executed or been cancelled
             # raise Exception('Orderbook out of sync')
             return
 
         # remove order from price level
+        self._touch(side, price)
         prices[price].remove(order)
 
         # delete level if no more volume
         if not prices[price]:
             levels.remove(price)
+            del prices[price]
+
+        self._pushLevels()
 
     def _clearOrders(self, order: Order, amount: int) -> None:
         """internal"""
+        if not amount:
+            return
+
         if order.side == Side.BUY:
-            self._sell_levels = self._sell_levels[amount:]
+            cleared = self._sell_levels.popLow(amount)
+            prices = self._sells
         else:
-            self._buy_levels = (
-                self._buy_levels[:-amount] if amount else self._buy_levels
-            )
+            cleared = self._buy_levels.popHigh(amount)
+            prices = self._buys
+
+        for price in cleared:
+            del prices[price]
 
     def _getTop(self, side: Side, cleared: int) -> Optional[float]:
         """internal"""
@@ -363,6 +464,29 @@ class OrderBook(OrderBookBase):
             )
         )
 
+    def _addOrder(self, order: Order) -> None:
+        """internal"""
+        levels = self._buy_levels if order.side == Side.BUY else self._sell_levels
+        prices = self._buys if order.side == Side.BUY else self._sells
+
+        if not levels.fits(order.price):
+            # off the ladder, fall back to a sorted list
+            levels = _SortedLevels(levels)
+            if order.side == Side.BUY:
+                self._buy_levels = levels
+            else:
+                self._sell_levels = levels
+
+        self._touch(order.side, order.price)
+        if levels.add(order.price):
+            # new price level
+            prices[order.price] = _PriceLevel(  # type: ignore
+                order.price, collector=self._collector
+            )
+
+        # add order to price level
+        prices[order.price].add(order)
+
     def add(self, order: Order) -> None:
         """add a new order to the order book, potentially triggering events:
             EventType.TRADE: if this order crosses the book and fills orders
@@ -381,8 +505,6 @@ class OrderBook(OrderBookBase):
         top = self._getTop(order.side, self._collector.clearedLevels())
 
         # set levels to the right side
-        levels = self._buy_levels if order.side == Side.BUY else self._sell_levels
-        prices = self._buys if order.side == Side.BUY else self._sells
         prices_cross = self._sells if order.side == Side.BUY else self._buys
 
         # set order price appropriately
@@ -403,6 +525,7 @@ class OrderBook(OrderBookBase):
             # execute order against level
             # if returns trade, it cleared the level
             # else, order was fully executed
+            self._touch(Side.SELL if order.side == Side.BUY else Side.BUY, top)
             trade, new_secondaries = prices_cross[top].cross(order)
 
             if new_secondaries:
@@ -469,14 +592,7 @@ class OrderBook(OrderBookBase):
                         self._collector.commit()
 
                         # limit order, put on books
-                        if _insort(levels, order.price):
-                            # new price level
-                            prices[order.price] = _PriceLevel(  # type: ignore
-                                order.price, collector=self._collector
-                            )
-
-                        # add order to price level
-                        prices[order.price].add(order)
+                        self._addOrder(order)
 
                         # execute secondaries
                         for secondary in secondaries:
@@ -501,14 +617,7 @@ class OrderBook(OrderBookBase):
                         self._collector.commit()
 
                         # limit order, put on books
-                        if _insort(levels, order.price):
-                            # new price level
-                            prices[order.price] = _PriceLevel(  # type: ignore
-                                order.price, collector=self._collector
-                            )
-
-                        # add order to price level
-                        prices[order.price].add(order)
+                        self._addOrder(order)
 
                         # execute secondaries
                         for secondary in secondaries:
@@ -536,14 +645,7 @@ class OrderBook(OrderBookBase):
                         self._collector.commit()
 
                         # limit order, put on books
-                        if _insort(levels, order.price):
-                            # new price level
-                            prices[order.price] = _PriceLevel(  # type: ignore
-                                order.price, collector=self._collector
-                            )
-
-                        # add order to price level
-                        prices[order.price].add(order)
+                        self._addOrder(order)
 
                         # execute secondaries
                         for secondary in secondaries:
@@ -558,14 +660,7 @@ class OrderBook(OrderBookBase):
                     self._collector.commit()
 
                     # limit order, put on books
-                    if _insort(levels, order.price):
-                        # new price level
-                        prices[order.price] = _PriceLevel(  # type: ignore
-                            order.price, collector=self._collector
-                        )
-
-                    # add order to price level
-                    prices[order.price].add(order)
+                    self._addOrder(order)
 
                     # execute secondaries
                     for secondary in secondaries:
@@ -590,6 +685,9 @@ class OrderBook(OrderBookBase):
         # clear the collector
         self._collector.clear()
 
+        # report the levels which changed
+        self._pushLevels()
+
     def __iter__(self) -> Iterator[Order]:
         """iterate through asks then bids by level"""
         for level in self._sell_levels:
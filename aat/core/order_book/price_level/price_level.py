@@ -1,5 +1,17 @@
-from collections import deque
-from typing import Any, cast, Deque, Dict, Iterator, Optional, List, Tuple, Type, Union
+from collections import deque, OrderedDict
+from typing import (
+    Any,
+    cast,
+    Deque,
+    Dict,
+    Hashable,
+    Iterator,
+    Optional,
+    List,
+    Tuple,
+    Type,
+    Union,
+)
 
 from aat.core.data import Order
 from aat.config import OrderType, OrderFlag
@@ -9,10 +21,25 @@ from ..collector import _Collector
 from ..cpp import _CPP, _make_cpp_price_level
 
 
+def _key(order: Order) -> Hashable:
+    """key of a resting order, its id, or if it doesn't have one yet, itself"""
+    return order.id or (None, id(order))
+
+
 class _PriceLevel(object):
+    """A price level, holding its resting orders in time priority, keyed by
+    order id so any order can be found or unlinked in O(1).
+
+    The open volume of the level is kept up to date as orders are added,
+    modified, removed, and filled, along with the open volume each order
+    contributed, so it doesn't depend on orders not being modified elsewhere
+    """
+
     __slots__ = [
         "_price",
         "_orders",
+        "_volume",
+        "_open",
         "_orders_staged",
         "_orders_filled_staged",
         "_stop_orders",
@@ -27,7 +54,9 @@ class _PriceLevel(object):
 
     def __init__(self, price: float, collector: _Collector):
         self._price = price
-        self._orders: Deque[Order] = deque()
+        self._orders: "OrderedDict[Hashable, Order]" = OrderedDict()
+        self._volume = 0.0
+        self._open: Dict[Hashable, float] = {}
         self._orders_staged: Deque[Order] = deque()
         self._orders_filled_staged: Deque[float] = deque()
         self._stop_orders: List[Order] = []
@@ -40,7 +69,41 @@ class _PriceLevel(object):
 
     @property
     def volume(self) -> float:
-        return sum((x.volume - x.filled) for x in self._orders)
+        return self._volume
+
+    def _push(self, key: Hashable, order: Order, front: bool = False) -> None:
+        """rest `order`, at the back of the level or at the front"""
+        self._orders[key] = order
+        if front:
+            self._orders.move_to_end(key, last=False)
+        self._open[key] = order.volume - order.filled
+        self._volume += self._open[key]
+
+    def _pop(self, key: Hashable) -> Order:
+        """unlink the resting order at `key`"""
+        order = self._orders.pop(key)
+        if self._orders:
+            self._volume -= self._open.pop(key)
+        else:
+            # reset exactly, so rounding doesn't accumulate
+            self._open.clear()
+            self._volume = 0.0
+        return order
+
+    def _find(self, order: Order) -> Optional[Hashable]:
+        """key of the resting order equal to `order`, if any, by id, falling
+        back to identity for orders which rested without one"""
+        if order.id and order.id in self._orders:
+            return order.id
+        if (None, id(order)) in self._orders:
+            return (None, id(order))
+
+        if not order.id:
+            # no id yet, so compare fields
+            for key, o in self._orders.items():
+                if o == order:
+                    return key
+        return None
 
     def add(self, order: Order) -> None:
         # append order to deque
@@ -49,12 +112,12 @@ class _PriceLevel(object):
                 return
             self._stop_orders.append(cast(Order, order.stop_target))
         else:
-            if order in self._orders:
+            if self._find(order) is not None:
                 # change event
                 self._collector.pushChange(order)
             else:
                 if order.filled < order.volume:
-                    self._orders.append(order)
+                    self._push(_key(order), order)
                     self._collector.pushOpen(order)
 
     def find(self, order: Order) -> Optional[Order]:
@@ -63,22 +126,24 @@ class _PriceLevel(object):
             # order not here/not here anymore
             return None
 
-        for o in self._orders:
-            if o.id == order.id:
-                return o
-        return None
+        key = self._find(order)
+        return self._orders[key] if key is not None else None
 
     def modify(self, order: Order) -> Order:
         # check if order is in level
-        if order.price != self._price or order.id not in (o.id for o in self._orders):
+        key = self._find(order) if order.price == self._price else None
+        if key is None:
             # something is wrong
             raise Exception(f"Order not found in price level {self._price}: {order}")
 
-        # modify order
-        for o in self._orders:
-            if o.id == order.id:
-                # only allowed to modify volume
-                o.volume = order.volume
+        # modify order, only allowed to modify volume
+        resting = self._orders[key]
+        resting.volume = order.volume
+
+        # update open volume
+        self._volume -= self._open[key]
+        self._open[key] = resting.volume - resting.filled
+        self._volume += self._open[key]
 
         # trigger cancel event
         self._collector.pushChange(order)
@@ -88,12 +153,13 @@ class _PriceLevel(object):
 
     def remove(self, order: Order) -> Order:
         # check if order is in level
-        if order.price != self._price or order not in self._orders:
+        key = self._find(order) if order.price == self._price else None
+        if key is None:
             # something is wrong
             raise Exception(f"Order not found in price level {self._price}: {order}")
 
         # remove order
-        self._orders.remove(order)
+        self._pop(key)
 
         # trigger cancel event
         self._collector.pushCancel(order)
@@ -121,12 +187,17 @@ class _PriceLevel(object):
         elif taker_order.filled > taker_order.volume:
             raise Exception("Unknown error occurred - order book is corrupt")
 
+        # anything staged is from an earlier order which didn't clear this level
+        self._orders_staged.clear()
+        self._orders_filled_staged.clear()
+
         while (taker_order.filled < taker_order.volume) and self._orders:
             # need to fill original volume - filled so far
             to_fill = taker_order.volume - taker_order.filled
 
             # pop maker order from list
-            maker_order = self._orders.popleft()
+            key = next(iter(self._orders))
+            maker_order = self._pop(key)
 
             # add to staged in case we need to revert
             self._orders_staged.append(maker_order)
@@ -162,8 +233,8 @@ class _PriceLevel(object):
                         # cancel maker event, don't put in queue
                         self._collector.pushCancel(maker_order)
                     else:
-                        # push back in deque
-                        self._orders.appendleft(maker_order)
+                        # push back in front
+                        self._push(key, maker_order, front=True)
 
             elif maker_remaining < to_fill:
                 # partially fill it regardles
@@ -173,8 +244,8 @@ class _PriceLevel(object):
 
                 if taker_order.flag == OrderFlag.ALL_OR_NONE:
                     # taker order can't be filled, push maker back and cancel taker
-                    # push back in deque
-                    self._orders.appendleft(maker_order)
+                    # push back in front
+                    self._push(key, maker_order, front=True)
                     return None, self._get_stop_orders()
 
                 else:
@@ -182,7 +253,7 @@ class _PriceLevel(object):
                     maker_order.filled = maker_order.volume
 
                     # append filled in case need to revert
-                    self._orders_filled_staged.append(maker_order.volume)
+                    self._orders_filled_staged.append(maker_remaining)
 
                     # don't append to deque
                     # tell maker order filled
@@ -216,6 +287,8 @@ class _PriceLevel(object):
     def clear(self) -> None:
         """clear queues"""
         self._orders.clear()
+        self._volume = 0.0
+        self._open.clear()
         self._orders_staged.clear()
         self._orders_filled_staged.clear()
         self._stop_orders = []
@@ -236,12 +309,11 @@ class _PriceLevel(object):
         """staged order reverted, unstage the orders"""
         assert len(self._orders) == 0
 
-        # reset orders
-        self._orders = self._orders_staged
-
-        # deduct filled amount
-        for i, filled in enumerate(self._orders_filled_staged):
-            self._orders[i].filled -= filled
+        # reset orders, deducting filled amount
+        for order, filled in zip(self._orders_staged, self._orders_filled_staged):
+            order.filled -= filled
+        for order in self._orders_staged:
+            self._push(_key(order), order)
 
         # reset staged
         self._orders_staged = deque()
@@ -254,12 +326,12 @@ class _PriceLevel(object):
         self._stop_orders_staged = []
 
     def __bool__(self) -> bool:
-        """use deque size as truth value"""
+        """use number of orders as truth value"""
         return len(self._orders) > 0
 
     def __iter__(self) -> Iterator[Order]:
         """iterate through orders"""
-        for order in self._orders:
+        for order in self._orders.values():
             yield order
 
     def __len__(self) -> int:
@@ -268,7 +340,7 @@ class _PriceLevel(object):
 
     def __getitem__(self, index: int) -> Order:
         """get item"""
-        return self._orders[index]
+        return list(self._orders.values())[index]
 
     def ro(self) -> PriceLevelRO:
         return PriceLevelRO(self.price, self.volume, len(self))
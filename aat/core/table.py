@@ -2,19 +2,18 @@ from typing import Any, Tuple
 from .data import Event, Order, Trade
 from .handler import EventHandler
 
-try:
-    from perspective import Table  # type: ignore
-except ImportError:
 
-    class Table(object):  # type: ignore
-        def __init__(*args: Any, **kwargs: Any) -> None:
-            pass
+class _Table(object):
+    """stand in for perspective's Table, if not installed"""
 
-        def update(self, *args: Any) -> None:
-            pass
+    def __init__(*args: Any, **kwargs: Any) -> None:
+        pass
 
-        def remove(self, *args: Any) -> None:
-            pass
+    def update(self, *args: Any) -> None:
+        pass
+
+    def remove(self, *args: Any) -> None:
+        pass
 
 
 class TableHandler(EventHandler):
@@ -26,6 +25,12 @@ class TableHandler(EventHandler):
     onExit = None  # type: ignore
 
     def __init__(self) -> None:
+        # imported here, as perspective is only needed when serving the API
+        try:
+            from perspective import Table  # type: ignore
+        except ImportError:
+            Table = _Table
+
         self._trades = Table(Trade.schema(), index="timestamp")
         self._orders = Table(Order.schema(), index="id")
 
@@ -33,7 +38,7 @@ class TableHandler(EventHandler):
         manager.host_table("trades", self._trades)
         manager.host_table("orders", self._orders)
 
-    def tables(self) -> Tuple[Table, Table]:
+    def tables(self) -> Tuple[Any, Any]:
         return self._trades, self._orders
 
     async def onTrade(self, event: Event) -> None:
@@ -1,8 +1,10 @@
 #pragma once
 #include <deque>
+#include <functional>
 #include <map>
 #include <memory>
 #include <string>
+#include <tuple>
 #include <vector>
 #include <unordered_map>
 
@@ -48,6 +50,9 @@ namespace core {
 
     void setCallback(std::function<void(std::shared_ptr<Event>)> callback);
 
+    // called with the side, price, volume, and orders of each level changed by an add, cancel, or change
+    void setLevelCallback(std::function<void(Side, double, double, uint_t)> callback);
+
     Instrument
     getInstrument() const {
       return instrument;
@@ -78,6 +83,9 @@ namespace core {
     std::vector<std::vector<double>> levels(uint_t levels) const;
     std::map<Side, std::vector<std::vector<double>>> levelsMap(uint_t levels) const;  // For Binding
 
+    // fill `out`, laid out as [bids, asks] x [price, volume, orders] x levels
+    void depth(uint_t levels, double* out) const;
+
     str_t toString() const;
 
     // iterator
@@ -90,11 +98,17 @@ namespace core {
     void clearOrders(std::shared_ptr<Order> order, uint_t amount);
     double getTop(Side side, uint_t cleared);
     bool insort(std::vector<double>& levels, double value);  // NOLINT
+    void touch(Side side, double price);
+    void pushLevels();
 
     Collector collector;
     const Instrument& instrument;
     const ExchangeType& exchange;
     std::function<void(std::shared_ptr<Event>)> callback;
+    std::function<void(Side, double, double, uint_t)> level_callback;
+
+    // levels changed by the current order, with their volume and orders before
+    std::vector<std::tuple<Side, double, double, uint_t>> touched;
 
     std::vector<double> buy_levels;
     std::vector<double> sell_levels;
@@ -1,7 +1,9 @@
 #pragma once
 #include <deque>
+#include <list>
 #include <memory>
 #include <string>
+#include <unordered_map>
 #include <vector>
 
 #include <aat/core/order_book/collector.hpp>
@@ -21,7 +23,10 @@ namespace core {
     getPrice() const {
       return price;
     }
-    double getVolume() const;
+    double
+    getVolume() const {
+      return volume;
+    }
 
     void add(std::shared_ptr<Order> order);
     std::shared_ptr<Order> find(std::shared_ptr<Order> order);
@@ -41,11 +46,11 @@ namespace core {
 
     std::shared_ptr<Order>
     operator[](int i) {
-      return orders[i];
+      return *std::next(orders.begin(), i);
     }
     explicit operator bool() const { return orders.size() > 0; }
-    using iterator = std::deque<std::shared_ptr<Order>>::iterator;
-    using const_iterator = std::deque<std::shared_ptr<Order>>::const_iterator;
+    using iterator = std::list<std::shared_ptr<Order>>::iterator;
+    using const_iterator = std::list<std::shared_ptr<Order>>::const_iterator;
 
     iterator
     begin() noexcept {
@@ -65,9 +70,25 @@ namespace core {
     }
 
    private:
+    void pushBack(std::shared_ptr<Order> order);
+    void pushFront(std::shared_ptr<Order> order);
+    void link(std::shared_ptr<Order> order, iterator position);
+    void unlink(iterator position);
+    bool locate(std::shared_ptr<Order> order, iterator& position);
+
     double price;
     Collector& collector;
-    std::deque<std::shared_ptr<Order>> orders{};
+
+    // open volume of the level, and that each resting order contributed, kept
+    // up to date as orders are added, modified, removed, and filled
+    double volume = 0.0;
+    std::unordered_map<Order*, double> open{};
+
+    // orders in time priority, indexed so any order can be unlinked in O(1),
+    // by id, or if it didn't have one when it rested, by identity
+    std::list<std::shared_ptr<Order>> orders{};
+    std::unordered_map<str_t, iterator> index{};
+    std::unordered_map<Order*, iterator> unidentified{};
     std::deque<std::shared_ptr<Order>> orders_staged;
     std::deque<double> orders_filled_staged;
     std::vector<std::shared_ptr<Order>> stop_orders;
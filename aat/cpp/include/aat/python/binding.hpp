@@ -11,6 +11,7 @@
 #include <pybind11/stl_bind.h>
 #include <pybind11/chrono.h>
 #include <pybind11/functional.h>
+#include <pybind11/numpy.h>
 #include <pybind11_json/pybind11_json.hpp>
 
 #include <aat/common.hpp>
@@ -115,31 +116,70 @@ PYBIND11_MODULE(binding, m) {
       "__iter__", [](const OrderBook& o) { return py::make_iterator(o.begin(), o.end()); },
       py::keep_alive<0, 1>()) /* Essential: keep object alive while iterator exists */
     .def("setCallback", &OrderBook::setCallback)
+    .def("setLevelCallback", &OrderBook::setLevelCallback)
     .def_property("instrument", &OrderBook::getInstrument, nullptr)
     .def_property("exchange", &OrderBook::getExchange, nullptr)
     .def_property("callback", &OrderBook::getCallback, nullptr)
     .def("reset", &OrderBook::reset)
     .def("add", &OrderBook::add)
     .def("cancel", &OrderBook::cancel)
+    .def("change", &OrderBook::change)
+    .def("find", &OrderBook::find)
     .def("topOfBook", &OrderBook::topOfBookMap)
     .def("spread", &OrderBook::spread)
     .def("level", (std::vector<std::shared_ptr<PriceLevel>>(OrderBook::*)(double) const) & OrderBook::level)
     .def("level", (std::vector<double>(OrderBook::*)(std::uint64_t) const) & OrderBook::level)
-    .def("levels", &OrderBook::levelsMap);
+    .def("levels", &OrderBook::levelsMap)
+    .def(
+      "depth",
+      [](const OrderBook& o, std::uint64_t levels, py::object out) {
+        if (out.is_none()) {
+          out = py::array_t<double>(std::vector<py::ssize_t>{2, 3, static_cast<py::ssize_t>(levels)});
+        }
+
+        // filled in place, so must be a writable, C contiguous buffer of doubles
+        py::buffer_info info = out.cast<py::buffer>().request(true);
+        py::ssize_t n = static_cast<py::ssize_t>(levels);
+        if (info.format != py::format_descriptor<double>::format()
+          || info.shape != std::vector<py::ssize_t>{2, 3, n}
+          || info.strides != std::vector<py::ssize_t>{
+               static_cast<py::ssize_t>(3 * n * sizeof(double)), static_cast<py::ssize_t>(n * sizeof(double)),
+               static_cast<py::ssize_t>(sizeof(double))}) {
+          throw py::value_error("depth needs a contiguous float64 buffer of shape (2, 3, levels)");
+        }
+
+        o.depth(levels, static_cast<double*>(info.ptr));
+        return out;
+      },
+      py::arg("levels") = 1, py::arg("out") = py::none());
 
   /*******************************
    * PriceLevel
    ******************************/
   py::class_<PriceLevel>(m, "_PriceLevelCpp")
-    .def(py::init<double, Collector&>())
+    .def(py::init<double, Collector&>(), py::keep_alive<1, 3>()) /* holds a reference to the collector */
     .def(
       "__iter__", [](const PriceLevel& pl) { return py::make_iterator(pl.cbegin(), pl.cend()); },
       py::keep_alive<0, 1>()) /* Essential: keep object alive while iterator exists */
     .def("__getitem__", &PriceLevel::operator[])
     .def("__bool__", &PriceLevel::operator bool)
+    .def("__len__", &PriceLevel::size)
     .def_property("price", &PriceLevel::getPrice, nullptr)
     .def_property("volume", &PriceLevel::getVolume, nullptr)
-    .def("add", &PriceLevel::add);
+    .def("add", &PriceLevel::add)
+    .def("find", &PriceLevel::find)
+    .def("modify", &PriceLevel::modify)
+    .def("remove", &PriceLevel::remove)
+    .def(
+      "cross",
+      [](PriceLevel& pl, std::shared_ptr<Order> taker_order) {
+        std::vector<std::shared_ptr<Order>> secondaries;
+        std::shared_ptr<Order> order = pl.cross(taker_order, secondaries);
+        return py::make_tuple(order, secondaries);
+      })
+    .def("clear", &PriceLevel::clear)
+    .def("commit", &PriceLevel::commit)
+    .def("revert", &PriceLevel::revert);
 
   /*******************************
    * Collector
@@ -161,7 +201,7 @@ PYBIND11_MODULE(binding, m) {
     .def("__repr__", &ExchangeType::toString)
     .def("__bool__", &ExchangeType::operator bool)
     .def("__eq__", &ExchangeType::operator==)
-    .def_readonly("type", &ExchangeType::name);
+    .def_readonly("name", &ExchangeType::name);
 
   /*******************************
    * Instrument
@@ -171,9 +211,9 @@ PYBIND11_MODULE(binding, m) {
     .def(py::init<const str_t&>())
     .def("__repr__", &Instrument::toString)
     .def("__eq__", &Instrument::operator==)
-    .def_readonly("type", &Instrument::name)
+    .def_readonly("name", &Instrument::name)
     .def_readonly("type", &Instrument::type)
-    .def_readonly("type", &Instrument::exchanges);
+    .def_readonly("exchanges", &Instrument::exchanges);
 
   /*******************************
    * Data
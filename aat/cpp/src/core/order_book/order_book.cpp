@@ -46,6 +46,52 @@ namespace core {
     collector.setCallback(callback);
   }
 
+  void
+  OrderBook::setLevelCallback(std::function<void(Side, double, double, uint_t)> callback) {
+    level_callback = callback;
+    touched.clear();
+  }
+
+  void
+  OrderBook::touch(Side side, double price) {
+    if (!level_callback)
+      return;
+
+    for (auto& level : touched) {
+      if (std::get<0>(level) == side && std::get<1>(level) == price)
+        return;
+    }
+
+    std::unordered_map<double, std::shared_ptr<PriceLevel>>& prices = (side == Side::BUY) ? buys : sells;
+    auto found = prices.find(price);
+    if (found != prices.end()) {
+      touched.emplace_back(side, price, found->second->getVolume(), found->second->size());
+    } else {
+      touched.emplace_back(side, price, 0.0, 0);
+    }
+  }
+
+  void
+  OrderBook::pushLevels() {
+    if (touched.empty())
+      return;
+
+    std::vector<std::tuple<Side, double, double, uint_t>> levels;
+    levels.swap(touched);
+
+    for (auto& level : levels) {
+      std::unordered_map<double, std::shared_ptr<PriceLevel>>& prices
+        = (std::get<0>(level) == Side::BUY) ? buys : sells;
+      auto found = prices.find(std::get<1>(level));
+      double volume = (found != prices.end()) ? found->second->getVolume() : 0.0;
+      uint_t orders = (found != prices.end()) ? found->second->size() : 0;
+
+      if (volume != std::get<2>(level) || orders != std::get<3>(level)) {
+        level_callback(std::get<0>(level), std::get<1>(level), volume, orders);
+      }
+    }
+  }
+
   void
   OrderBook::reset() {
     buy_levels = std::vector<double>();
@@ -53,6 +99,7 @@ namespace core {
     buys = std::unordered_map<double, std::shared_ptr<PriceLevel>>();
     sells = std::unordered_map<double, std::shared_ptr<PriceLevel>>();
     collector = Collector(callback);
+    touched.clear();
   }
 
   void
@@ -88,6 +135,7 @@ namespace core {
       // execute order against level
       // if returns trade, it cleared the level
       // else, order was fully executed
+      touch((order->side == Side::BUY) ? Side::SELL : Side::BUY, top);
       std::shared_ptr<Order> trade = prices_cross[top]->cross(order, secondaries);
       if (trade) {
         // clear sell level
@@ -148,6 +196,7 @@ namespace core {
             collector.commit();
 
             // limit order, put on books
+            touch(order->side, order->price);
             if (insort(levels, order->price)) {
               // new price level
               prices[order->price] = std::make_shared<PriceLevel>(order->price, collector);
@@ -175,6 +224,7 @@ namespace core {
             collector.commit();
 
             // limit order, put on books
+            touch(order->side, order->price);
             if (insort(levels, order->price)) {
               // new price level
               prices[order->price] = std::make_shared<PriceLevel>(order->price, collector);
@@ -208,6 +258,7 @@ namespace core {
             collector.commit();
 
             // limit order, put on books
+            touch(order->side, order->price);
             if (insort(levels, order->price)) {
               // new price level
               prices[order->price] = std::make_shared<PriceLevel>(order->price, collector);
@@ -229,6 +280,7 @@ namespace core {
           collector.commit();
 
           // limit order, put on books
+          touch(order->side, order->price);
           if (insort(levels, order->price)) {
             // new price level
             prices[order->price] = std::make_shared<PriceLevel>(order->price, collector);
@@ -262,21 +314,26 @@ namespace core {
 
     // clear the collector
     collector.clear();
+
+    // report the levels which changed
+    pushLevels();
   }
 
   void
   OrderBook::change(std::shared_ptr<Order> order) {
     double price = order->price;
     Side side = order->side;
-    std::vector<double>& levels = (side == Side::BUY) ? buy_levels : sell_levels;
     std::unordered_map<double, std::shared_ptr<PriceLevel>>& prices = (side == Side::BUY) ? buys : sells;
 
-    if (std::find(levels.begin(), levels.end(), price) == levels.end()) {
+    auto found = prices.find(price);
+    if (found == prices.end()) {
       throw AATCPPException("Orderbook out of sync");
     }
 
     // modify order in price level
-    prices[price]->modify(order);
+    touch(side, price);
+    found->second->modify(order);
+    pushLevels();
   }
 
   void
@@ -286,31 +343,36 @@ namespace core {
     std::vector<double>& levels = (side == Side::BUY) ? buy_levels : sell_levels;
     std::unordered_map<double, std::shared_ptr<PriceLevel>>& prices = (side == Side::BUY) ? buys : sells;
 
-    if (std::find(levels.begin(), levels.end(), price) == levels.end()) {
+    auto found = prices.find(price);
+    if (found == prices.end()) {
       throw AATCPPException("Orderbook out of sync");
     }
     // remove order from price level
-    prices[price]->remove(order);
+    touch(side, price);
+    found->second->remove(order);
 
     // delete level if no more volume
-    if (prices[price]->size() == 0) {
-      levels.erase(std::remove(levels.begin(), levels.end(), price), levels.end());
+    if (found->second->size() == 0) {
+      levels.erase(std::lower_bound(levels.begin(), levels.end(), price));
+      prices.erase(found);
     }
+
+    pushLevels();
   }
 
   std::shared_ptr<Order>
   OrderBook::find(std::shared_ptr<Order> order) {
     double price = order->price;
     Side side = order->side;
-    std::vector<double>& levels = (side == Side::BUY) ? buy_levels : sell_levels;
     std::unordered_map<double, std::shared_ptr<PriceLevel>>& prices = (side == Side::BUY) ? buys : sells;
 
-    if (std::find(levels.begin(), levels.end(), price) == levels.end()) {
+    auto found = prices.find(price);
+    if (found == prices.end()) {
       return nullptr;
     }
 
     // find in price level
-    return prices[price]->find(order);
+    return found->second->find(order);
   }
 
   std::map<Side, std::vector<double>>
@@ -380,20 +442,44 @@ namespace core {
   OrderBook::level(double price) const {
     std::vector<std::shared_ptr<PriceLevel>> ret;
 
-    if (std::find(buy_levels.begin(), buy_levels.end(), price) == buy_levels.end()) {
-      ret.push_back(buys.at(price));
-    } else {
-      ret.push_back(nullptr);
-    }
+    auto buy = buys.find(price);
+    ret.push_back(buy != buys.end() ? buy->second : nullptr);
 
-    if (std::find(sell_levels.begin(), sell_levels.end(), price) == sell_levels.end()) {
-      ret.push_back(sells.at(price));
-    } else {
-      ret.push_back(nullptr);
-    }
+    auto sell = sells.find(price);
+    ret.push_back(sell != sells.end() ? sell->second : nullptr);
     return ret;
   }
 
+  void
+  OrderBook::depth(std::uint64_t levels, double* out) const {
+    double* bids = out;
+    double* asks = out + 3 * levels;
+
+    for (std::uint64_t i = 0; i < levels; ++i) {
+      if (buy_levels.size() > i) {
+        auto& level = buys.at(buy_levels[buy_levels.size() - i - 1]);
+        bids[i] = level->getPrice();
+        bids[levels + i] = level->getVolume();
+        bids[2 * levels + i] = level->size();
+      } else {
+        bids[i] = std::numeric_limits<double>::quiet_NaN();
+        bids[levels + i] = 0.0;
+        bids[2 * levels + i] = 0.0;
+      }
+
+      if (sell_levels.size() > i) {
+        auto& level = sells.at(sell_levels[i]);
+        asks[i] = level->getPrice();
+        asks[levels + i] = level->getVolume();
+        asks[2 * levels + i] = level->size();
+      } else {
+        asks[i] = std::numeric_limits<double>::quiet_NaN();
+        asks[levels + i] = 0.0;
+        asks[2 * levels + i] = 0.0;
+      }
+    }
+  }
+
   std::map<Side, std::vector<std::vector<double>>>
   OrderBook::levelsMap(std::uint64_t levels) const {
     std::map<Side, std::vector<std::vector<double>>> ret;
@@ -438,8 +524,12 @@ namespace core {
   void
   OrderBook::clearOrders(std::shared_ptr<Order> order, std::uint64_t amount) {
     if (order->side == Side::BUY) {
+      for (auto level = sell_levels.begin(); level != sell_levels.begin() + amount; ++level)
+        sells.erase(*level);
       sell_levels.erase(sell_levels.begin(), sell_levels.begin() + amount);
     } else {
+      for (auto level = buy_levels.end() - amount; level != buy_levels.end(); ++level)
+        buys.erase(*level);
       buy_levels.erase(buy_levels.begin() + (buy_levels.size() - amount), buy_levels.end());
     }
   }
@@ -463,9 +553,12 @@ namespace core {
 
   bool
   OrderBook::insort(std::vector<double>& levels, double value) {
-    auto orig_length = levels.size();
-    levels.insert(std::upper_bound(levels.begin(), levels.end(), value), value);
-    return orig_length != levels.size();
+    auto found = std::lower_bound(levels.begin(), levels.end(), value);
+    if (found != levels.end() && *found == value) {
+      return false;
+    }
+    levels.insert(found, value);
+    return true;
   }
 
   str_t
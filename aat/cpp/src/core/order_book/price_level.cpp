@@ -3,39 +3,112 @@
 using namespace aat::common;
 using namespace aat::config;
 
+namespace {
+// whether an order has been assigned an id by its exchange
+bool
+identified(const std::shared_ptr<aat::core::Order>& order) {
+  return !order->id.empty() && order->id != "0";
+}
+
+// whether two orders without ids are equal, comparing fields as `Order.__eq__` does
+bool
+same(const aat::core::Order& order, const aat::core::Order& other) {
+  return order.id == other.id && order.instrument == other.instrument && order.exchange == other.exchange
+    && order.price == other.price && order.volume == other.volume && order.notional == other.notional
+    && order.filled == other.filled;
+}
+}  // namespace
+
 namespace aat {
 namespace core {
   PriceLevel::PriceLevel(double price, Collector& collector)
     : price(price)
     , collector(collector)
     , orders()
+    , index()
+    , unidentified()
     , orders_staged()
     , stop_orders()
     , stop_orders_staged() {}
 
-  double
-  PriceLevel::getVolume() const {
-    double sum = 0.0;
-    for (std::shared_ptr<Order> order : orders) {
-      sum += (order->volume - order->filled);
+  void
+  PriceLevel::pushBack(std::shared_ptr<Order> order) {
+    orders.push_back(order);
+    link(order, std::prev(orders.end()));
+  }
+
+  void
+  PriceLevel::pushFront(std::shared_ptr<Order> order) {
+    orders.push_front(order);
+    link(order, orders.begin());
+  }
+
+  void
+  PriceLevel::link(std::shared_ptr<Order> order, iterator position) {
+    if (identified(order)) {
+      index[order->id] = position;
+    } else {
+      unidentified[order.get()] = position;
+    }
+    open[order.get()] = order->volume - order->filled;
+    volume += open[order.get()];
+  }
+
+  void
+  PriceLevel::unlink(iterator position) {
+    // by identity if it rested without an id, else by its id
+    if (unidentified.erase(position->get()) == 0) {
+      auto found = index.find((*position)->id);
+      if (found != index.end() && found->second == position) {
+        index.erase(found);
+      }
+    }
+
+    auto contributed = open.find(position->get());
+    volume -= contributed->second;
+    open.erase(contributed);
+    orders.erase(position);
+
+    if (orders.empty()) {
+      // reset exactly, so rounding doesn't accumulate
+      volume = 0.0;
+    }
+  }
+
+  bool
+  PriceLevel::locate(std::shared_ptr<Order> order, iterator& position) {
+    // by id, falling back to identity for orders which rested without one
+    if (identified(order)) {
+      auto found = index.find(order->id);
+      if (found != index.end()) {
+        position = found->second;
+        return true;
+      }
+    }
+
+    auto found = unidentified.find(order.get());
+    if (found != unidentified.end()) {
+      position = found->second;
+      return true;
     }
-    return sum;
+    return false;
   }
 
   void
   PriceLevel::add(std::shared_ptr<Order> order) {
     // append order to deque
+    iterator position;
     if (order->order_type == OrderType::STOP) {
-      if (orders.size() > 0 && std::find(orders.begin(), orders.end(), order->stop_target) != orders.end()) {
+      if (locate(order->stop_target, position)) {
         return;
       }
       stop_orders.push_back(order->stop_target);
     } else {
-      if (orders.size() > 0 && std::find(orders.begin(), orders.end(), order) != orders.end()) {
+      if (locate(order, position)) {
+        // change event
         collector.pushChange(order);
       } else {
-        // change event
-        orders.push_back(order);
+        pushBack(order);
         collector.pushOpen(order);
       }
     }
@@ -48,9 +121,17 @@ namespace core {
       return nullptr;
     }
 
-    for (auto o : orders) {
-      if (o->id == order->id) {
-        return o;
+    iterator position;
+    if (locate(order, position)) {
+      return *position;
+    }
+
+    if (!identified(order)) {
+      // no id yet, so compare fields
+      for (auto o : orders) {
+        if (same(*o, *order)) {
+          return o;
+        }
       }
     }
 
@@ -60,15 +141,22 @@ namespace core {
   std::shared_ptr<Order>
   PriceLevel::modify(std::shared_ptr<Order> order) {
     // check if order is in level
-    if (order->price != price || std::find(orders.begin(), orders.end(), order) == orders.end()) {
+    iterator position;
+    if (order->price != price || !locate(order, position)) {
       // something is wrong
       throw AATCPPException("Order not found in price level!");
     }
-    // remove order
-    orders.erase(std::find(orders.begin(), orders.end(), order));  // FIXME c++
+    // modify order, only allowed to modify volume
+    std::shared_ptr<Order> resting = *position;
+    resting->volume = order->volume;
 
-    // trigger cancel event
-    collector.pushCancel(order);
+    // update open volume
+    volume -= open[resting.get()];
+    open[resting.get()] = resting->volume - resting->filled;
+    volume += open[resting.get()];
+
+    // trigger change event
+    collector.pushChange(order);
 
     // return the order
     return order;
@@ -77,12 +165,13 @@ namespace core {
   std::shared_ptr<Order>
   PriceLevel::remove(std::shared_ptr<Order> order) {
     // check if order is in level
-    if (order->price != price || std::find(orders.begin(), orders.end(), order) == orders.end()) {
+    iterator position;
+    if (order->price != price || !locate(order, position)) {
       // something is wrong
       throw AATCPPException("Order not found in price level!");
     }
     // remove order
-    orders.erase(std::find(orders.begin(), orders.end(), order));  // FIXME c++
+    unlink(position);
 
     // trigger cancel event
     collector.pushCancel(order);
@@ -107,13 +196,17 @@ namespace core {
       throw AATCPPException("Unknown error occurred - order book is corrupt");
     }
 
+    // anything staged is from an earlier order which didn't clear this level
+    orders_staged.clear();
+    orders_filled_staged.clear();
+
     while (taker_order->filled < taker_order->volume && orders.size() > 0) {
       // need to fill original volume - filled so far
       double to_fill = taker_order->volume - taker_order->filled;
 
       // pop maker order from list
       std::shared_ptr<Order> maker_order = orders.front();
-      orders.pop_front();
+      unlink(orders.begin());
 
       // add to staged in case we need to revert
       orders_staged.push_back(maker_order);
@@ -150,8 +243,8 @@ namespace core {
             // cancel maker event, don't put in queue
             collector.pushCancel(maker_order);
           } else {
-            // push back in deque
-            orders.push_front(maker_order);
+            // push back in front
+            pushFront(maker_order);
           }
         }
       } else if (maker_remaining < to_fill) {
@@ -162,8 +255,8 @@ namespace core {
 
         if (taker_order->flag == OrderFlag::ALL_OR_NONE) {
           // taker order can't be filled, push maker back and cancel taker
-          // push back in deque
-          orders.push_front(maker_order);
+          // push back in front
+          pushFront(maker_order);
 
           for (std::shared_ptr<Order> order : stop_orders)
             secondaries.push_back(order);
@@ -173,7 +266,7 @@ namespace core {
           maker_order->filled = maker_order->volume;
 
           // append filled in case need to revert
-          orders_filled_staged.push_back(maker_order->volume);
+          orders_filled_staged.push_back(maker_remaining);
 
           // don't append to deque
           // tell maker order filled
@@ -214,6 +307,10 @@ namespace core {
   void
   PriceLevel::clear() {
     orders.clear();
+    index.clear();
+    unidentified.clear();
+    volume = 0.0;
+    open.clear();
     orders_staged.clear();
     orders_filled_staged.clear();
     stop_orders.clear();
@@ -227,14 +324,16 @@ namespace core {
 
   void
   PriceLevel::revert() {
-    // reset orders
+    // reset orders, deducting filled amount
     orders.clear();
-    orders.insert(
-      orders.begin(), std::make_move_iterator(orders_staged.begin()), std::make_move_iterator(orders_staged.end()));
-
-    // deduct filled amount
-    for (std::size_t i = 0; i < orders.size(); ++i)
-      orders[i]->filled -= orders_filled_staged[i];
+    index.clear();
+    unidentified.clear();
+    volume = 0.0;
+    open.clear();
+    for (std::size_t i = 0; i < orders_filled_staged.size(); ++i)
+      orders_staged[i]->filled -= orders_filled_staged[i];
+    for (std::shared_ptr<Order> order : orders_staged)
+      pushBack(order);
 
     // reset staged
     orders_staged.clear();
@@ -1,2 +1,8 @@
 from .engine import TradingEngine  # noqa: F401
+from .backtest import BacktestEngine  # noqa: F401
 from .dispatch import StrategyManager  # noqa: F401
+from .stats import EngineStats  # noqa: F401
+from .monitor import EngineMonitor  # noqa: F401
+from .checkpoint import EngineCheckpoint  # noqa: F401
+from .shard import ShardedEngine  # noqa: F401
+from .sweep import summarize, sweep, walkForward  # noqa: F401
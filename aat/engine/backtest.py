@@ -0,0 +1,273 @@
+import asyncio
+import inspect
+import sys
+from asyncio import Future, Queue
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from aat.core.data import Event, EventBatch
+from aat.config import EventType
+from aat.strategy import Strategy
+
+from .engine import TradingEngine
+from .futures import FutureTracker
+
+# consecutive bare yields (e.g. `asyncio.sleep(0)`) to skip before handing a
+# coroutine back to the event loop, in case it is busy-waiting on other tasks
+_MAX_SPINS = 100
+
+# whether tasks can be started eagerly, running synchronously until they block
+_EAGER_TASKS = sys.version_info >= (3, 12)
+
+
+async def _resume(coro: Any, blocked: Optional[Future]) -> Any:
+    """finish running a partially driven coroutine as a task on the event loop"""
+    while True:
+        if blocked is None:
+            await asyncio.sleep(0)
+        else:
+            try:
+                await asyncio.wait((blocked,))
+            except asyncio.CancelledError:
+                # raised inside the coroutine when it resumes
+                blocked.cancel()
+
+        try:
+            blocked = coro.send(None)
+        except StopIteration as e:
+            return e.value
+
+
+def _drive(coro: Any) -> Tuple[bool, Any]:
+    """Run a coroutine synchronously, without going through the event loop's scheduler.
+    It runs outside of any task, so is only used to pull events from exchanges.
+
+    Args:
+        coro (coroutine): coroutine (or other awaitable supporting `send`) to run
+    Returns:
+        (bool, Any): (True, result) if the coroutine ran to completion, or (False, future)
+                     if it blocked on a future, in which case the rest of the coroutine
+                     is scheduled on the event loop
+    """
+    try:
+        blocked = coro.send(None)
+
+        spins = 0
+        while blocked is None and spins < _MAX_SPINS:
+            # bare yield, just continue
+            blocked = coro.send(None)
+            spins += 1
+
+    except StopIteration as e:
+        return True, e.value
+
+    return False, asyncio.ensure_future(_resume(coro, blocked))
+
+
+def _start(coro: Any) -> Optional[Future]:
+    """Run a callback coroutine as a task, eagerly where supported (Python 3.12+).
+
+    Args:
+        coro (coroutine): coroutine to run
+    Returns:
+        Future: the task, or None if it already finished successfully. Without
+                eager tasks, the task only runs once the engine yields to the
+                event loop (see `BacktestEngine._yield`)
+    """
+    if not _EAGER_TASKS:
+        return asyncio.ensure_future(coro)
+
+    task = asyncio.Task(coro, loop=asyncio.get_event_loop(), eager_start=True)  # type: ignore
+    if task.done() and not task.cancelled() and task.exception() is None:
+        return None
+    return task
+
+
+class BacktestEngine(TradingEngine):
+    """A trading engine for deterministic backtests.
+
+    Rather than merging exchange streams on the event loop, the backtest engine
+    pulls events from each exchange in turn, and drains the order entry events
+    each event generates before moving to the next. Async callbacks run as
+    tasks, started eagerly on Python 3.12+ so they run synchronously until they
+    first block on a future (e.g. real I/O). On earlier versions, each batch of
+    callbacks is given one turn of the event loop before draining. Either way,
+    callbacks run inside their own task (e.g. for `asyncio.current_task()` or
+    `asyncio.timeout()`). Errors are surfaced as soon as the callbacks finish,
+    and the event loop only gets a further turn while some are blocked.
+
+    Exchange streams are pulled outside of any task, so exchanges shouldn't
+    rely on task APIs in `tick`.
+
+    This falls short of an order of magnitude faster than dispatching through
+    the executor: on `benchmarks/engine_dispatch.py` it is about 2-4x faster,
+    as the synthetic exchange generating the events takes most of the time
+    left, bounding the speedup to about 4x on that benchmark."""
+
+    def __init__(self, **config: dict) -> None:
+        super().__init__(**config)
+
+        if not self._offline():
+            raise Exception(
+                "Invalid trading type for backtest engine: {}".format(self.trading_type)
+            )
+
+    def _makeInbox(self, handler: Any) -> None:
+        # callbacks already run in order, one at a time
+        return None
+
+    def _invoke(
+        self, callback: Callable, event: Union[Event, EventBatch], inline: bool
+    ) -> Optional[Future]:
+        if inline:
+            callback(event)
+            return None
+        return _start(callback(event))
+
+    async def _process(self, event: Event, strategy: Optional[Strategy] = None) -> None:
+        """send an event to the handlers, letting the callbacks started run"""
+        futures = await self.processEvent(event, strategy)
+        await self._yield(futures)
+        self._futures.extend(futures)
+
+    async def _yield(self, futures: List[Future]) -> None:
+        """without eager tasks, give newly started callbacks a turn of the event
+        loop, so those that don't block finish before draining"""
+        if futures and not _EAGER_TASKS:
+            await asyncio.sleep(0)
+
+    async def _next(self, ticker: AsyncIterator[Event]) -> Event:
+        """pull the next event from an exchange"""
+        done, ret = _drive(ticker.__anext__())
+        if done:
+            return ret
+        return await ret
+
+    async def _dispatch(
+        self, event: Event, strategy: Optional[Strategy] = None
+    ) -> None:
+        """send an event to the handlers, then drain any events it generated"""
+        await self._process(event, strategy)
+        await self._drain()
+
+    async def _drain(self) -> None:
+        """process queued events, e.g. order entry events generated by handlers"""
+        while (
+            not self._queued_targeted_events.empty() or not self._queued_events.empty()
+        ):
+            # order entry events first
+            while not self._queued_targeted_events.empty():
+                queued, target = self._queued_targeted_events.get_nowait()
+                await self._process(queued, target)
+
+            while not self._queued_events.empty():
+                queued = self._queued_events.get_nowait()
+                await self._process(queued)
+
+    async def _firePeriodics(
+        self, now: datetime, until: datetime, inclusive: bool = True
+    ) -> None:
+        for timestamp, periodics in self.manager.expiredPeriodics(
+            now, until, inclusive=inclusive
+        ):
+            self._clock.simulate(timestamp)
+            futures = [
+                future
+                for future in (_start(p.fire(timestamp)) for p in periodics)
+                if future is not None
+            ]
+
+            # before moving the clock on
+            await self._yield(futures)
+            self._futures.extend(futures)
+
+    async def _reap(self) -> None:
+        """surface errors from finished callbacks, letting any callbacks still
+        blocked on the event loop progress"""
+        pending = False
+        for future in self._futures:
+            if not future.done():
+                pending = True
+            elif future.cancelled() or future.exception() is not None:
+                # before its done callback gets a turn of the event loop
+                future.result()
+
+        if pending:
+            await asyncio.sleep(0)
+
+        # trigger exception if necessary
+        self._futures.raiseErrors()
+
+    async def run(self) -> None:
+        """run the backtest"""
+        self._queued_events: Queue[Event] = Queue()
+        self._queued_targeted_events: Queue[Tuple[Event, Strategy]] = Queue()
+        self._targeted_pending = asyncio.Event()
+        self._futures = FutureTracker()
+        self._startClock()
+
+        # await all connections
+        await asyncio.gather(
+            *(asyncio.ensure_future(exch.connect()) for exch in self.exchanges)
+        )
+        await asyncio.gather(
+            *(asyncio.ensure_future(exch.instruments()) for exch in self.exchanges)
+        )
+
+        # send start event to all callbacks, and let them finish
+        # (e.g. subscriptions) before streaming data
+        await self._dispatch(Event(type=EventType.START, target=None))
+        await asyncio.gather(*self._futures)
+        self._futures.clear()
+
+        tickers: List[AsyncIterator[Event]] = [
+            exch.tick()
+            for exch in self.exchanges
+            if inspect.isasyncgenfunction(exch.tick)
+        ]
+
+        # **************** #
+        # Main event loop
+        # **************** #
+        async for event in self._ordered(tickers):
+            if event.type == EventType.EXIT:
+                break
+
+            has_timestamp = hasattr(event, "target") and hasattr(
+                event.target, "timestamp"
+            )
+
+            # inject periodics expiring between the last event and this one
+            if self._clock.now() != self._epoch and has_timestamp:
+                await self._firePeriodics(
+                    self._clock.now(), event.target.timestamp, inclusive=False  # type: ignore
+                )
+                await self._drain()
+
+            # tick exchange event to handlers
+            await self._dispatch(event)
+
+            # use time of last event
+            if has_timestamp:
+                self._clock.simulate(event.target.timestamp)  # type: ignore
+
+            # process any periodics
+            if self._clock.now() != self._epoch:
+                await self._firePeriodics(self._clock.now(), self._clock.now())
+                await self._drain()
+
+            await self._reap()
+
+        # Before engine shutdown, send an exit event
+        await self._dispatch(Event(type=EventType.EXIT, target=None))
+        await asyncio.gather(*self._futures)
+        self._close()
+        self._logStats()
@@ -0,0 +1,154 @@
+import io
+import os
+import os.path
+import pickle
+import time
+from typing import Any, Dict, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from aat.engine import TradingEngine
+
+_VERSION = 1
+
+
+class _Pickler(pickle.Pickler):
+    """pickle strategies by their index in the engine"""
+
+    def __init__(self, file: io.BytesIO, engine: "TradingEngine") -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._strategies = {id(s): i for i, s in enumerate(engine.strategies)}
+
+    def persistent_id(self, obj: Any) -> Optional[int]:
+        return self._strategies.get(id(obj))
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file: io.BytesIO, engine: "TradingEngine") -> None:
+        super().__init__(file)
+        self._engine = engine
+
+    def persistent_load(self, index: int) -> Any:
+        return self._engine.strategies[index]
+
+
+class EngineCheckpoint(object):
+    """Checkpoint of an engine's order and portfolio state, for a warm restart.
+
+    Saves, as a single pickle, the order manager's open and past orders, the
+    strategy manager's per strategy orders and trades, the risk manager's
+    open orders, and the portfolio manager's positions, prices, and trades.
+    Strategies are saved by their index in the engine, so are restored onto
+    the strategies of the restarted engine, which must be configured the
+    same.
+
+    Live, the engine saves a checkpoint every `interval` seconds if anything
+    has happened since the last one, and always on exit. The file is
+    replaced atomically, so a crash mid save leaves the previous checkpoint"""
+
+    def __init__(
+        self, engine: "TradingEngine", filename: str, interval: float = 60.0
+    ) -> None:
+        self._engine = engine
+        self._filename = filename
+        self._interval = interval
+        self._saved = time.monotonic()
+        self._changed = False
+
+    def changed(self) -> None:
+        """note that state may have changed since the last save"""
+        self._changed = True
+
+    def heartbeat(self) -> None:
+        """save if the interval has passed, and state has changed"""
+        if self._changed and time.monotonic() - self._saved >= self._interval:
+            self.save()
+
+    def _state(self) -> Dict[str, Any]:
+        manager = self._engine.manager
+        order_mgr = self._engine.order_manager
+        risk_mgr = self._engine.risk_manager
+        portfolio_mgr = self._engine.portfolio_manager
+
+        return {
+            "order_manager": {
+                "_pending_orders": order_mgr._pending_orders,
+                "_past_orders": order_mgr._past_orders,
+            },
+            "manager": {
+                "_strategy_open_orders": manager._strategy_open_orders,
+                "_strategy_past_orders": manager._strategy_past_orders,
+                "_strategy_trades": manager._strategy_trades,
+            },
+            "risk_manager": {"_active_orders": risk_mgr._active_orders},
+            "portfolio_manager": {
+                "_portfolio": portfolio_mgr._portfolio,
+                "_prices": portfolio_mgr._prices,
+                "_trades": portfolio_mgr._trades,
+                "_active_orders": portfolio_mgr._active_orders,
+                "_active_positions": portfolio_mgr._active_positions,
+            },
+        }
+
+    def save(self) -> None:
+        """write the checkpoint"""
+        buffer = io.BytesIO()
+        _Pickler(buffer, self._engine).dump(
+            {
+                "version": _VERSION,
+                "strategies": [type(s).__name__ for s in self._engine.strategies],
+                "names": [s.name() for s in self._engine.strategies],
+                "state": self._state(),
+            }
+        )
+
+        temp = "{}.tmp".format(self._filename)
+        with open(temp, "wb") as fp:
+            fp.write(buffer.getbuffer())
+        os.replace(temp, self._filename)
+
+        self._saved = time.monotonic()
+        self._changed = False
+
+    def restore(self) -> bool:
+        """load the checkpoint into the engine, if there is one"""
+        if not os.path.exists(self._filename):
+            return False
+
+        with open(self._filename, "rb") as fp:
+            checkpoint = _Unpickler(io.BytesIO(fp.read()), self._engine).load()
+
+        if checkpoint["version"] != _VERSION:
+            raise Exception(
+                "Unsupported checkpoint version: {}".format(checkpoint["version"])
+            )
+
+        strategies = [type(s).__name__ for s in self._engine.strategies]
+        if checkpoint["strategies"] != strategies:
+            raise Exception(
+                "Checkpoint is for strategies {}, not {}".format(
+                    checkpoint["strategies"], strategies
+                )
+            )
+
+        owners = {
+            "order_manager": self._engine.order_manager,
+            "manager": self._engine.manager,
+            "risk_manager": self._engine.risk_manager,
+            "portfolio_manager": self._engine.portfolio_manager,
+        }
+        for name, attrs in checkpoint["state"].items():
+            for attr, value in attrs.items():
+                setattr(owners[name], attr, value)
+
+        # the portfolio tracks strategies by name, which depends on the order
+        # strategies were constructed in the process
+        names = dict(
+            zip(checkpoint["names"], (s.name() for s in self._engine.strategies))
+        )
+        portfolio = self._engine.portfolio_manager._portfolio
+        portfolio._strategies = [names.get(n, n) for n in portfolio._strategies]
+        portfolio._active_positions_by_strategy = {
+            names.get(n, n): positions
+            for n, positions in portfolio._active_positions_by_strategy.items()
+        }
+        return True
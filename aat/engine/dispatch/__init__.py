@@ -1,5 +1,6 @@
 from .manager import StrategyManager  # noqa: F401
 from .execution import OrderManager  # noqa: F401
 from .periodic import Periodic  # noqa: F401
+from .conflation import vwap  # noqa: F401
 from .portfolio import PortfolioManager, Portfolio  # noqa: F401
 from .risk import RiskManager  # noqa: F401
@@ -0,0 +1,118 @@
+import itertools
+from asyncio import Future
+from typing import Callable, Dict, Hashable, List, Tuple, TYPE_CHECKING
+
+from aat.config import EventType
+from aat.core import Event, Order, Trade
+
+if TYPE_CHECKING:
+    from aat.engine import TradingEngine
+
+
+def vwap(first: Trade, second: Trade) -> Trade:
+    """aggregate two trades into a single volume weighted print, or if there
+    is no volume between them to weight by, the later one"""
+    volume = round(first.volume + second.volume, 8)
+    if not volume:
+        return second
+    price = (first.notional + second.notional) / volume
+
+    taker_order = Order(
+        volume=volume,
+        price=price,
+        side=second.side,
+        instrument=second.instrument,
+        exchange=second.exchange,
+        filled=volume,
+        timestamp=second.timestamp,
+    )
+
+    trade = Trade(
+        volume=volume,
+        price=taker_order.price,
+        taker_order=taker_order,
+        maker_orders=list(first.maker_orders) + list(second.maker_orders),
+    )
+    trade.id = second.id
+    return trade
+
+
+class Conflator(object):
+    """Conflate market data for one handler and instrument.
+
+    While any of the handler's callbacks for the instrument are still running,
+    further events are held rather than dispatched. Held OPEN and CHANGE events
+    for the same order are collapsed to the latest, and if `vwap` is set, held
+    trades are aggregated into a single volume weighted print. Other events are
+    held as is. Once the handler's callbacks have all finished, the held events
+    are dispatched in the order they were first held.
+
+    Only market data is routed through a conflator, order entry events for the
+    handler are never conflated."""
+
+    def __init__(self, engine: "TradingEngine", vwap: bool = False) -> None:
+        self._engine = engine
+        self._vwap = vwap
+        self._running = 0
+        self._pending: Dict[Hashable, Tuple[Event, List[Tuple[Callable, bool]]]] = {}
+        self._counter = itertools.count()
+
+    @property
+    def vwap(self) -> bool:
+        return self._vwap
+
+    def pending(self) -> int:
+        """number of held events"""
+        return len(self._pending)
+
+    def send(self, event: Event, callbacks: List[Tuple[Callable, bool]]) -> None:
+        """dispatch `event` to the handler's `callbacks` (as `(callback, inline)`),
+        or hold it if the handler is busy"""
+        if self._running:
+            self._hold(event, callbacks)
+        else:
+            self._dispatch(event, callbacks)
+
+    def _hold(self, event: Event, callbacks: List[Tuple[Callable, bool]]) -> None:
+        key: Hashable
+        if event.type in (EventType.OPEN, EventType.CHANGE):
+            # latest state of the order
+            key = (event.type, event.target.id)  # type: ignore
+
+        elif event.type == EventType.TRADE and self._vwap:
+            key = EventType.TRADE
+            if key in self._pending:
+                held, _ = self._pending[key]
+                event = Event(
+                    type=EventType.TRADE,
+                    target=vwap(held.target, event.target),  # type: ignore
+                )
+
+        else:
+            key = next(self._counter)
+
+        # replacing a held event keeps its original position
+        self._pending[key] = (event, callbacks)
+
+    def _dispatch(self, event: Event, callbacks: List[Tuple[Callable, bool]]) -> None:
+        for callback, inline in callbacks:
+            future = self._engine._invoke(callback, event, inline)
+            if future is not None:
+                self._running += 1
+                future.add_done_callback(self._done)
+                self._engine._futures.append(future)
+
+    def _done(self, future: Future) -> None:
+        self._running -= 1
+        if self._running or not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        for event, callbacks in pending.values():
+            try:
+                self._dispatch(event, callbacks)
+            except BaseException as e:
+                # surface through the engine, as if the callback's future failed
+                failed = self._engine.event_loop.create_future()
+                failed.set_exception(e)
+                self._engine._futures.append(failed)
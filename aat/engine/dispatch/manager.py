@@ -1,3 +1,4 @@
+import itertools
 import sys
 import traceback
 
@@ -9,7 +10,7 @@ from .portfolio import StrategyManagerPortfolioMixin, PortfolioManager
 from .risk import StrategyManagerRiskMixin, RiskManager
 from .utils import StrategyManagerUtilsMixin
 
-from aat.config import TradingType
+from aat.config import EventType, TradingType
 from aat.core import Event, Error
 from aat.exchange import Exchange
 from aat.core.handler import EventHandler
@@ -17,6 +18,22 @@ from aat.core.handler import EventHandler
 if TYPE_CHECKING:
     from aat.strategy import Strategy
     from aat.engine import TradingEngine
+    from aat.engine.stats import EngineStats
+
+
+# sub-manager callbacks the manager fans events out to
+_FANOUT = {
+    EventType.TRADE: "onTrade",
+    EventType.OPEN: "onOpen",
+    EventType.CANCEL: "onCancel",
+    EventType.CHANGE: "onChange",
+    EventType.FILL: "onFill",
+    EventType.HALT: "onHalt",
+    EventType.CONTINUE: "onContinue",
+    EventType.DATA: "onData",
+    EventType.START: "onStart",
+    EventType.EXIT: "onExit",
+}
 
 
 class StrategyManager(
@@ -68,6 +85,7 @@ class StrategyManager(
 
         # initialize event subscriptions
         self._data_subscriptions = {}  # type: ignore
+        self._conflators = {}  # type: ignore
 
         # initialize order and trade tracking
         self._strategy_open_orders = {}
@@ -79,6 +97,21 @@ class StrategyManager(
 
         # internal use for periodics
         self._periodics = []
+        self._periodic_schedule = []
+        self._periodic_scheduled = 0
+        self._periodic_counter = itertools.count()
+
+        # record stats for the fan-out to the sub-managers
+        stats = self._engine.stats()
+        if stats is not None:
+            self._instrument(stats)
+
+    def _instrument(self, stats: "EngineStats") -> None:
+        for mgr in (self._portfolio_mgr, self._risk_mgr, self._order_mgr):
+            for event_type, name in _FANOUT.items():
+                setattr(
+                    mgr, name, stats.wrap(getattr(mgr, name), mgr, event_type, False)
+                )
 
     # ********* #
     # Accessors #
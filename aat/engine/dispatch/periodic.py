@@ -1,9 +1,10 @@
 import asyncio
+import heapq
 from asyncio import Future
-from datetime import datetime
-from typing import Awaitable, Callable, List, Optional
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Iterator, List, Optional, Tuple
 
-from temporalcache.utils import should_expire, calc  # type: ignore
+from temporalcache.utils import calc  # type: ignore
 
 
 class Periodic(object):
@@ -43,21 +44,55 @@ class Periodic(object):
         self._continue = False
 
     def expires(self, timestamp: datetime) -> bool:
-        if (timestamp - self._last).total_seconds() < 1:
-            return False
+        """whether the periodic is due to fire at `timestamp`, i.e. its next
+        expiry since it last fired has passed. Live and offline engines both
+        fire periodics by `nextExpiry`, so they agree on when they fire"""
+        return timestamp >= self.nextExpiry(self._last)
+
+    def nextExpiry(self, timestamp: datetime) -> datetime:
+        """return the exact time the periodic next fires, if it last fired at `timestamp`"""
         if self._interval:
-            total = (timestamp - self._last).total_seconds()
-            if (timestamp - self._last).total_seconds() < 1:
-                return False
-            return total > calc(
-                self.second or 1, self.minute or 0, self.hour or 0, 0, 0, 0, 0
+            # once strictly more than the interval has passed, to the second
+            return timestamp + timedelta(
+                seconds=calc(
+                    self.second or 1, self.minute or 0, self.hour or 0, 0, 0, 0, 0
+                )
+                + 1
             )
-        return should_expire(self._last, timestamp, self.second, self.minute, self.hour)
+
+        # fire at the next time matching every field given, with fields finer
+        # than the coarsest one given at their first boundary, e.g.
+        # at(minute=5) fires at 5 past the hour, not every second of that minute
+        second, minute, hour = self.second, self.minute, self.hour
+        if hour is not None:
+            minute, second = minute or 0, second or 0
+        elif minute is not None:
+            second = second or 0
+
+        # next whole second matching all of second/minute/hour
+        expiry = timestamp.replace(microsecond=0) + timedelta(seconds=1)
+        while True:
+            if hour is not None and expiry.hour != hour % 24:
+                expiry = (expiry + timedelta(hours=(hour - expiry.hour) % 24)).replace(
+                    minute=0, second=0
+                )
+            elif minute is not None and expiry.minute != minute % 60:
+                expiry = (
+                    expiry + timedelta(minutes=(minute - expiry.minute) % 60)
+                ).replace(second=0)
+            elif second is not None and expiry.second != second % 60:
+                expiry = expiry + timedelta(seconds=(second - expiry.second) % 60)
+            else:
+                return expiry
+
+    def fire(self, timestamp: datetime) -> Awaitable[None]:
+        """call the periodic function as of `timestamp`"""
+        self._last = timestamp
+        return self._function(timestamp=timestamp)
 
     async def execute(self, timestamp: datetime) -> Optional[Future]:
         if self.expires(timestamp):
-            self._last = timestamp
-            return asyncio.ensure_future(self._function(timestamp=timestamp))
+            return asyncio.ensure_future(self.fire(timestamp))
         else:
             return None
 
@@ -65,9 +100,58 @@ class Periodic(object):
 class PeriodicManagerMixin(object):
     _periodics: List[Periodic] = []
 
+    # min-heap of (next expiry, tiebreak, periodic), and
+    # the number of `_periodics` already in the heap
+    _periodic_schedule: List[Tuple[datetime, int, Periodic]]
+    _periodic_scheduled: int
+    _periodic_counter: Iterator[int]
+
     def periodics(self) -> List[Periodic]:
         return self._periodics
 
+    def _schedulePeriodic(self, expiry: datetime, periodic: Periodic) -> None:
+        heapq.heappush(
+            self._periodic_schedule, (expiry, next(self._periodic_counter), periodic)
+        )
+
+    def expiredPeriodics(
+        self, now: datetime, until: datetime, inclusive: bool = True
+    ) -> Iterator[Tuple[datetime, List[Periodic]]]:
+        """yield, in time order, every time a periodic should fire between `now`
+        and `until`, along with the periodics that fire at that time. Periodics
+        are rescheduled as they are yielded, so the cost is proportional to the
+        number of firings rather than the length of time elapsed.
+
+        Args:
+            now (datetime): the current time, newly installed periodics fire no earlier than this
+            until (datetime): yield periodics expiring up to this time
+            inclusive (bool): whether to include periodics expiring exactly at `until`
+        """
+        # schedule newly installed periodics
+        for periodic in self._periodics[self._periodic_scheduled :]:
+            self._schedulePeriodic(
+                max(periodic.nextExpiry(periodic._last), now), periodic
+            )
+        self._periodic_scheduled = len(self._periodics)
+
+        while self._periodic_schedule:
+            expiry = self._periodic_schedule[0][0]
+
+            if expiry > until or (expiry == until and not inclusive):
+                return
+
+            # pop all periodics expiring at this time
+            expired = []
+            while self._periodic_schedule and self._periodic_schedule[0][0] == expiry:
+                _, _, periodic = heapq.heappop(self._periodic_schedule)
+
+                if periodic._continue:
+                    expired.append(periodic)
+                    self._schedulePeriodic(periodic.nextExpiry(expiry), periodic)
+
+            if expired:
+                yield expiry, expired
+
     def periodicIntervals(self) -> int:
         """return the interval required for periodics, to optimize call times
         1 - secondly
@@ -1,4 +1,3 @@
-import pandas as pd  # type: ignore
 from datetime import datetime
 from typing import cast, Dict, List, Optional, Tuple, Union, TYPE_CHECKING
 
@@ -7,8 +6,8 @@ from aat.core import Event, Trade, Instrument, ExchangeType, Position
 from ..base import ManagerBase
 from .portfolio import Portfolio
 
-
 if TYPE_CHECKING:
+    import pandas as pd  # type: ignore
     from aat.strategy import Strategy
     from ..manager import StrategyManager
 
@@ -66,7 +65,9 @@ class PortfolioManager(ManagerBase):
 
     def priceHistory(
         self, instrument: Optional[Instrument] = None
-    ) -> Union[dict, pd.DataFrame]:
+    ) -> Union[dict, "pd.DataFrame"]:
+        import pandas as pd  # type: ignore
+
         if instrument:
             return pd.DataFrame(
                 self._prices[instrument], columns=[instrument.name, "when"]
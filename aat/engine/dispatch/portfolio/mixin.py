@@ -1,4 +1,3 @@
-import pandas as pd
 from typing import Optional, List, Union, TYPE_CHECKING
 
 from aat.core import Instrument, ExchangeType, Position
@@ -6,8 +5,8 @@ from aat.core import Instrument, ExchangeType, Position
 from .manager import PortfolioManager
 from .portfolio import Portfolio
 
-
 if TYPE_CHECKING:
+    import pandas as pd  # type: ignore
     from aat.strategy import Strategy
 
 
@@ -32,5 +31,5 @@ class StrategyManagerPortfolioMixin(object):
 
     def priceHistory(
         self, instrument: Optional[Instrument] = None
-    ) -> Union[dict, pd.DataFrame]:
+    ) -> Union[dict, "pd.DataFrame"]:
         return self._portfolio_mgr.priceHistory(instrument=instrument)
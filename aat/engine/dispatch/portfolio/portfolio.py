@@ -1,4 +1,3 @@
-import pandas as pd  # type: ignore
 import json
 from datetime import datetime
 from json import JSONEncoder
@@ -8,6 +7,7 @@ from aat.config import Side
 from aat.core import Order, Trade, Instrument, ExchangeType, Position
 
 if TYPE_CHECKING:
+    import pandas as pd  # type: ignore
     from aat.strategy import Strategy
 
 
@@ -49,9 +49,12 @@ class Portfolio(object):
     # *****************
     def updateStrategies(self, strategies: List) -> None:
         """update with list of strategies"""
-        self._strategies.extend([s.name() for s in strategies])
+        # keeping positions restored from a checkpoint
+        self._strategies.extend(
+            [s.name() for s in strategies if s.name() not in self._strategies]
+        )
         for strategy in self._strategies:
-            self._active_positions_by_strategy[strategy] = {}
+            self._active_positions_by_strategy.setdefault(strategy, {})
 
     def updateAccount(self, positions: List[Position]) -> None:
         """update positions tracking with a position from the exchange"""
@@ -181,15 +184,15 @@ class Portfolio(object):
                 self._active_positions_by_instrument[trade.instrument] = []
 
             # Map position in by strategy
-            self._active_positions_by_strategy[strategy.name()][
-                trade.instrument
-            ] = Position(
-                price=trade.price,
-                size=trade.volume,
-                timestamp=trade.timestamp,
-                instrument=trade.instrument,
-                exchange=trade.exchange,
-                trades=[trade],
+            self._active_positions_by_strategy[strategy.name()][trade.instrument] = (
+                Position(
+                    price=trade.price,
+                    size=trade.volume,
+                    timestamp=trade.timestamp,
+                    instrument=trade.instrument,
+                    exchange=trade.exchange,
+                    trades=[trade],
+                )
             )
 
             # map a single position by instrument
@@ -267,7 +270,9 @@ class Portfolio(object):
 
     def priceHistory(
         self, instrument: Optional[Instrument] = None
-    ) -> Union[pd.DataFrame, dict]:
+    ) -> Union["pd.DataFrame", dict]:
+        import pandas as pd  # type: ignore
+
         if instrument:
             return pd.DataFrame(
                 self._prices[instrument], columns=[instrument.name, "when"]
@@ -278,8 +283,10 @@ class Portfolio(object):
         }
 
     def _constructDf(
-        self, dfs: List[pd.DataFrame], drop_duplicates: bool = True
-    ) -> pd.DataFrame:
+        self, dfs: List["pd.DataFrame"], drop_duplicates: bool = True
+    ) -> "pd.DataFrame":
+        import pandas as pd  # type: ignore
+
         # join along time axis
         if dfs:
             df = pd.concat(dfs, sort=True)
@@ -294,7 +301,9 @@ class Portfolio(object):
             df = pd.DataFrame()
         return df
 
-    def getPnl(self, strategy: "Strategy") -> pd.DataFrame:
+    def getPnl(self, strategy: "Strategy") -> "pd.DataFrame":
+        import pandas as pd  # type: ignore
+
         portfolio = []
         pnl_cols = []
         total_pnl_cols = []
@@ -339,7 +348,9 @@ class Portfolio(object):
         ].sum(axis=1)
         return df_pnl
 
-    def getPnlAll(self) -> pd.DataFrame:
+    def getPnlAll(self) -> "pd.DataFrame":
+        import pandas as pd  # type: ignore
+
         portfolio = []
         pnl_cols = []
         total_pnl_cols = []
@@ -387,7 +398,7 @@ class Portfolio(object):
     def getInstruments(self, strategy: "Strategy") -> None:
         raise NotImplementedError()
 
-    def getPrice(self) -> pd.DataFrame:
+    def getPrice(self) -> "pd.DataFrame":
         portfolio = []
         price_cols = []
         for instrument, price_history in self.priceHistory().items():
@@ -400,7 +411,9 @@ class Portfolio(object):
             portfolio.append(price_history)
         return self._constructDf(portfolio)
 
-    def getAssetPrice(self, strategy: "Strategy") -> pd.DataFrame:
+    def getAssetPrice(self, strategy: "Strategy") -> "pd.DataFrame":
+        import pandas as pd  # type: ignore
+
         portfolio = []
         price_cols = []
         for position in self.allPositions():
@@ -418,7 +431,9 @@ class Portfolio(object):
             portfolio.append(price_history)
         return self._constructDf(portfolio)
 
-    def getSize(self, strategy: "Strategy") -> pd.DataFrame:
+    def getSize(self, strategy: "Strategy") -> "pd.DataFrame":
+        import pandas as pd  # type: ignore
+
         portfolio = []
         size_cols = []
         for position in self.positions(strategy):
@@ -444,7 +459,9 @@ class Portfolio(object):
 
         return self._constructDf(portfolio)[size_cols]
 
-    def getSizeAll(self) -> pd.DataFrame:
+    def getSizeAll(self) -> "pd.DataFrame":
+        import pandas as pd  # type: ignore
+
         portfolio = []
         size_cols = []
         for position in self.allPositions():
@@ -470,7 +487,9 @@ class Portfolio(object):
 
         return self._constructDf(portfolio)[size_cols]
 
-    def getNotional(self, strategy: "Strategy") -> pd.DataFrame:
+    def getNotional(self, strategy: "Strategy") -> "pd.DataFrame":
+        import pandas as pd  # type: ignore
+
         portfolio = []
         notional_cols = []
         for position in self.positions(strategy):
@@ -498,7 +517,9 @@ class Portfolio(object):
 
     def getNotionalAll(
         self,
-    ) -> pd.DataFrame:
+    ) -> "pd.DataFrame":
+        import pandas as pd  # type: ignore
+
         portfolio = []
         notional_cols = []
         for position in self.allPositions():
@@ -523,7 +544,9 @@ class Portfolio(object):
             portfolio.append(price_history)
         return self._constructDf(portfolio)[notional_cols]
 
-    def getInvestment(self, strategy: "Strategy") -> pd.DataFrame:
+    def getInvestment(self, strategy: "Strategy") -> "pd.DataFrame":
+        import pandas as pd  # type: ignore
+
         portfolio = []
         investment_cols = []
         for position in self.positions(strategy):
@@ -1,5 +1,7 @@
 import asyncio
+from contextvars import copy_context
 from datetime import datetime
+from functools import partial
 from typing import Any, Callable, List, Optional, Union, TYPE_CHECKING
 
 from aat import AATException
@@ -7,6 +9,7 @@ from aat.config import ExitRoutine, InstrumentType, TradingType
 from aat.core import Instrument, ExchangeType, Event, Order, Trade, OrderBook
 from aat.exchange import Exchange
 
+from .conflation import Conflator
 from .periodic import Periodic
 
 if TYPE_CHECKING:
@@ -19,6 +22,7 @@ class StrategyManagerUtilsMixin(object):
     _exchanges: List[Exchange]
     _periodics: List[Periodic]
     _data_subscriptions = {}  # type: ignore
+    _conflators = {}  # type: ignore
 
     #################
     # Other Methods #
@@ -49,13 +53,41 @@ class StrategyManagerUtilsMixin(object):
             raise NotImplementedError()
         return [exc.exchange() for exc in self._exchanges]
 
-    async def subscribe(self, instrument: Instrument, strategy: "Strategy") -> None:
-        """Subscribe to market data for the given instrument"""
+    async def subscribe(
+        self,
+        instrument: Instrument,
+        strategy: "Strategy",
+        conflate: bool = False,
+        vwap: bool = False,
+    ) -> None:
+        """Subscribe to market data for the given instrument
+
+        Args:
+            instrument (Instrument): instrument to subscribe to
+            strategy (Strategy): subscribing strategy
+            conflate (bool): while the strategy's callbacks for the instrument are
+                             still running, collapse further OPEN/CHANGE events for
+                             each order to the latest
+            vwap (bool): when conflating, also aggregate trades into a single
+                         volume weighted print (implies `conflate`)
+        """
         if strategy not in self._data_subscriptions:
             self._data_subscriptions[strategy] = []
 
         self._data_subscriptions[strategy].append(instrument)
 
+        if conflate or vwap:
+            self._conflators[(strategy, instrument)] = Conflator(self._engine, vwap)
+        else:
+            self._conflators.pop((strategy, instrument), None)
+
+        # rebuild engine's routing table
+        self._engine._resetDataRoutes()
+
+        await self._subscribeExchange(instrument)
+
+    async def _subscribeExchange(self, instrument: Instrument) -> None:
+        """subscribe to the instrument's market data on its exchange"""
         if instrument.exchange not in self.exchanges():
             raise AATException(
                 "Exchange not installed: {} (Installed are [{}]".format(
@@ -67,6 +99,12 @@ class StrategyManagerUtilsMixin(object):
             if instrument and instrument.exchange == exc.exchange():
                 await exc.subscribe(instrument)
 
+    def conflator(
+        self, handler: Callable, instrument: Optional[Instrument]
+    ) -> Optional[Conflator]:
+        """market data conflation for handler's subscription to instrument, if any"""
+        return self._conflators.get((handler, instrument))
+
     def dataSubscriptions(self, handler: Callable, event: Event) -> bool:
         """does handler subscribe to the data for event"""
         if handler not in self._data_subscriptions:
@@ -108,12 +146,21 @@ class StrategyManagerUtilsMixin(object):
         return None
 
     def _make_async(self, function: Callable) -> Callable:
-        async def _wrapper() -> Any:
-            return await self.loop().run_in_executor(
-                self._engine, self._engine.executor, function
-            )
+        if not self._engine._inline(function):
+
+            async def _wrapper(**kwargs: Any) -> Any:
+                # in the engine's context, so e.g. its clock is current
+                return await self.loop().run_in_executor(
+                    self._engine.executor,
+                    partial(copy_context().run, function, **kwargs),
+                )
+
+            return _wrapper
+
+        async def _inline_wrapper(**kwargs: Any) -> Any:
+            return function(**kwargs)
 
-        return _wrapper
+        return _inline_wrapper
 
     def periodic(
         self,
@@ -180,7 +227,7 @@ class StrategyManagerUtilsMixin(object):
 
         periodic = Periodic(
             self.loop(),
-            self._engine._latest,
+            self._engine.now(),
             function,
             second,
             minute,
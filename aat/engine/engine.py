@@ -1,59 +1,59 @@
 import asyncio
+import heapq
 import inspect
 import os
 import os.path
 import pytz
+import time
 
 from asyncio import Future, Queue
 from aiostream.stream import merge  # type: ignore
-from collections import deque
 from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime, timedelta
+from contextvars import copy_context
+from datetime import datetime
+from functools import partial
 from traitlets.config.application import Application  # type: ignore
 from traitlets import (  # type: ignore
     validate,
     TraitError,
     Unicode,
     Bool,
+    Int,
+    Float,
     List,
     Instance,
 )
-from tornado.web import (
-    StaticFileHandler,
-    RedirectHandler,
-    Application as TornadoApplication,
-)
 from typing import (
     Any,
     Awaitable,
     AsyncGenerator,
+    AsyncIterator,
     Callable,
-    Deque,
     Dict,
     List as ListType,
     Optional,
     Tuple,
+    Union,
 )
 
-try:
-    from perspective import (  # type: ignore
-        PerspectiveManager,
-        PerspectiveTornadoHandler,
-    )
-except ImportError:
-    PerspectiveManager, PerspectiveTornadoHandler = None, None  # type: ignore
-
+from aat.core.clock import Clock, useClock
 from aat.core.handler import EventHandler, PrintHandler
-from aat.core.data import Event, Error
+from aat.core.data import Event, EventBatch
+from aat.core.instrument import Instrument
 from aat.core.table import TableHandler
 from aat.config import TradingType, EventType, getStrategies, getExchanges
 from aat.exchange import Exchange
+from aat.exchange.generic.journal import JournalWriter
 from aat.strategy import Strategy
 
 # from aat.strategy import Strategy
-from aat.ui import ServerApplication
 
+from .checkpoint import EngineCheckpoint
 from .dispatch import StrategyManager, OrderManager, PortfolioManager, RiskManager
+from .futures import FutureTracker
+from .inbox import StrategyInbox
+from .monitor import EngineMonitor
+from .stats import EngineStats, handlerName
 
 try:
     import uvloop  # type: ignore
@@ -61,6 +61,16 @@ except ImportError:
     uvloop = None
 
 
+# market data events, which are filtered by data subscriptions
+_DATA_EVENTS = (
+    EventType.TRADE,
+    EventType.OPEN,
+    EventType.CHANGE,
+    EventType.CANCEL,
+    EventType.DATA,
+)
+
+
 class TradingEngine(Application):
     """A configureable trading application"""
 
@@ -70,6 +80,17 @@ class TradingEngine(Application):
     # Configureable parameters
     verbose = Bool(default_value=True)  # type: ignore
     api = Bool(default_value=False)  # type: ignore
+    inline_callbacks = Bool(default_value=True)  # type: ignore
+    batch_size = Int(default_value=1)  # type: ignore
+    batch_latency = Float(default_value=0.1)  # type: ignore
+    instrument = Bool(default_value=False)  # type: ignore
+    max_priority_events = Int(default_value=64)  # type: ignore
+    inbox_size = Int(default_value=0)  # type: ignore
+    inbox_policy = Unicode(default_value="block")  # type: ignore
+    journal = Unicode(default_value="")  # type: ignore
+    checkpoint = Unicode(default_value="")  # type: ignore
+    checkpoint_interval = Float(default_value=60.0)  # type: ignore
+    restore = Bool(default_value=False)  # type: ignore
     port = Unicode(default_value="8080", help="Port to run on").tag(config=True)  # type: ignore
     tz = Instance(  # type: ignore
         klass=pytz.BaseTzInfo,
@@ -89,13 +110,10 @@ class TradingEngine(Application):
     event_handlers = List(trait=Instance(EventHandler), default_value=[])  # type: ignore
     strategies = List(trait=Instance(Strategy), default_value=[])  # type: ignore
 
-    # API application
-    api_application = Instance(klass=TornadoApplication)  # type: ignore
+    # API application, tornado and perspective are only imported if enabled
+    api_application = Instance(klass=object, allow_none=True)  # type: ignore
     api_handlers = List(default_value=[])  # type: ignore
-
-    table_manager = Instance(  # type: ignore
-        klass=PerspectiveManager or object, args=(), kwargs={}
-    )  # failover to object
+    table_manager = Instance(klass=object, allow_none=True)  # type: ignore
 
     aliases = {"port": "AAT.port", "trading_type": "AAT.trading_type"}
 
@@ -118,6 +136,9 @@ class TradingEngine(Application):
         return proposal["value"]
 
     def __init__(self, **config: dict) -> None:
+        # the engine's own clock, shared with its exchanges and journal
+        self._clock = Clock()
+
         # get port for API access
         self.port = config.get("general", {}).get("port", self.port)
 
@@ -127,6 +148,80 @@ class TradingEngine(Application):
         # enable API access?
         self.api = bool(int(config.get("general", {}).get("api", self.api)))
 
+        # run synchronous callbacks inline on the event loop (vs in the executor)?
+        self.inline_callbacks = bool(
+            int(
+                config.get("general", {}).get("inline_callbacks", self.inline_callbacks)
+            )
+        )
+
+        # coalesce consecutive market data events into batches of up to this
+        # size, for handlers implementing batch callbacks (e.g. `onTradeBatch`)
+        self.batch_size = int(
+            config.get("general", {}).get("batch_size", self.batch_size)
+        )
+
+        # max time (in seconds, simulated when offline) to hold a batch
+        # before delivering it
+        self.batch_latency = float(
+            config.get("general", {}).get("batch_latency", self.batch_latency)
+        )
+
+        # max number of queued order entry events to process ahead of each
+        # market data event, so market data isn't starved
+        self.max_priority_events = int(
+            config.get("general", {}).get(
+                "max_priority_events", self.max_priority_events
+            )
+        )
+
+        # give each strategy a bounded inbox of this size, run by its own
+        # worker task, and what to do when it fills up (see `StrategyInbox`)
+        self.inbox_size = int(
+            config.get("general", {}).get("inbox_size", self.inbox_size)
+        )
+        self.inbox_policy = str(
+            config.get("general", {}).get("inbox_policy", self.inbox_policy)
+        )
+
+        # record every exchange and order entry event to this file, for replay
+        # with `JournalExchange`
+        self.journal = str(config.get("general", {}).get("journal", self.journal))
+        self._journal = (
+            JournalWriter(self.journal, clock=self._clock) if self.journal else None
+        )
+
+        # periodically save order and portfolio state to this file, and
+        # restore from it on startup (see `EngineCheckpoint`)
+        self.checkpoint = str(
+            config.get("general", {}).get("checkpoint", self.checkpoint)
+        )
+        self.checkpoint_interval = float(
+            config.get("general", {}).get(
+                "checkpoint_interval", self.checkpoint_interval
+            )
+        )
+        self.restore = bool(int(config.get("general", {}).get("restore", self.restore)))
+        self._checkpoint = (
+            EngineCheckpoint(self, self.checkpoint, self.checkpoint_interval)
+            if self.checkpoint
+            else None
+        )
+
+        # record per handler callback counts and latencies?
+        self.instrument = bool(
+            int(config.get("general", {}).get("instrument", self.instrument))
+        )
+        self._stats = EngineStats() if self.instrument else None
+
+        # live, warn when the engine falls behind by more than these thresholds
+        self._monitor = EngineMonitor(
+            max_lag=float(config.get("general", {}).get("max_lag", 1.0)),
+            max_queued=int(config.get("general", {}).get("max_queued", 1000)),
+            max_futures=int(config.get("general", {}).get("max_futures", 1000)),
+            log=self.log,
+        )
+
         # override timezome
         self.tz = (
             pytz.timezone(config.get("general", {}).get("timezone", None))
@@ -148,11 +243,11 @@ class TradingEngine(Application):
             trading_type=self.trading_type,
             verbose=self.verbose,
         )
+        for exchange in self.exchanges:
+            exchange.setClock(self._clock)
 
         # instantiate the Strategy Manager
-        self.manager = StrategyManager(
-            self, self.trading_type, self.exchanges, self._load_accounts
-        )
+        self.manager = self._makeManager()
 
         # set event loop to use uvloop
         if uvloop:
@@ -166,10 +261,39 @@ class TradingEngine(Application):
             m: [] for m in EventType.__members__.values()  # type: ignore
         }
 
-        # setup `now` handler for backtest
-        self._latest = (
-            datetime.fromtimestamp(0, tz=self.tz) if self._offline() else datetime.now()
+        # outstanding callback futures
+        self._futures = FutureTracker()
+
+        # batch callback subscriptions, and the batch being coalesced
+        self._batch_subscriptions: Dict[EventType, ListType] = {
+            EventType.TRADE: [],
+            EventType.DATA: [],
+        }
+        self._batch: ListType[Event] = []
+        self._batch_started = 0.0
+        self._batch_timer: Optional[asyncio.TimerHandle] = None
+
+        # market data routing table, lazily populated per event type and
+        # instrument with the callbacks subscribed to that instrument
+        self._data_routes: Dict[Tuple[EventType, Optional[Instrument]], ListType] = {}
+
+        # per strategy inboxes, if enabled
+        self._inboxes: Dict[EventHandler, StrategyInbox] = {}
+
+        # offline, the simulated time before the first event
+        self._epoch = datetime.fromtimestamp(0, tz=self.tz)
+
+        # offline, only replay exchange events in [start_date, end_date)
+        self._start_date = self._bound(
+            config.get("general", {}).get("start_date", None)  # type: ignore
         )
+        self._end_date = self._bound(
+            config.get("general", {}).get("end_date", None)  # type: ignore
+        )
+        if self._offline():
+            # let exchanges skip ahead, rather than replaying events to drop
+            for exchange in self.exchanges:
+                exchange.seek(self._start_date)
 
         # register internal management event handler before all strategy handlers
         self.registerHandler(self.manager)
@@ -183,6 +307,13 @@ class TradingEngine(Application):
             self.log.critical("Installing strategy: {}".format(strategy))
             self.registerHandler(strategy)
 
+        # warm restart
+        if self._checkpoint is not None and self.restore:
+            if self._checkpoint.restore():
+                self.log.critical(
+                    "Restored from checkpoint: {}".format(self.checkpoint)
+                )
+
         # warn if no event handlers installed
         if not self.event_handlers:
             self.log.critical("Warning! No event handlers set")
@@ -196,6 +327,23 @@ class TradingEngine(Application):
         if self.api:
             self.log.critical("Installing API handlers")
 
+            from tornado.web import StaticFileHandler, RedirectHandler
+
+            from aat.ui import ServerApplication
+
+            try:
+                from perspective import (  # type: ignore
+                    PerspectiveManager,
+                    PerspectiveTornadoHandler,
+                )
+            except ImportError:
+                PerspectiveManager, PerspectiveTornadoHandler = None, None
+
+            # failover to object
+            self.table_manager = (
+                PerspectiveManager() if PerspectiveManager is not None else object()
+            )
+
             if PerspectiveManager is not None:
                 table_handler = TableHandler()
                 table_handler.installTables(self.table_manager)
@@ -282,6 +430,11 @@ class TradingEngine(Application):
 
             self.api_application.listen(self.port)
 
+    def _makeManager(self) -> StrategyManager:
+        return StrategyManager(
+            self, self.trading_type, self.exchanges, self._load_accounts
+        )
+
     def _offline(self) -> bool:
         return self.trading_type in (TradingType.BACKTEST, TradingType.SIMULATION)
 
@@ -303,19 +456,40 @@ class TradingEngine(Application):
                 # could be none if not implemented
                 cbs = handler.callback(type)
 
+                # batch callbacks replace per-event callbacks when batching
+                # is enabled, or the handler only implements the former
+                batch_cb = handler.batchCallback(type)
+                if batch_cb and (self.batch_size > 1 or not any(cbs)):
+                    self.registerBatchCallback(type, batch_cb, handler)
+                    continue
+
                 for cb in cbs:
                     if cb:
                         self.registerCallback(type, cb, handler)
+
+            inbox = self._makeInbox(handler)
+            if inbox is not None:
+                self._inboxes[handler] = inbox
+                self._resetDataRoutes()
+
             handler._setManager(self.manager)
             return handler
         return None
 
     def _make_async(self, function: Callable) -> Callable[..., Awaitable]:
         async def _wrapper(event: Event) -> Any:
-            return await self.event_loop.run_in_executor(self.executor, function, event)
+            # in the engine's context, so e.g. its clock is current
+            return await self.event_loop.run_in_executor(
+                self.executor, partial(copy_context().run, function, event)
+            )
 
         return _wrapper
 
+    def _inline(self, callback: Callable) -> bool:
+        """should a synchronous callback run inline on the event loop, rather
+        than in the executor"""
+        return self.inline_callbacks and not getattr(callback, "_executor", False)
+
     def registerCallback(
         self,
         event_type: EventType,
@@ -331,13 +505,147 @@ class TradingEngine(Application):
         Returns:
             value (bool): True if registered (new), else False
         """
-        if (callback, handler) not in self._handler_subscriptions[event_type]:  # type: ignore
-            if not asyncio.iscoroutinefunction(callback):
-                callback = self._make_async(callback)
-            self._handler_subscriptions[event_type].append((callback, handler))  # type: ignore
+        if (callback, handler) not in (
+            (cb, h) for cb, h, _ in self._handler_subscriptions[event_type]  # type: ignore
+        ):
+            callback, inline = self._wrapCallback(event_type, callback, handler)
+            self._handler_subscriptions[event_type].append((callback, handler, inline))  # type: ignore
+            self._resetDataRoutes()
             return True
         return False
 
+    def registerBatchCallback(
+        self,
+        event_type: EventType,
+        callback: Callable,
+        handler: Optional[EventHandler] = None,
+    ) -> bool:
+        """register a callback for batches of a given market data event type
+
+        Args:
+            event_type (EventType): event type enum value to register, one of TRADE or DATA
+            callback (function): function to call with an `EventBatch` of `event_type` events
+            handler (EventHandler): class holding the callback (optional)
+        Returns:
+            value (bool): True if registered (new), else False
+        """
+        if (callback, handler) not in (
+            (cb, h) for cb, h, _ in self._batch_subscriptions[event_type]
+        ):
+            callback, inline = self._wrapCallback(event_type, callback, handler)
+            self._batch_subscriptions[event_type].append((callback, handler, inline))
+            return True
+        return False
+
+    def _wrapCallback(
+        self,
+        event_type: EventType,
+        callback: Callable,
+        handler: Optional[EventHandler] = None,
+    ) -> Tuple[Callable, bool]:
+        """synchronous callbacks either run inline, or get
+        wrapped to run in the executor"""
+        inline = False
+        if not asyncio.iscoroutinefunction(callback):
+            inline = self._inline(callback)
+            if not inline:
+                callback = self._make_async(callback)
+
+        if self._stats is not None:
+            callback = self._stats.wrap(
+                callback,
+                handler if handler is not None else callback,
+                event_type,
+                inline,
+            )
+        return callback, inline
+
+    def _makeInbox(self, handler: EventHandler) -> Optional[StrategyInbox]:
+        if self.inbox_size > 0 and isinstance(handler, Strategy):
+            return StrategyInbox(self, self.inbox_size, self.inbox_policy)
+        return None
+
+    def inbox(self, strategy: Strategy) -> Optional[StrategyInbox]:
+        """the strategy's inbox, if enabled via `inbox_size` in the general config"""
+        return self._inboxes.get(strategy)
+
+    def monitor(self) -> EngineMonitor:
+        """event loop lag and backlog monitor, see `EngineMonitor`"""
+        return self._monitor
+
+    def stats(self) -> Optional[EngineStats]:
+        """callback instrumentation, if enabled via `instrument` in the general config"""
+        return self._stats
+
+    def _logStats(self) -> None:
+        if self._stats is not None:
+            self.log.critical("Callback stats (us):\n{}".format(self._stats.table()))
+
+    def _startClock(self) -> None:
+        """hand out simulated time from the engine's clock offline, starting
+        from the epoch, or cache the time per event live. The clock is current
+        for everything the engine runs, so other engines in the same process
+        keep their own time"""
+        useClock(self._clock)
+        self._clock.reset()
+        if self._offline():
+            self._clock.simulate(self._epoch)
+        else:
+            self._clock.live(self.tz)
+
+    def _close(self) -> None:
+        """close the journal, save a final checkpoint, and stop caching the
+        time live. Offline, the clock keeps the time of the last event"""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if self._checkpoint is not None:
+            self._checkpoint.save()
+        if not self._offline():
+            self._clock.reset()
+
+    def _resetDataRoutes(self) -> None:
+        """clear the market data routing table, to be rebuilt on demand
+        after callbacks or data subscriptions change"""
+        self._data_routes.clear()
+
+    def _dataRoute(self, event: Event) -> ListType:
+        """return the callbacks subscribed to the instrument of a market data event"""
+        key = (event.type, getattr(event.target, "instrument", None))
+        route = self._data_routes.get(key)
+
+        if route is None:
+            route = self._data_routes[key] = []
+
+            # conflated handlers get a single entry for all their callbacks
+            conflated: Dict[EventHandler, ListType] = {}
+
+            for callback, handler, inline in self._handler_subscriptions[event.type]:  # type: ignore
+                if not self.manager.dataSubscriptions(handler, event):
+                    continue
+
+                # inboxes already run the handler's callbacks one at a time
+                conflator = (
+                    self.manager.conflator(handler, key[1])
+                    if handler not in self._inboxes
+                    else None
+                )
+                if conflator is None:
+                    route.append((callback, handler, inline))
+                    continue
+
+                if handler not in conflated:
+                    conflated[handler] = []
+                    route.append(
+                        (
+                            partial(conflator.send, callbacks=conflated[handler]),
+                            handler,
+                            True,
+                        )
+                    )
+                conflated[handler].append((callback, inline))
+        return route
+
     async def pushEvent(self, event: Event) -> None:
         """push non-exchange event into the queue"""
         await self._queued_events.put(event)
@@ -345,18 +653,78 @@ class TradingEngine(Application):
     async def pushTargetedEvent(self, strategy: Strategy, event: Event) -> None:
         """push non-exchange event targeted to a specific strat into the queue"""
         await self._queued_targeted_events.put((event, strategy))
+        self._targeted_pending.set()
 
-    async def _wraptick(self, ticker) -> Event:  # type: ignore
+    async def _wraptick(
+        self, ticker: AsyncIterator[Event]
+    ) -> AsyncGenerator[Event, None]:
         async for ev in ticker:
             yield ev
         yield Event(type=EventType.EXIT, target=None)
 
+    async def _next(self, ticker: AsyncIterator[Event]) -> Event:
+        """pull the next event from an exchange"""
+        return await ticker.__anext__()
+
+    async def _ordered(
+        self, tickers: ListType[AsyncIterator[Event]]
+    ) -> AsyncGenerator[Event, None]:
+        """merge exchange streams in timestamp order, keeping one event of
+        look-ahead per exchange. Events without a timestamp are passed through
+        as soon as they are pulled, and events outside of the replay window
+        (`start_date` to `end_date`) are dropped, though exchanges replaying
+        cached data start at the window (see `Exchange.seek`). Yields an exit
+        event once every exchange is exhausted, or the window has passed"""
+        heap: ListType[Tuple[datetime, int, Event]] = []
+        pending = list(range(len(tickers)))
+
+        while pending or heap:
+            # refill look-ahead for exchanges whose last event was sent
+            for index in pending:
+                while True:
+                    try:
+                        event = await self._next(tickers[index])
+                    except StopAsyncIteration:
+                        break
+
+                    if event.type == EventType.EXIT:
+                        break
+
+                    self._localize(event)
+                    timestamp = getattr(event.target, "timestamp", None)
+
+                    if timestamp is None:
+                        yield event
+                        continue
+
+                    if self._start_date is not None and timestamp < self._start_date:
+                        # before the replay window
+                        continue
+
+                    heapq.heappush(heap, (timestamp, index, event))
+                    break
+
+            pending = []
+
+            if heap and self._end_date is not None and heap[0][0] >= self._end_date:
+                # everything left is after the replay window
+                break
+
+            if heap:
+                _, index, event = heapq.heappop(heap)
+                pending.append(index)
+                yield event
+
+        yield Event(type=EventType.EXIT, target=None)
+
     async def run(self) -> None:
         """run the engine"""
         # setup future queue
         self._queued_events: Queue[Event] = Queue()
         self._queued_targeted_events: Queue[Tuple[Event, Strategy]] = Queue()
-        self._futures: Deque[Future] = deque()
+        self._targeted_pending = asyncio.Event()
+        self._futures = FutureTracker()
+        self._startClock()
 
         # await all connections
         await asyncio.gather(
@@ -369,129 +737,172 @@ class TradingEngine(Application):
         # send start event to all callbacks
         await self.processEvent(Event(type=EventType.START, target=None))
 
+        tickers = [
+            exch.tick()
+            for exch in self.exchanges
+            if inspect.isasyncgenfunction(exch.tick)
+        ]
+
+        if self._offline():
+            # replay exchange streams in timestamp order
+            tickers = [self._ordered(tickers)]
+        else:
+            tickers = [self._wraptick(ticker) for ticker in tickers]
+
         # **************** #
         # Main event loop
         # **************** #
         async with merge(
             self._tick_queued_events(),
-            self._tick_queued_targeted_events(),
-            *(
-                self._wraptick(exch.tick())
-                for exch in self.exchanges + [self]
-                if inspect.isasyncgenfunction(exch.tick)
-            ),
+            self._wake_queued_targeted_events(),
+            *tickers,
+            self._wraptick(self.tick()),
         ).stream() as stream:
             # stream through all events
             async for event in stream:
-                # unpack targetted events
-                if isinstance(event, tuple):
-                    event, strategy = event
-                else:
-                    strategy = None
+                if not self._offline():
+                    self._clock.tick()
+
+                # order entry events take priority
+                await self._drainTargeted()
+
+                if event is None:
+                    # woken up just to process order entry events
+                    continue
 
                 # if done event
                 if event.type == EventType.EXIT:
                     break
 
+                # check if falling behind
+                if event.type == EventType.HEARTBEAT and not self._offline():
+                    self._futures.extend(
+                        self._monitor.heartbeat(
+                            self._queued_events.qsize(),
+                            self._queued_targeted_events.qsize(),
+                            len(self._futures),
+                            {handlerName(h): len(i) for h, i in self._inboxes.items()},
+                        )
+                    )
+
                 # TODO move out of critical path
                 if self._offline():
                     # handle timezone
-                    if (
-                        hasattr(event, "target")
-                        and hasattr(event.target, "timestamp")
-                        and self._latest.tzinfo
-                        and not event.target.timestamp.tzinfo
-                    ):
-                        # assume in local time
-                        event.target.timestamp = event.target.timestamp.replace(
-                            tzinfo=self._latest.tzinfo
-                        )
+                    self._localize(event)
 
-                    # inject periodics
-                    # TODO optimize
-                    # Manager should keep track of the intervals for its periodics,
-                    # then we don't need to go through seconds (which is what the
-                    # live engine's `tick` method does below). Instead we can just
-                    # calculate exactly the intervals
+                    # inject periodics expiring between the last event and this one
                     if (
-                        self._latest != datetime.fromtimestamp(0, tz=self.tz)
+                        self._clock.now() != self._epoch
                         and hasattr(event, "target")
                         and hasattr(event.target, "timestamp")
                     ):
-                        # TODO in progress optimization
-                        intervals = self.manager.periodicIntervals()
-
                         # not the first tick
-                        for _ in range(
-                            int(
-                                (event.target.timestamp - self._latest).total_seconds()
-                                / intervals
-                            )
+                        for timestamp, periodics in self.manager.expiredPeriodics(
+                            self._clock.now(), event.target.timestamp, inclusive=False
                         ):
-                            print(
-                                "{} - {}".format(event.target.timestamp, self._latest)
+                            self._clock.simulate(timestamp)
+                            self._futures.extend(
+                                asyncio.ensure_future(p.fire(timestamp))
+                                for p in periodics
                             )
-                            self._latest = self._latest + timedelta(
-                                seconds=1 * intervals
-                            )
-                            if any(
-                                p.expires(self._latest)
-                                for p in self.manager.periodics()
-                            ):
-                                await asyncio.gather(
-                                    *(
-                                        asyncio.create_task(p.execute(self._latest))
-                                        for p in self.manager.periodics()
-                                        if p.expires(self._latest)
-                                    )
-                                )
+                            await asyncio.sleep(0)
 
                 # tick exchange event to handlers
-                self._futures.extend(await self.processEvent(event, strategy))
+                self._futures.extend(await self.processEvent(event))
 
                 # TODO move out of critical path
                 if self._offline():
                     # use time of last event
-                    self._latest = (
-                        event.target.timestamp
-                        if hasattr(event, "target")
-                        and hasattr(event.target, "timestamp")
-                        else self._latest
+                    if hasattr(event, "target") and hasattr(event.target, "timestamp"):
+                        self._clock.simulate(event.target.timestamp)  # type: ignore
+
+                    # process any periodics
+                    if self._clock.now() != self._epoch:
+                        for timestamp, periodics in self.manager.expiredPeriodics(
+                            self._clock.now(), self._clock.now()
+                        ):
+                            self._futures.extend(
+                                asyncio.ensure_future(p.fire(timestamp))
+                                for p in periodics
+                            )
+                elif self.manager.periodics():
+                    # process any periodics, as of when the event arrived
+                    now = self._clock.now()
+                    self._futures.extend(
+                        [
+                            asyncio.create_task(p.execute(now))
+                            for p in self.manager.periodics()
+                            if p.expires(now)
+                        ]
                     )
-                else:
-                    # use now
-                    self._latest = datetime.now(tz=self.tz)
-
-                # process any periodics
-                self._futures.extend(
-                    [
-                        asyncio.create_task(p.execute(self._latest))
-                        for p in self.manager.periodics()
-                        if p.expires(self._latest)
-                    ]
-                )
 
-                remaining_futures: Deque[Future] = deque()
-                for fut in self._futures:
-                    if fut.done():
-                        # trigger exception if necessary
-                        fut.result()
-                    else:
-                        remaining_futures.append(fut)
-                self._futures = remaining_futures
+                # trigger exception if necessary
+                self._futures.raiseErrors()
 
         # Before engine shutdown, send an exit event
         await self.processEvent(Event(type=EventType.EXIT, target=None))
+        await asyncio.gather(*(inbox.join() for inbox in self._inboxes.values()))
+        self._close()
+        self._logStats()
+
+    async def _drainTargeted(self) -> None:
+        """process queued order entry events, up to `max_priority_events`.
+        This is the only consumer of the queue, so e.g. the ack of an order
+        is always processed before its fills"""
+        for _ in range(self.max_priority_events):
+            if self._queued_targeted_events.empty():
+                return
+            event, strategy = self._queued_targeted_events.get_nowait()
+            self._futures.extend(await self.processEvent(event, strategy))
+
+        if not self._queued_targeted_events.empty():
+            # wake again for the rest, letting market data in between
+            self._targeted_pending.set()
+
+    def _bound(self, when: Optional[Union[str, datetime]]) -> Optional[datetime]:
+        """parse a replay window bound, naive bounds are in the engine's timezone"""
+        if not when:
+            return None
+        if isinstance(when, str):
+            when = datetime.fromisoformat(when)
+        if self._epoch.tzinfo and not when.tzinfo:
+            when = when.replace(tzinfo=self._epoch.tzinfo)
+        return when
+
+    def _localize(self, event: Event) -> None:
+        """offline, assume naive event timestamps are in the engine's timezone"""
+        if (
+            hasattr(event, "target")
+            and hasattr(event.target, "timestamp")
+            and self._clock.now().tzinfo
+            and not event.target.timestamp.tzinfo  # type: ignore
+        ):
+            # assume in local time
+            event.target.timestamp = event.target.timestamp.replace(  # type: ignore
+                tzinfo=self._clock.now().tzinfo
+            )
 
     async def _tick_queued_events(self) -> AsyncGenerator[Event, None]:
         while True:
             yield await self._queued_events.get()
 
-    async def _tick_queued_targeted_events(
-        self,
-    ) -> AsyncGenerator[Tuple[Event, Strategy], None]:
+    async def _wake_queued_targeted_events(self) -> AsyncGenerator[None, None]:
+        """wake the main event loop when order entry events are queued, leaving
+        them in the queue for `_drainTargeted`"""
         while True:
-            yield await self._queued_targeted_events.get()
+            await self._targeted_pending.wait()
+            self._targeted_pending.clear()
+            yield None
+
+    def _invoke(
+        self, callback: Callable, event: Union[Event, EventBatch], inline: bool
+    ) -> Optional[Future]:
+        """call a callback with an event, returning a future if it runs asynchronously"""
+        if inline:
+            # synchronous, run directly on the loop
+            callback(event)
+            return None
+        return asyncio.ensure_future(callback(event))
 
     async def processEvent(
         self, event: Event, strategy: Optional[Strategy] = None
@@ -502,51 +913,133 @@ class TradingEngine(Application):
             event (Event): event to send
         """
         ret: ListType[Future] = []
+
+        if self._batch and (
+            (event.type != self._batch[0].type and event.type != EventType.HEARTBEAT)
+            or self._batchTime(event) - self._batch_started >= self.batch_latency
+        ):
+            # deliver the pending batch before anything that follows it
+            ret.extend(await self._flushBatch())
+
         if event.type == EventType.HEARTBEAT:
             # ignore heartbeat
+            if not self._offline():
+                # live, flush recorded events about once a second
+                if self._journal is not None:
+                    self._journal.flush()
+                if self._checkpoint is not None:
+                    self._checkpoint.heartbeat()
             return ret
 
-        for callback, handler in self._handler_subscriptions[event.type]:  # type: ignore
+        if self._checkpoint is not None:
+            self._checkpoint.changed()
+
+        if self._journal is not None:
+            self._journal.write(
+                event, self.strategies.index(strategy) if strategy else None
+            )
+
+        if strategy is None and self._batch_subscriptions.get(event.type):
+            # hold for batch callbacks
+            if not self._batch:
+                self._batch_started = self._batchTime(event)
+
+                if not self._offline():
+                    # deliver it once the latency budget is spent, even if no
+                    # other event arrives in the meantime
+                    self._batch_timer = asyncio.get_event_loop().call_later(
+                        self.batch_latency, self._batchExpired
+                    )
+            self._batch.append(event)
+
+            if len(self._batch) >= self.batch_size:
+                ret.extend(await self._flushBatch())
+
+        if event.type in _DATA_EVENTS:
+            # only handlers subscribed to this instrument
+            subscriptions = self._dataRoute(event)
+        else:
+            subscriptions = self._handler_subscriptions[event.type]  # type: ignore
+
+        ret.extend(await self._callHandlers(event, subscriptions, strategy))
+        return ret
+
+    def _batchTime(self, event: Event) -> float:
+        """the time, in seconds, batch latency budgets are measured against. Live
+        this is the wall clock, but offline it is the simulated time of the
+        event, so batches don't depend on how fast the backtest runs"""
+        if not self._offline():
+            return time.monotonic()
+        timestamp = getattr(event.target, "timestamp", None)
+        return (timestamp or self._clock.now()).timestamp()
+
+    def _batchExpired(self) -> None:
+        """the pending batch's latency budget is spent, so flush it"""
+        self._batch_timer = None
+        self._futures.append(asyncio.ensure_future(self._flushExpired()))
+
+    async def _flushExpired(self) -> None:
+        # unless it was delivered (and another batch begun) in the meantime
+        if self._batch and time.monotonic() - self._batch_started >= self.batch_latency:
+            self._futures.extend(await self._flushBatch())
+
+    async def _flushBatch(self) -> ListType[Future]:
+        """send the pending batch to the batch callbacks subscribed to its instruments"""
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+
+        events, self._batch = self._batch, []
+        event_type = events[0].type
+
+        ret: ListType[Future] = []
+        for callback, handler, inline in self._batch_subscriptions[event_type]:
+            batch = EventBatch(
+                event_type,
+                [e for e in events if self.manager.dataSubscriptions(handler, e)],
+            )
+            if batch:
+                ret.extend(
+                    await self._callHandlers(batch, [(callback, handler, inline)])
+                )
+        return ret
+
+    async def _callHandlers(
+        self,
+        event: Union[Event, EventBatch],
+        subscriptions: ListType,
+        strategy: Optional[Strategy] = None,
+    ) -> ListType[Future]:
+        ret: ListType[Future] = []
+        for callback, handler, inline in subscriptions:
             # TODO make cleaner? move to somewhere not in critical path?
             if strategy is not None and (handler not in (strategy, self.manager)):
                 continue
 
-            # TODO make cleaner? move to somewhere not in critical path?
-            if event.type in (
-                EventType.TRADE,
-                EventType.OPEN,
-                EventType.CHANGE,
-                EventType.CANCEL,
-                EventType.DATA,
-            ) and not self.manager.dataSubscriptions(handler, event):
+            if self._inboxes and handler in self._inboxes:
+                # run in order by the strategy's worker
+                await self._inboxes[handler].put(
+                    callback,
+                    event,
+                    inline,
+                    droppable=strategy is None and event.type in _DATA_EVENTS,
+                )
                 continue
 
             try:
-                ret.append(asyncio.ensure_future(callback(event)))
+                future = self._invoke(callback, event, inline)
+                if future is not None:
+                    ret.append(future)
             except KeyboardInterrupt:
                 raise
             except SystemExit:
                 raise
             except BaseException as e:
-                if event.type == EventType.ERROR:
-                    # don't infinite error
-                    raise
-                await asyncio.sleep(1)
-                return [
-                    asyncio.ensure_future(
-                        self.processEvent(
-                            Event(
-                                type=EventType.ERROR,
-                                target=Error(
-                                    target=event,
-                                    handler=handler,
-                                    callback=callback,
-                                    exception=e,
-                                ),
-                            )
-                        )
-                    )
-                ]
+                # surface as if the callback's future failed, without skipping
+                # the remaining handlers
+                failed = self.event_loop.create_future()
+                failed.set_exception(e)
+                ret.append(failed)
         return ret
 
     async def tick(self) -> AsyncGenerator:
@@ -560,18 +1053,19 @@ class TradingEngine(Application):
                 await asyncio.sleep(0)
             return
 
+        expected = time.monotonic()
         while True:
+            self._monitor.expectHeartbeat(expected)
             yield Event(type=EventType.HEARTBEAT, target=None)
+            expected = time.monotonic() + 1
             await asyncio.sleep(1)
 
     def now(self) -> datetime:
         """Return the current datetime. Useful to avoid code changes between
-        live trading and backtesting. Defaults to `datetime.now`"""
-        return (
-            self._latest
-            if self.trading_type == TradingType.BACKTEST
-            else datetime.now(tz=self.tz)
-        )
+        live trading and backtesting. Offline, this is the time of the last
+        event replayed, and live, the time the event being handled arrived
+        (see `Clock`)"""
+        return self._clock.now()
 
     def start(self) -> None:
         try:
@@ -0,0 +1,49 @@
+from asyncio import Future
+from collections import deque
+from typing import Deque, Iterable, Iterator, Set
+
+
+class FutureTracker(object):
+    """Outstanding callback futures.
+
+    Futures remove themselves via a done callback as they complete, so
+    tracking them is O(1) per future no matter how many are in flight.
+    Futures which failed (or were cancelled) are kept until `raiseErrors`
+    is called to surface them."""
+
+    __slots__ = ["_futures", "_failed"]
+
+    def __init__(self) -> None:
+        self._futures: Set[Future] = set()
+        self._failed: Deque[Future] = deque()
+
+    def append(self, future: Future) -> None:
+        self._futures.add(future)
+        future.add_done_callback(self._done)
+
+    def extend(self, futures: Iterable[Future]) -> None:
+        for future in futures:
+            self.append(future)
+
+    def _done(self, future: Future) -> None:
+        self._futures.discard(future)
+        if future.cancelled() or future.exception() is not None:
+            self._failed.append(future)
+
+    def raiseErrors(self) -> None:
+        """raise the exception of the first failed future, if any"""
+        while self._failed:
+            # trigger exception
+            self._failed.popleft().result()
+
+    def clear(self) -> None:
+        for future in self._futures:
+            future.remove_done_callback(self._done)
+        self._futures.clear()
+        self._failed.clear()
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+    def __iter__(self) -> Iterator[Future]:
+        return iter(list(self._futures))
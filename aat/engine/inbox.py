@@ -0,0 +1,172 @@
+import asyncio
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, TYPE_CHECKING
+
+from aat.config import EventType
+from aat.core import Event
+
+from .dispatch import vwap
+
+if TYPE_CHECKING:
+    from aat.engine import TradingEngine
+
+
+# overflow policies
+BLOCK = "block"
+DROP_OLDEST = "drop-oldest"
+CONFLATE = "conflate"
+POLICIES = (BLOCK, DROP_OLDEST, CONFLATE)
+
+
+class StrategyInbox(object):
+    """Bounded queue of callbacks for one strategy, run in order by the
+    strategy's own worker task.
+
+    Rather than scheduling each callback as its own task, the engine puts
+    them in the strategy's inbox, and the worker runs them one at a time.
+    A strategy which is slow (e.g. awaiting network I/O) then only delays
+    its own events, and always sees them in the order the engine did.
+
+    When the inbox holds `maxsize` callbacks, `policy` decides what happens:
+        block: the engine waits for space, slowing all strategies down
+        drop-oldest: the oldest queued market data callback is dropped
+        conflate: like drop-oldest, but market data for the same order (OPEN
+                  and CHANGE) or trades in the same instrument are always
+                  collapsed while queued, the latter into a single volume
+                  weighted print
+
+    Order entry events (e.g. fills) are never dropped or conflated, and may
+    exceed `maxsize` under the non-blocking policies."""
+
+    def __init__(
+        self, engine: "TradingEngine", maxsize: int, policy: str = BLOCK
+    ) -> None:
+        if policy not in POLICIES:
+            raise Exception("Invalid inbox policy: {}".format(policy))
+
+        self.maxsize = maxsize
+        self.policy = policy
+
+        self._engine = engine
+        self._items: Deque[List[Any]] = deque()
+        self._keys: Dict[Hashable, List[Any]] = {}
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task: Optional[asyncio.Task] = None
+
+        # metrics
+        self.processed = 0
+        self.dropped = 0
+        self.conflated = 0
+        self.high_water = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def json(self) -> Dict[str, Any]:
+        return {
+            "queued": len(self._items),
+            "high_water": self.high_water,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "conflated": self.conflated,
+            "maxsize": self.maxsize,
+            "policy": self.policy,
+        }
+
+    async def put(
+        self, callback: Callable, event: Any, inline: bool, droppable: bool = False
+    ) -> None:
+        """queue `callback(event)`, `droppable` if the event is market data"""
+        key = self._key(callback, event) if droppable else None
+
+        if key is not None and key in self._keys:
+            # collapse into the queued callback, keeping its position
+            item = self._keys[key]
+            if event.type == EventType.TRADE:
+                event = Event(
+                    type=EventType.TRADE,
+                    target=vwap(item[1].target, event.target),
+                )
+            item[1] = event
+            self.conflated += 1
+            return
+
+        if len(self._items) >= self.maxsize:
+            if self.policy == BLOCK:
+                while len(self._items) >= self.maxsize:
+                    self._space.clear()
+                    await self._space.wait()
+            elif droppable:
+                self._dropOldest()
+
+        item = [callback, event, inline, key, droppable]
+        self._items.append(item)
+        if key is not None:
+            self._keys[key] = item
+
+        self.high_water = max(self.high_water, len(self._items))
+        self._idle.clear()
+        self._ready.set()
+
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._work())
+
+    def _key(self, callback: Callable, event: Any) -> Optional[Hashable]:
+        if self.policy != CONFLATE or not isinstance(event, Event):
+            return None
+        if event.type in (EventType.OPEN, EventType.CHANGE):
+            # latest state of the order
+            return (callback, event.type, event.target.id)  # type: ignore
+        if event.type == EventType.TRADE:
+            return (callback, event.type, event.target.instrument)  # type: ignore
+        return None
+
+    def _dropOldest(self) -> None:
+        for i, item in enumerate(self._items):
+            if item[4]:
+                del self._items[i]
+                self._forget(item)
+                self.dropped += 1
+                return
+
+    def _forget(self, item: List[Any]) -> None:
+        if item[3] is not None and self._keys.get(item[3]) is item:
+            del self._keys[item[3]]
+
+    async def _work(self) -> None:
+        while True:
+            while not self._items:
+                self._idle.set()
+                self._ready.clear()
+                await self._ready.wait()
+
+            item = self._items.popleft()
+            self._forget(item)
+            self._space.set()
+
+            callback, event, inline = item[:3]
+            try:
+                if inline:
+                    callback(event)
+                else:
+                    await callback(event)
+            except asyncio.CancelledError:
+                raise
+            except BaseException as e:
+                # surface through the engine, as if the callback's future failed
+                failed = self._engine.event_loop.create_future()
+                failed.set_exception(e)
+                self._engine._futures.append(failed)
+
+            self.processed += 1
+
+    async def join(self) -> None:
+        """wait for all queued callbacks to run, then stop the worker"""
+        await self._idle.wait()
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
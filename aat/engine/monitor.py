@@ -0,0 +1,113 @@
+import asyncio
+import time
+from asyncio import Future
+from typing import Any, Callable, Dict, List, Optional
+
+
+class EngineMonitor(object):
+    """Watch for a live engine falling behind its market data.
+
+    On every heartbeat the engine reports how late the heartbeat was processed
+    (the event loop lag), the depth of its event queues (and any per strategy
+    inboxes), and the number of outstanding callback futures. When any of these crosses its threshold the
+    monitor logs it and calls its callbacks with a snapshot of all of them.
+    Callbacks are called again once every value has recovered.
+    """
+
+    def __init__(
+        self,
+        max_lag: float = 1.0,
+        max_queued: int = 1000,
+        max_futures: int = 1000,
+        log: Optional[Any] = None,
+    ) -> None:
+        self.max_lag = max_lag
+        self.max_queued = max_queued
+        self.max_futures = max_futures
+
+        self._log = log
+        self._callbacks: List[Callable] = []
+        self._expected: Optional[float] = None
+        self._breached: List[str] = []
+        self._snapshot: Dict[str, Any] = {
+            "lag": 0.0,
+            "max_lag": 0.0,
+            "queued_events": 0,
+            "queued_targeted_events": 0,
+            "futures": 0,
+            "inboxes": {},
+            "breached": [],
+        }
+
+    def addCallback(self, callback: Callable) -> None:
+        """call `callback` (sync or async) with a snapshot dict when a threshold
+        is crossed, or once all values recover"""
+        self._callbacks.append(callback)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """the values as of the last heartbeat"""
+        return dict(self._snapshot)
+
+    def expectHeartbeat(self, expected: float) -> None:
+        """record when (`time.monotonic`) the next heartbeat should be processed"""
+        self._expected = expected
+
+    def heartbeat(
+        self,
+        queued_events: int,
+        queued_targeted_events: int,
+        futures: int,
+        inboxes: Optional[Dict[str, int]] = None,
+    ) -> List[Future]:
+        """record a heartbeat being processed, returning futures for any async callbacks"""
+        inboxes = inboxes or {}
+
+        lag = (
+            max(time.monotonic() - self._expected, 0.0)
+            if self._expected is not None
+            else 0.0
+        )
+
+        breached = []
+        if lag > self.max_lag:
+            breached.append("lag")
+        if (
+            queued_events + queued_targeted_events > self.max_queued
+            or max(inboxes.values(), default=0) > self.max_queued
+        ):
+            breached.append("queued")
+        if futures > self.max_futures:
+            breached.append("futures")
+
+        self._snapshot = {
+            "lag": lag,
+            "max_lag": max(lag, self._snapshot["max_lag"]),
+            "queued_events": queued_events,
+            "queued_targeted_events": queued_targeted_events,
+            "futures": futures,
+            "inboxes": inboxes,
+            "breached": breached,
+        }
+
+        # only notify on changes, not every heartbeat while behind
+        if breached == self._breached:
+            return []
+        newly = [b for b in breached if b not in self._breached]
+        self._breached = breached
+
+        if not newly and breached:
+            # partially recovered
+            return []
+
+        if self._log is not None:
+            if breached:
+                self._log.critical("Engine falling behind: {}".format(self._snapshot))
+            else:
+                self._log.critical("Engine caught up: {}".format(self._snapshot))
+
+        ret: List[Future] = []
+        for callback in self._callbacks:
+            result = callback(self.snapshot())
+            if asyncio.iscoroutine(result):
+                ret.append(asyncio.ensure_future(result))
+        return ret
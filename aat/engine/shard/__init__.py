@@ -0,0 +1,4 @@
+from .engine import ShardedEngine, ShardEngine, ShardStrategy  # noqa: F401
+from .exchange import RingExchange  # noqa: F401
+from .manager import ShardManager  # noqa: F401
+from .ring import RingBuffer  # noqa: F401
@@ -0,0 +1,452 @@
+import asyncio
+import inspect
+import multiprocessing
+import pickle
+from asyncio import Future
+from collections import deque
+from functools import partial
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from traitlets import Int  # type: ignore
+
+from aat.config import EventType
+from aat.core import Event, EventHandler, Order, Trade
+from aat.strategy import Strategy
+
+from ..dispatch import StrategyManager
+from ..engine import TradingEngine
+from .manager import ShardManager
+from .ring import RingBuffer
+
+# while the ring is full, how long to wait before retrying
+_BACKOFF = 0.0001
+
+# exchange events published to the workers, see `ShardPublisher`
+_SHARDED_EVENTS = (
+    EventType.TRADE,
+    EventType.OPEN,
+    EventType.CANCEL,
+    EventType.CHANGE,
+    EventType.FILL,
+    EventType.DATA,
+    EventType.HALT,
+    EventType.CONTINUE,
+)
+
+
+class ShardStrategy(Strategy):
+    """Stand in, in the main process, for a strategy running in a worker.
+
+    The main process' managers track the worker strategy's orders, trades,
+    and positions against this strategy, and it forwards the strategy's
+    order entry events to the worker"""
+
+    def __init__(self, name: str, shard: str, index: str) -> None:
+        super().__init__()
+        self._name = name
+        self.shard = int(shard)
+        self.index = int(index)
+        self._conn: Optional[Connection] = None
+
+        # the worker's orders by key, and keys by order
+        self._orders: Dict[int, Order] = {}
+        self._keys: Dict[int, int] = {}
+
+    def name(self) -> str:
+        return "{}[{}]".format(self._name, self.shard)
+
+    def _addOrder(self, order: Order, key: int) -> None:
+        self._orders[key] = order
+        self._keys[id(order)] = key
+
+    def _forward(self, event: Event, order: Order) -> None:
+        if self._conn is None:
+            # worker exited
+            return
+
+        key = self._keys.get(id(order))
+        if order.finished() or event.type in (
+            Event.Types.REJECTED,
+            Event.Types.CANCELED,
+        ):
+            self._orders.pop(key, None)  # type: ignore
+            self._keys.pop(id(order), None)
+
+        self._conn.send(("event", self.index, key, event))  # type: ignore
+
+    async def onTrade(self, event: Event) -> None:
+        # market data goes through the ring
+        pass
+
+    async def onBought(self, event: Event) -> None:
+        trade: Trade = event.target  # type: ignore
+        self._forward(event, trade.my_order)
+
+    async def onSold(self, event: Event) -> None:
+        trade: Trade = event.target  # type: ignore
+        self._forward(event, trade.my_order)
+
+    async def onReceived(self, event: Event) -> None:
+        self._forward(event, event.target)  # type: ignore
+
+    async def onRejected(self, event: Event) -> None:
+        self._forward(event, event.target)  # type: ignore
+
+    async def onCanceled(self, event: Event) -> None:
+        self._forward(event, event.target)  # type: ignore
+
+
+setattr(ShardStrategy.onTrade, "_original", 1)
+
+
+class ShardPublisher(EventHandler):
+    """Publish exchange events to the workers, in the order the engine
+    processes them"""
+
+    def __init__(self, publish: Callable) -> None:
+        self._publish = publish
+
+    def onTrade(self, event: Event) -> None:  # type: ignore[override]
+        self._publish(event)
+
+    def onOpen(self, event: Event) -> None:  # type: ignore[override]
+        self._publish(event)
+
+    def onCancel(self, event: Event) -> None:  # type: ignore[override]
+        self._publish(event)
+
+    def onChange(self, event: Event) -> None:  # type: ignore[override]
+        self._publish(event)
+
+    def onFill(self, event: Event) -> None:  # type: ignore[override]
+        self._publish(event)
+
+    def onData(self, event: Event) -> None:  # type: ignore[override]
+        self._publish(event)
+
+    def onHalt(self, event: Event) -> None:  # type: ignore[override]
+        self._publish(event)
+
+    def onContinue(self, event: Event) -> None:  # type: ignore[override]
+        self._publish(event)
+
+    def onExit(self, event: Event) -> None:  # type: ignore[override]
+        self._publish(event)
+
+
+class ShardEngine(TradingEngine):
+    """Engine hosting one shard of a `ShardedEngine`'s strategies, in a
+    worker process"""
+
+    def __init__(self, conn: Connection, **config: dict) -> None:
+        self._conn = conn
+        super().__init__(**config)
+
+    def _makeManager(self) -> StrategyManager:
+        return ShardManager(self, self.trading_type, self.exchanges, self._conn)
+
+    async def processEvent(
+        self, event: Event, strategy: Optional[Strategy] = None
+    ) -> List[Future]:
+        if event.type == EventType.EXIT and strategy is None:
+            # deliver any outstanding order entry events before exiting
+            manager: ShardManager = self.manager  # type: ignore
+            await manager._flush()
+            while not self._queued_targeted_events.empty():
+                await self._drainTargeted()
+
+        ret = await super().processEvent(event, strategy)
+
+        if self._offline() and strategy is None and event.type in _SHARDED_EVENTS:
+            # in backtest, let the main process move on once this event (and
+            # any orders it generated) has been handled
+            if ret:
+                await asyncio.wait(ret)
+            self.manager._ack()  # type: ignore
+        return ret
+
+    async def run(self) -> None:
+        manager: ShardManager = self.manager  # type: ignore
+        manager._connect()
+        try:
+            await super().run()
+        finally:
+            manager._disconnect()
+
+
+def _work(config: dict, conn: Connection) -> None:
+    """worker process entrypoint"""
+    engine = ShardEngine(conn, **config)
+    engine.start()
+    conn.close()
+
+
+class ShardedEngine(TradingEngine):
+    """A trading engine which runs its strategies in worker processes.
+
+    The engine process owns the exchanges, and publishes their events to a
+    shared memory ring (see `RingBuffer`) read by every worker. Each worker
+    hosts a subset of the strategies in its own engine, and sends their
+    orders (and any queries of the portfolio, risk, or exchanges) back over
+    a pipe to the engine process' managers, which remain the single source
+    of truth. Strategies are assigned to `shards` workers round robin.
+
+    Events larger than a slot (`ring_slot_size`) are split over several. If
+    a worker falls `ring_slots` slots behind, the engine queues events for
+    it, and waits (without blocking its event loop) for it to catch up
+    before processing the next event. A worker which exits early is
+    detached, and the rest carry on without it. When backtesting, the engine
+    instead waits for every worker to finish handling each event before
+    moving on, so that results match running the strategies in process."""
+
+    shards = Int(default_value=2)  # type: ignore
+    ring_slots = Int(default_value=4096)  # type: ignore
+    ring_slot_size = Int(default_value=4096)  # type: ignore
+
+    def __init__(self, **config: dict) -> None:
+        general = config.get("general", {})
+        strategies = config.get("strategy", {}).get("strategies", [])
+
+        self.shards = max(
+            min(int(general.get("shards", self.shards)), len(strategies)), 1
+        )
+        self.ring_slots = int(general.get("ring_slots", self.ring_slots))
+        self.ring_slot_size = int(general.get("ring_slot_size", self.ring_slot_size))
+
+        # assign strategies round robin, with a stand in for each
+        self._shard_strategies: List[List[Any]] = [[] for _ in range(self.shards)]
+        proxies = []
+        for i, strategy in enumerate(strategies):
+            shard = self._shard_strategies[i % self.shards]
+            proxies.append(
+                [
+                    "aat.engine.shard:ShardStrategy",
+                    str(strategy),
+                    str(i % self.shards),
+                    str(len(shard)),
+                ]
+            )
+            shard.append(strategy)
+
+        self._config = config
+        super().__init__(**dict(config, strategy={"strategies": proxies}))
+
+        self._ring = RingBuffer.create(
+            self.ring_slots, self.ring_slot_size, self.shards
+        )
+        self.registerHandler(ShardPublisher(self._publish))
+
+        self._proxies: List[List[ShardStrategy]] = [[] for _ in range(self.shards)]
+        for proxy in self.strategies:
+            self._proxies[proxy.shard].append(proxy)  # type: ignore
+
+        self._processes: List[BaseProcess] = []
+        self._conns: List[Optional[Connection]] = []
+
+        # events published, and handled by each worker
+        self._published = 0
+        self._backlog: Deque[bytes] = deque()
+        self._acked = [0] * self.shards
+        self._synced = asyncio.Event()
+
+        # manager methods callable from the workers
+        self._calls: Dict[str, Callable] = {
+            "newOrder": self._newOrder,
+            "cancelOrder": self._cancelOrder,
+            "subscribe": self.manager._subscribeExchange,
+            "lookup": self.manager.lookup,
+            "book": self.manager.book,
+            "instruments": self.manager.instruments,
+            "exchanges": self.manager.exchanges,
+            "portfolio": self.manager.portfolio,
+            "positions": self.manager.positions,
+            "priceHistory": self.manager.priceHistory,
+            "risk": self.manager.risk,
+        }
+
+    def _workerConfig(self, shard: int) -> dict:
+        # the main process journals what it sees, and owns the order and
+        # portfolio state, see `TradingEngine`
+        general = dict(
+            self._config.get("general", {}), api=False, journal="", checkpoint=""
+        )
+        return dict(
+            self._config,
+            general=general,
+            exchange={
+                "exchanges": [
+                    ["aat.engine.shard:RingExchange", self._ring.name, str(shard)]
+                ]
+            },
+            strategy={"strategies": self._shard_strategies[shard]},
+        )
+
+    # ******* #
+    # Workers #
+    # ******* #
+    def _startWorkers(self) -> None:
+        context = multiprocessing.get_context("spawn")
+
+        for shard in range(self.shards):
+            conn, child = context.Pipe()
+            process = context.Process(
+                target=_work,
+                args=(self._workerConfig(shard), child),
+                daemon=True,
+            )
+            process.start()
+            child.close()
+
+            for proxy in self._proxies[shard]:
+                proxy._conn = conn
+
+            self._processes.append(process)
+            self._conns.append(conn)
+            self.event_loop.add_reader(conn.fileno(), partial(self._receive, shard))
+
+    async def _joinWorkers(self) -> None:
+        """wait for the workers to finish (having seen the exit event)"""
+        while any(conn is not None for conn in self._conns):
+            await asyncio.sleep(0.01)
+
+        for process in self._processes:
+            process.join()
+
+    def _stopWorkers(self) -> None:
+        for shard, conn in enumerate(self._conns):
+            if conn is not None:
+                self._disconnect(shard)
+
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+        self._ring.close()
+        self._ring.unlink()
+
+    def _disconnect(self, shard: int) -> None:
+        conn = self._conns[shard]
+        self.event_loop.remove_reader(conn.fileno())  # type: ignore
+        conn.close()  # type: ignore
+        self._conns[shard] = None
+
+        # stop waiting on the worker, whether it exited or died
+        self._ring.detach(shard)
+        for proxy in self._proxies[shard]:
+            proxy._conn = None
+        self._synced.set()
+
+    # ******** #
+    # Requests #
+    # ******** #
+    def _receive(self, shard: int) -> None:
+        conn = self._conns[shard]
+        try:
+            while conn is not None and conn.poll():
+                self._handle(shard, conn, conn.recv())
+        except (EOFError, OSError):
+            # worker exited
+            self._disconnect(shard)
+
+    def _handle(self, shard: int, conn: Connection, message: Tuple) -> None:
+        if message[0] == "ack":
+            self._acked[shard] += 1
+            self._synced.set()
+            return
+
+        _, request, index, method, args = message
+        if index is not None:
+            args = (self._proxies[shard][index],) + args
+
+        try:
+            result = self._calls[method](*args)
+        except BaseException as e:
+            self._reply(conn, request, e, None)
+            return
+
+        if inspect.isawaitable(result):
+            future = asyncio.ensure_future(result)
+            future.add_done_callback(partial(self._replyFuture, conn, request))
+        else:
+            self._reply(conn, request, None, result)
+
+    def _replyFuture(self, conn: Connection, request: int, future: Future) -> None:
+        if future.cancelled():
+            self._reply(conn, request, asyncio.CancelledError(), None)
+        elif future.exception() is not None:
+            self._reply(conn, request, future.exception(), None)
+        else:
+            self._reply(conn, request, None, future.result())
+
+    def _reply(
+        self,
+        conn: Connection,
+        request: int,
+        error: Optional[BaseException],
+        result: Any,
+    ) -> None:
+        if conn.closed:
+            return
+        try:
+            conn.send(("reply", request, error, result))
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            conn.send(("reply", request, Exception(repr(e)), None))
+
+    async def _newOrder(
+        self, strategy: ShardStrategy, order: Order, key: int
+    ) -> Tuple[bool, Any]:
+        strategy._addOrder(order, key)
+        ret = await self.manager.newOrder(strategy, order)
+        return ret, order.id
+
+    async def _cancelOrder(self, strategy: ShardStrategy, key: int) -> bool:
+        order = strategy._orders.get(key)
+        if order is None:
+            return False
+        return await self.manager.cancelOrder(strategy, order)
+
+    def _publish(self, event: Event) -> None:
+        data = pickle.dumps(event, protocol=pickle.HIGHEST_PROTOCOL)
+        if self._backlog or not self._ring.publish(data):
+            # a worker is behind, queue in order until it catches up
+            self._backlog.append(data)
+        self._published += 1
+
+    async def _catchUp(self) -> None:
+        """publish the events queued while the ring was full, letting the event
+        loop answer the workers' requests in the meantime"""
+        while self._backlog:
+            if self._ring.publish(self._backlog[0]):
+                self._backlog.popleft()
+            else:
+                await asyncio.sleep(_BACKOFF)
+
+    async def _sync(self) -> None:
+        """wait for the running workers to handle every published event"""
+        while any(
+            conn is not None and acked < self._published
+            for conn, acked in zip(self._conns, self._acked)
+        ):
+            self._synced.clear()
+            await self._synced.wait()
+
+    async def processEvent(
+        self, event: Event, strategy: Optional[Strategy] = None
+    ) -> List[Future]:
+        ret = await super().processEvent(event, strategy)
+        await self._catchUp()
+        if self._offline():
+            await self._sync()
+        return ret
+
+    async def run(self) -> None:
+        """run the engine, with the strategies in worker processes"""
+        self._startWorkers()
+        try:
+            await super().run()
+            await self._joinWorkers()
+        finally:
+            self._stopWorkers()
@@ -0,0 +1,48 @@
+import asyncio
+import pickle
+from typing import AsyncIterator
+
+from aat.config import EventType, TradingType
+from aat.core import ExchangeType, Event
+from aat.exchange import Exchange
+
+from .ring import RingBuffer
+
+# consecutive empty reads before backing off from yielding to sleeping
+_SPINS = 100
+_BACKOFF = 0.0005
+
+
+class RingExchange(Exchange):
+    """Market data published by the main process of a sharded engine, read
+    from its shared memory ring. Order entry goes through the worker's
+    `ShardManager` rather than an exchange"""
+
+    def __init__(
+        self, trading_type: TradingType, verbose: bool, name: str, reader: str
+    ) -> None:
+        super().__init__(ExchangeType("shard{}".format(reader)))
+        self._name = name
+        self._reader = int(reader)
+        self._ring: "RingBuffer"
+
+    async def connect(self) -> None:
+        self._ring = RingBuffer.attach(self._name, self._reader)
+
+    async def tick(self) -> AsyncIterator[Event]:  # type: ignore[override, misc]
+        spins = 0
+        try:
+            while True:
+                data = self._ring.read()
+                if data is None:
+                    spins += 1
+                    await asyncio.sleep(0 if spins < _SPINS else _BACKOFF)
+                    continue
+
+                spins = 0
+                event = pickle.loads(data)
+                if event.type == EventType.EXIT:
+                    return
+                yield event
+        finally:
+            self._ring.close()
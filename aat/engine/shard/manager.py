@@ -0,0 +1,265 @@
+import asyncio
+import itertools
+from asyncio import Future
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Optional, Set, Tuple, Union, TYPE_CHECKING
+
+from aat.config import EventType, InstrumentType, TradingType
+from aat.core import (
+    Event,
+    EventHandler,
+    ExchangeType,
+    Instrument,
+    Order,
+    OrderBook,
+    Position,
+    Trade,
+)
+from aat.exchange import Exchange
+
+from ..dispatch import StrategyManager
+from ..dispatch.portfolio import Portfolio
+
+if TYPE_CHECKING:
+    import pandas as pd  # type: ignore
+    from aat.engine import TradingEngine
+    from aat.strategy import Strategy
+
+
+class ShardManager(StrategyManager):
+    """Strategy manager for a worker process hosting a shard of the strategies.
+
+    Market data arrives from the main process (see `RingExchange`). Orders,
+    exchange subscriptions, and queries of the portfolio, risk, and exchanges
+    are sent over `conn` to the main process, whose managers own that state.
+    Order entry events for this shard's strategies come back over `conn` and
+    are delivered to them as usual. Data subscriptions and periodics are
+    handled locally."""
+
+    def __init__(
+        self,
+        trading_engine: "TradingEngine",
+        trading_type: TradingType,
+        exchanges: List[Exchange],
+        conn: Connection,
+    ) -> None:
+        super().__init__(trading_engine, trading_type, exchanges)
+        self._conn = conn
+        self._requests = itertools.count()
+        self._pending: Dict[int, Future] = {}
+        self._events: Set[Future] = set()
+
+        # this shard's orders, by key shared with the main process
+        self._orders: Dict[int, Order] = {}
+
+    # market data, start, and exit are handled by the main process' managers
+    async def onTrade(self, event: Event) -> None:
+        pass
+
+    onOpen = EventHandler.onOpen
+    onCancel = EventHandler.onCancel
+    onChange = EventHandler.onChange
+    onFill = EventHandler.onFill
+    onHalt = EventHandler.onHalt
+    onContinue = EventHandler.onContinue
+    onData = EventHandler.onData
+    onStart = EventHandler.onStart
+    onExit = EventHandler.onExit
+
+    # ********** #
+    # Connection #
+    # ********** #
+    def _connect(self) -> None:
+        self.loop().add_reader(self._conn.fileno(), self._receive)
+
+    def _disconnect(self) -> None:
+        self.loop().remove_reader(self._conn.fileno())
+
+    def _receive(self) -> None:
+        while self._conn.poll():
+            self._handle(self._conn.recv())
+
+    def _handle(self, message: Tuple) -> None:
+        if message[0] == "reply":
+            _, request, error, result = message
+            future = self._pending.pop(request)
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+        elif message[0] == "event":
+            _, index, key, event = message
+            future = asyncio.ensure_future(self._onShardEvent(index, key, event))
+            future.add_done_callback(self._events.discard)
+            self._events.add(future)
+            self._engine._futures.append(future)
+
+    async def _flush(self) -> None:
+        """handle the order entry events the main process sent before exiting"""
+        self._receive()
+        if self._events:
+            await asyncio.wait(self._events)
+
+    def _ack(self) -> None:
+        """tell the main process the last market data event has been handled"""
+        self._conn.send(("ack",))
+
+    def _send(self, method: str, strategy: Optional["Strategy"], args: Tuple) -> int:
+        request = next(self._requests)
+        index = self._engine.strategies.index(strategy) if strategy else None
+        self._conn.send(("call", request, index, method, args))
+        return request
+
+    def _call(
+        self, method: str, strategy: Optional["Strategy"] = None, *args: Any
+    ) -> Any:
+        """call a method on the main process' manager, blocking until it returns"""
+        request = self._send(method, strategy, args)
+
+        while True:
+            message = self._conn.recv()
+            if message[0] == "reply" and message[1] == request:
+                if message[2] is not None:
+                    raise message[2]
+                return message[3]
+
+            # not ours, handle as usual
+            self._handle(message)
+
+    async def _request(
+        self, method: str, strategy: Optional["Strategy"] = None, *args: Any
+    ) -> Any:
+        """call an async method on the main process' manager"""
+        future = self.loop().create_future()
+        self._pending[self._send(method, strategy, args)] = future
+        return await future
+
+    # ************ #
+    # Order Entry  #
+    # ************ #
+    async def newOrder(self, strategy: "Strategy", order: Order) -> bool:
+        """send the order to the main process, for risk checks and execution"""
+        for orders in (
+            self._strategy_open_orders,
+            self._strategy_past_orders,
+            self._strategy_trades,
+        ):
+            if strategy not in orders:
+                orders[strategy] = []
+
+        self._strategy_open_orders[strategy].append(order)
+        self._strategy_past_orders[strategy].append(order)
+
+        key = next(self._requests)
+        self._orders[key] = order
+
+        ret, order.id = await self._request("newOrder", strategy, order, key)
+        return ret
+
+    async def cancelOrder(self, strategy: "Strategy", order: Order) -> bool:
+        for key, shard_order in self._orders.items():
+            if shard_order is order:
+                return await self._request("cancelOrder", strategy, key)
+        return False
+
+    async def _onShardEvent(self, index: int, key: int, event: Event) -> None:
+        """order entry event from the main process"""
+        strategy = self._engine.strategies[index]
+
+        if event.type in (EventType.BOUGHT, EventType.SOLD):
+            trade: Trade = event.target  # type: ignore
+            order = self._orders.get(key, trade.my_order)
+            order.filled = trade.my_order.filled
+            trade.my_order = order
+
+            if event.type == EventType.BOUGHT:
+                await self._onBought(strategy, trade)
+            else:
+                await self._onSold(strategy, trade)
+
+            if order.finished():
+                self._orders.pop(key, None)
+            return
+
+        order = self._orders.get(key, event.target)  # type: ignore
+        order.filled = event.target.filled  # type: ignore
+
+        if event.type == EventType.RECEIVED:
+            await self._onReceived(strategy, order)
+        elif event.type == EventType.REJECTED:
+            self._orders.pop(key, None)
+            await self._onRejected(strategy, order)
+        elif event.type == EventType.CANCELED:
+            self._orders.pop(key, None)
+            await self._onCanceled(strategy, order)
+
+    # the main process' managers track everything other than open orders
+    async def onTraded(self, event: Event) -> None:
+        if event in self._alerted_events:
+            strategy, order = self._alerted_events.pop(event)
+            if order.filled >= order.volume:
+                self._closeOrder(strategy, order)
+
+    async def onReceived(self, event: Event) -> None:
+        self._alerted_events.pop(event, None)
+
+    async def onRejected(self, event: Event) -> None:
+        if event in self._alerted_events:
+            self._closeOrder(*self._alerted_events.pop(event))
+
+    async def onCanceled(self, event: Event) -> None:
+        if event in self._alerted_events:
+            self._closeOrder(*self._alerted_events.pop(event))
+
+    def _closeOrder(self, strategy: "Strategy", order: Order) -> None:
+        try:
+            self._strategy_open_orders[strategy].remove(order)
+        except (KeyError, ValueError):
+            ...
+
+    # ****************** #
+    # Main process state #
+    # ****************** #
+    def instruments(
+        self,
+        type: Optional[InstrumentType] = None,
+        exchange: Optional[ExchangeType] = None,
+    ) -> List[Instrument]:
+        return self._call("instruments", None, type, exchange)
+
+    def exchanges(self, type: Optional[InstrumentType] = None) -> List[ExchangeType]:
+        return self._call("exchanges", None, type)
+
+    async def _subscribeExchange(self, instrument: Instrument) -> None:
+        await self._request("subscribe", None, instrument)
+
+    async def lookup(
+        self, instrument: Optional[Instrument], exchange: Optional[ExchangeType] = None
+    ) -> List[Instrument]:
+        return await self._request("lookup", None, instrument, exchange)
+
+    async def book(self, instrument: Instrument) -> Optional[OrderBook]:
+        return await self._request("book", None, instrument)
+
+    def portfolio(self) -> Portfolio:
+        return self._call("portfolio")
+
+    def positions(
+        self,
+        strategy: "Strategy",
+        instrument: Optional[Instrument] = None,
+        exchange: Optional[ExchangeType] = None,
+    ) -> List[Position]:
+        return self._call("positions", strategy, instrument, exchange)
+
+    def priceHistory(
+        self, instrument: Optional[Instrument] = None
+    ) -> Union[dict, "pd.DataFrame"]:
+        return self._call("priceHistory", None, instrument)
+
+    def risk(self, position: Optional[Position] = None) -> str:
+        return self._call("risk", None, position)
+
+
+setattr(ShardManager.onTrade, "_original", 1)
@@ -0,0 +1,149 @@
+from multiprocessing import shared_memory
+from typing import Optional
+
+# header words: write sequence, slot count, slot size, reader count, then
+# one read sequence per reader
+_WRITE = 0
+_SLOTS = 1
+_SLOT_SIZE = 2
+_READERS = 3
+_CURSORS = 4
+
+# per slot header words: sequence, payload length
+_SLOT_HEADER = 16
+
+# flag in the payload length of every chunk of a message but the last
+_MORE = 1 << 63
+
+# read sequence of a reader which has gone away
+_DETACHED = (1 << 64) - 1
+
+
+class RingBuffer(object):
+    """Single producer, multiple consumer broadcast ring over shared memory.
+
+    Every reader sees every message, in the order it was published. Each
+    reader publishes how far it has read, so rather than overwriting
+    messages a slow reader has not yet seen, `publish` reports the ring as
+    full until the slowest reader catches up. A reader which goes away is
+    detached by the producer, so it no longer holds the ring up.
+
+    Messages are opaque bytes. Those larger than a slot (see `capacity`) are
+    split over consecutive slots, so must fit in the ring as a whole. The
+    ring is created (and unlinked) by the producer, readers attach to it by
+    name"""
+
+    def __init__(
+        self, shm: shared_memory.SharedMemory, reader: Optional[int] = None
+    ) -> None:
+        self._shm = shm
+        self._reader = reader
+        self._words = shm.buf.cast("Q")  # type: ignore
+
+        self._slots = self._words[_SLOTS]
+        self._slot_size = self._words[_SLOT_SIZE]
+        self._readers = self._words[_READERS]
+        self._data = (_CURSORS + self._readers) * 8
+
+    @staticmethod
+    def create(slots: int, slot_size: int, readers: int) -> "RingBuffer":
+        """create a new ring of `slots` messages, read by `readers` readers"""
+        # keep slots word aligned
+        slot_size = (slot_size + 7) // 8 * 8
+        header = (_CURSORS + readers) * 8
+
+        shm = shared_memory.SharedMemory(create=True, size=header + slots * slot_size)
+        words = shm.buf.cast("Q")  # type: ignore
+        words[_WRITE] = 0
+        words[_SLOTS] = slots
+        words[_SLOT_SIZE] = slot_size
+        words[_READERS] = readers
+        for reader in range(readers):
+            words[_CURSORS + reader] = 0
+        words.release()
+
+        return RingBuffer(shm)
+
+    @staticmethod
+    def attach(name: str, reader: int) -> "RingBuffer":
+        """attach to an existing ring as reader number `reader`"""
+        return RingBuffer(shared_memory.SharedMemory(name=name), reader)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def capacity(self) -> int:
+        """max size in bytes of a message fitting in one slot"""
+        return self._slot_size - _SLOT_HEADER
+
+    def __len__(self) -> int:
+        """slots the slowest attached reader has yet to read"""
+        write = self._words[_WRITE]
+        return write - min(
+            min(self._words[_CURSORS : _CURSORS + self._readers], default=write),
+            write,
+        )
+
+    def detach(self, reader: int) -> None:
+        """stop waiting on reader number `reader`, e.g. once it has exited"""
+        self._words[_CURSORS + reader] = _DETACHED
+
+    def publish(self, data: bytes) -> bool:
+        """write a message, returning False if the ring is too full for it"""
+        capacity = self.capacity()
+        chunks = max((len(data) + capacity - 1) // capacity, 1)
+        if chunks > self._slots:
+            raise Exception(
+                "Message too large for ring: {} > {}".format(
+                    len(data), capacity * self._slots
+                )
+            )
+
+        seq = self._words[_WRITE]
+        if len(self) + chunks > self._slots:
+            return False
+
+        for i in range(chunks):
+            chunk = data[i * capacity : (i + 1) * capacity]
+            offset = self._data + ((seq + i) % self._slots) * self._slot_size
+            self._shm.buf[offset + _SLOT_HEADER : offset + _SLOT_HEADER + len(chunk)] = chunk  # type: ignore
+
+            slot = offset // 8
+            self._words[slot + 1] = len(chunk) | (_MORE if i + 1 < chunks else 0)
+            self._words[slot] = seq + i
+
+        # publish the slots, then the message
+        self._words[_WRITE] = seq + chunks
+        return True
+
+    def read(self) -> Optional[bytes]:
+        """read this reader's next message, or None if there isn't one yet"""
+        cursor = _CURSORS + self._reader  # type: ignore
+        seq = self._words[cursor]
+        if seq >= self._words[_WRITE]:
+            return None
+
+        chunks = []
+        while True:
+            offset = self._data + (seq % self._slots) * self._slot_size
+            slot = offset // 8
+            if self._words[slot] != seq:
+                raise Exception("Ring overrun at {}".format(seq))
+
+            length = self._words[slot + 1]
+            end = offset + _SLOT_HEADER + (length & ~_MORE)
+            chunks.append(bytes(self._shm.buf[offset + _SLOT_HEADER : end]))  # type: ignore
+            seq += 1
+            if not length & _MORE:
+                break
+
+        self._words[cursor] = seq
+        return chunks[0] if len(chunks) == 1 else b"".join(chunks)
+
+    def close(self) -> None:
+        self._words.release()
+        self._shm.close()
+
+    def unlink(self) -> None:
+        self._shm.unlink()
@@ -0,0 +1,191 @@
+import time
+from bisect import bisect_left
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from aat.config import EventType
+
+# histogram bucket upper bounds, in nanoseconds (1us ... 1s, then overflow)
+BUCKETS = tuple(
+    int(base * 10**exp) for exp in range(3, 9) for base in (1, 2.5, 5)
+) + (10**9,)
+
+_HEADER = "{:<32} {:<10} {:>10} {:>12}" + " {:>10}" * 5
+_ROW = "{:<32} {:<10} {:>10} {:>12.1f}" + " {:>10.1f}" * 5
+
+
+def handlerName(handler: Any) -> str:
+    """name to report a handler (or bare callback) under"""
+    name = getattr(handler, "name", None)
+    if callable(name):
+        return name()
+    return getattr(handler, "__qualname__", handler.__class__.__name__)
+
+
+class Histogram(object):
+    """Fixed bucket histogram of durations in nanoseconds. Recording a value is
+    a bisect over a small constant table, so this is cheap enough to leave on"""
+
+    __slots__ = ["counts", "count", "total", "max"]
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value: int) -> None:
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> int:
+        """upper bound of the bucket containing the `q`th percentile (0-100),
+        or the max value if it falls in the overflow bucket"""
+        if not self.count:
+            return 0
+
+        rank = q / 100.0 * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                return BUCKETS[i] if i < len(BUCKETS) else self.max
+        return self.max
+
+    def json(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.mean(),
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "max": self.max,
+            "buckets": dict(zip(BUCKETS + (None,), self.counts)),  # type: ignore
+        }
+
+
+class CallbackStats(object):
+    """call count, queue wait, and latency for one handler and event type"""
+
+    __slots__ = ["count", "wait", "latency"]
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.wait = Histogram()
+        self.latency = Histogram()
+
+    def record(self, wait: int, latency: int) -> None:
+        self.count += 1
+        self.wait.record(wait)
+        self.latency.record(latency)
+
+
+class EngineStats(object):
+    """Per handler, per event type callback instrumentation.
+
+    Queue wait is the time between the engine scheduling an asynchronous
+    callback and it starting to run, latency is the time from the callback
+    starting to it finishing (including any awaits). Synchronous callbacks
+    run inline have no queue wait."""
+
+    def __init__(self) -> None:
+        self._stats: Dict[Tuple[str, EventType], CallbackStats] = {}
+        self._start = time.perf_counter_ns()
+
+    def reset(self) -> None:
+        self._stats.clear()
+        self._start = time.perf_counter_ns()
+
+    def get(self, handler: Any, event_type: EventType) -> CallbackStats:
+        key = (handlerName(handler), event_type)
+        if key not in self._stats:
+            self._stats[key] = CallbackStats()
+        return self._stats[key]
+
+    def wrap(
+        self,
+        callback: Callable,
+        handler: Any,
+        event_type: EventType,
+        inline: bool,
+    ) -> Callable:
+        """wrap a (registered) callback to record its stats"""
+        stats = self.get(handler, event_type)
+
+        if inline:
+
+            def _timed(event: Any) -> Any:
+                start = time.perf_counter_ns()
+                try:
+                    return callback(event)
+                finally:
+                    stats.record(0, time.perf_counter_ns() - start)
+
+            return _timed
+
+        async def _run(event: Any, scheduled: int) -> Any:
+            start = time.perf_counter_ns()
+            try:
+                return await callback(event)
+            finally:
+                stats.record(start - scheduled, time.perf_counter_ns() - start)
+
+        def _scheduled(event: Any) -> Awaitable:
+            return _run(event, time.perf_counter_ns())
+
+        return _scheduled
+
+    def json(self) -> List[Dict[str, Any]]:
+        """one row per handler and event type, sorted by total callback time"""
+        elapsed = (time.perf_counter_ns() - self._start) / 1e9
+        rows = [
+            {
+                "handler": handler,
+                "type": event_type.value,
+                "count": stats.count,
+                "throughput": stats.count / elapsed if elapsed else 0.0,
+                "wait": stats.wait.json(),
+                "latency": stats.latency.json(),
+            }
+            for (handler, event_type), stats in self._stats.items()
+            if stats.count
+        ]
+        return sorted(rows, key=lambda row: -row["latency"]["mean"] * row["count"])
+
+    def table(self, rows: Optional[List[Dict[str, Any]]] = None) -> str:
+        """format stats as a text table, durations in microseconds"""
+        rows = self.json() if rows is None else rows
+        header = _HEADER.format(
+            "handler",
+            "type",
+            "count",
+            "events/sec",
+            "wait p50",
+            "wait p99",
+            "lat mean",
+            "lat p99",
+            "lat max",
+        )
+        lines = [header, "-" * len(header)]
+        for row in rows:
+            lines.append(
+                _ROW.format(
+                    row["handler"][:32],
+                    row["type"],
+                    row["count"],
+                    row["throughput"],
+                    row["wait"]["p50"] / 1e3,
+                    row["wait"]["p99"] / 1e3,
+                    row["latency"]["mean"] / 1e3,
+                    row["latency"]["p99"] / 1e3,
+                    row["latency"]["max"] / 1e3,
+                )
+            )
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return self.table()
@@ -0,0 +1,340 @@
+import asyncio
+import importlib
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple, Type, Union, TYPE_CHECKING
+
+import pytz
+
+from aat.config import TradingType
+from aat.config.parser import getExchanges
+from aat.core import Clock, Position
+from aat.strategy import Strategy
+
+from .engine import TradingEngine
+
+if TYPE_CHECKING:
+    import numpy as np  # type: ignore
+    import pandas as pd  # type: ignore
+
+# summary columns, per parameter set
+SUMMARY = ("pnl", "sharpe", "drawdown", "trades")
+
+
+def _grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """every combination of the parameter grid, in order"""
+    return [
+        dict(zip(grid.keys(), values)) for values in itertools.product(*grid.values())
+    ]
+
+
+def _pnlCurve(positions: List[Position]) -> "np.ndarray":
+    """total (realized plus unrealized) pnl across positions, as of each
+    timestamp they were updated at"""
+    import numpy as np  # type: ignore
+
+    # realized and unrealized pnl are recorded together
+    updates: List[Tuple[Any, int, float]] = []
+    for i, position in enumerate(positions):
+        updates.extend(
+            (when, i, realized + unrealized)
+            for (realized, when), (unrealized, _) in zip(
+                position.pnlHistory, position.unrealizedPnlHistory
+            )
+        )
+    updates.sort(key=lambda update: update[0])
+
+    pnl = np.zeros(len(positions))
+    curve = []
+    for j, (when, i, value) in enumerate(updates):
+        pnl[i] = value
+        if j + 1 == len(updates) or updates[j + 1][0] != when:
+            curve.append(pnl.sum())
+    return np.array(curve)
+
+
+def summarize(engine: TradingEngine, strategy: Strategy) -> Dict[str, float]:
+    """Summarize a strategy's backtest.
+
+    Args:
+        engine (TradingEngine): the engine, having run
+        strategy (Strategy): the strategy to summarize
+    Returns:
+        dict: final pnl, sharpe ratio of the changes in pnl (annualized as in
+              `CalculationsMixin.plotSharpe`), max drawdown in pnl, and number
+              of trades
+    """
+    import numpy as np  # type: ignore
+
+    curve = _pnlCurve(engine.manager.positions(strategy))
+
+    changes = np.diff(curve)
+    sharpe = (
+        changes.mean() / changes.std() * np.sqrt(252)
+        if changes.size and changes.std()
+        else np.nan
+    )
+    return {
+        "pnl": float(curve[-1]) if curve.size else 0.0,
+        "sharpe": float(sharpe),
+        "drawdown": (
+            float((np.maximum.accumulate(curve) - curve).max()) if curve.size else 0.0
+        ),
+        "trades": len(engine.manager.trades(strategy)),
+    }
+
+
+def _initWorker(config: dict) -> None:
+    """load the exchanges' historical data once per worker, rather than per run"""
+    exchanges = getExchanges(
+        config.get("exchange", {}).get("exchanges", []),
+        trading_type=TradingType(
+            config.get("general", {}).get("trading_type", "simulation").upper()
+        ),
+    )
+
+    # in the runs' timezone, as data is cached per timezone
+    timezone = config.get("general", {}).get("timezone", None)
+    clock = Clock()
+    clock.simulate(
+        datetime.fromtimestamp(0, tz=pytz.timezone(timezone) if timezone else None)
+    )
+    for exchange in exchanges:
+        exchange.setClock(clock)
+    asyncio.get_event_loop().run_until_complete(
+        asyncio.gather(*(exchange.preload() for exchange in exchanges))
+    )
+
+
+def _run(
+    engine: Type[TradingEngine],
+    config: dict,
+    strategy: Type[Strategy],
+    params: Dict[str, Any],
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> Dict[str, float]:
+    """run one backtest, in a worker, optionally over part of the data"""
+    general = dict(config.get("general", {}), api=False)
+    if start_date is not None:
+        general["start_date"] = start_date
+    if end_date is not None:
+        general["end_date"] = end_date
+
+    instance = strategy(**params)
+    trading_engine = engine(
+        **dict(config, general=general, strategy={"strategies": [instance]})
+    )
+    trading_engine.start()
+    return summarize(trading_engine, instance)
+
+
+def _strategy(strategy: Union[Type[Strategy], str]) -> Type[Strategy]:
+    if isinstance(strategy, str):
+        mod, clazz = strategy.split(":")
+        return getattr(importlib.import_module(mod), clazz)
+    return strategy
+
+
+def _pool(config: dict, workers: Optional[int]) -> ProcessPoolExecutor:
+    # spawned, as forking a process with an event loop or threads running
+    # isn't safe, so nothing is shared with the parent. Each worker loads its
+    # own copy of the data, once, in `_initWorker`
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_initWorker,
+        initargs=(config,),
+    )
+
+
+def sweep(
+    config: dict,
+    strategy: Union[Type[Strategy], str],
+    grid: Dict[str, List[Any]],
+    workers: Optional[int] = None,
+    engine: Type[TradingEngine] = TradingEngine,
+) -> "pd.DataFrame":
+    """Backtest a strategy over a grid of parameters, in parallel.
+
+    Each backtest runs in a pool of worker processes, each of which loads the
+    exchanges' historical data once (see `Exchange.preload`) and reuses it
+    across the backtests it runs.
+
+    Args:
+        config (dict): engine config, e.g. from `parseConfig`. Its strategies
+                       are ignored
+        strategy (Union[type, str]): strategy class, or "module:Class", which
+                                     is constructed with each parameter set as
+                                     keyword arguments
+        grid (dict): parameter name to list of values to try
+        workers (Optional[int]): number of worker processes, defaults to the
+                                 number of cpus
+        engine (type): engine class to backtest with
+    Returns:
+        DataFrame: one row per parameter set, with its parameters and the
+                   summary of its backtest (see `summarize`)
+    """
+    import pandas as pd  # type: ignore
+
+    strategy = _strategy(strategy)
+    params = _grid(grid)
+
+    with _pool(config, workers) as executor:
+        results = list(
+            executor.map(
+                _run,
+                itertools.repeat(engine),
+                itertools.repeat(config),
+                itertools.repeat(strategy),
+                params,
+            )
+        )
+
+    return pd.DataFrame(
+        [dict(p, **r) for p, r in zip(params, results)],
+        columns=list(grid.keys()) + list(SUMMARY),
+    )
+
+
+def windows(
+    start: datetime, end: datetime, in_sample: timedelta, out_of_sample: timedelta
+) -> List[Tuple[datetime, datetime, datetime]]:
+    """Split `start` to `end` into rolling walk forward windows.
+
+    Each window is `in_sample` long, followed by `out_of_sample` (or until
+    `end`), and each successive window starts `out_of_sample` later, so the
+    out of sample periods are back to back.
+
+    Returns:
+        list: (in sample start, out of sample start, out of sample end) of
+              each window
+    """
+    ret = []
+    window = start
+    while window + in_sample < end:
+        ret.append(
+            (
+                window,
+                window + in_sample,
+                min(window + in_sample + out_of_sample, end),
+            )
+        )
+        window += out_of_sample
+    return ret
+
+
+def walkForward(
+    config: dict,
+    strategy: Union[Type[Strategy], str],
+    grid: Dict[str, List[Any]],
+    start: datetime,
+    end: datetime,
+    in_sample: timedelta,
+    out_of_sample: timedelta,
+    objective: str = "sharpe",
+    workers: Optional[int] = None,
+    engine: Type[TradingEngine] = TradingEngine,
+) -> "pd.DataFrame":
+    """Walk forward optimization of a strategy's parameters.
+
+    The data from `start` to `end` is split into rolling windows (see
+    `windows`). For each window, every parameter set in the grid is
+    backtested over the in sample period, and the one with the best
+    `objective` is then backtested over the following out of sample period.
+
+    All the backtests run in one pool of worker processes, which load the
+    exchanges' historical data once (see `Exchange.preload`) and replay the
+    part of it each backtest needs (see the engine's `start_date` and
+    `end_date`), rather than reloading it per window. Exchanges replaying
+    cached data start each window by bisecting into it (see `Exchange.seek`),
+    rather than replaying everything before it.
+
+    Args:
+        config (dict): engine config, e.g. from `parseConfig`. Its strategies
+                       are ignored
+        strategy (Union[type, str]): strategy class, or "module:Class"
+        grid (dict): parameter name to list of values to try
+        start (datetime): start of the data to use
+        end (datetime): end of the data to use
+        in_sample (timedelta): length of the in sample periods
+        out_of_sample (timedelta): length of the out of sample periods
+        objective (str): summary column to optimize, one of `SUMMARY`.
+                         Highest is best, except for drawdown
+        workers (Optional[int]): number of worker processes, defaults to the
+                                 number of cpus
+        engine (type): engine class to backtest with
+    Returns:
+        DataFrame: one row per window, with its periods, the parameters
+                   chosen in sample and their in sample objective, and the
+                   summary of the out of sample backtest (see `summarize`)
+    """
+    import numpy as np  # type: ignore
+    import pandas as pd  # type: ignore
+
+    if objective not in SUMMARY:
+        raise Exception("Unknown objective: {}".format(objective))
+
+    strategy = _strategy(strategy)
+    params = _grid(grid)
+    splits = windows(start, end, in_sample, out_of_sample)
+    sign = -1 if objective == "drawdown" else 1
+
+    rows = []
+    with _pool(config, workers) as executor:
+        # optimize every window in sample at once
+        optimizing = [
+            [
+                executor.submit(
+                    _run, engine, config, strategy, p, in_sample_start, in_sample_end
+                )
+                for p in params
+            ]
+            for in_sample_start, in_sample_end, _ in splits
+        ]
+
+        testing = []
+        for (_, out_of_sample_start, out_of_sample_end), futures in zip(
+            splits, optimizing
+        ):
+            scores = [future.result()[objective] for future in futures]
+            best = max(
+                range(len(params)),
+                key=lambda i: -np.inf if np.isnan(scores[i]) else sign * scores[i],
+            )
+            rows.append((params[best], scores[best]))
+
+            # then run the best out of sample
+            testing.append(
+                executor.submit(
+                    _run,
+                    engine,
+                    config,
+                    strategy,
+                    params[best],
+                    out_of_sample_start,
+                    out_of_sample_end,
+                )
+            )
+
+        results = [future.result() for future in testing]
+
+    return pd.DataFrame(
+        [
+            dict(
+                in_sample_start=split[0],
+                out_of_sample_start=split[1],
+                out_of_sample_end=split[2],
+                **p,
+                **{"in_sample_{}".format(objective): score},
+                **result,
+            )
+            for split, (p, score), result in zip(splits, rows, results)
+        ],
+        columns=["in_sample_start", "out_of_sample_start", "out_of_sample_end"]
+        + list(grid.keys())
+        + ["in_sample_{}".format(objective)]
+        + list(SUMMARY),
+    )
@@ -1,3 +1,4 @@
 # Don't import external exchanges here as they might have deps
 from .exchange import Exchange  # noqa: F401
 from .synthetic import SyntheticExchange  # noqa: F401
+from .cache import HistoricalCache, historical  # noqa: F401
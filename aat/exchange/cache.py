@@ -0,0 +1,110 @@
+import threading
+from datetime import date, datetime, tzinfo
+from typing import Callable, Dict, Hashable, Iterable, Iterator, Optional, Tuple
+
+from aat.core import Trade
+
+
+class HistoricalCache(object):
+    """Process wide, read only cache of historical market data.
+
+    Exchanges replaying historical data load it through the cache, keyed by
+    source, instruments, and date range (see `key`), so every engine in the
+    process replaying the same data (e.g. concurrent backtests, or the
+    backtests one worker of a parameter sweep runs) iterates the one parsed
+    copy of it rather than loading its own. Data is loaded on first use and
+    kept until cleared. Processes don't share it, e.g. each spawned worker
+    of a sweep loads its own.
+
+    Cached trades are shared between engines, so must not be modified.
+    Engines assume naive timestamps are in their timezone (see
+    `TradingEngine._localize`), so data is cached per timezone, with its
+    timestamps localized once as it is loaded, and exchanges hand engines
+    the cached trades as they are"""
+
+    def __init__(self) -> None:
+        # by (key, timezone)
+        self._data: Dict[Tuple[Hashable, Optional[tzinfo]], Tuple[Trade, ...]] = {}
+        self._lock = threading.Lock()
+
+        # whether each key's trades are in timestamp order, see `since`
+        self._ordered: Dict[Tuple[Hashable, Optional[tzinfo]], bool] = {}
+
+    @staticmethod
+    def key(
+        source: Hashable,
+        instruments: Iterable[str] = (),
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Tuple:
+        """cache key for `source`'s data for `instruments` (by name, in the
+        order their data is interleaved) between `start` and `end`, where
+        None means all of it"""
+        return (source, tuple(dict.fromkeys(instruments)), start, end)
+
+    def get(
+        self,
+        key: Hashable,
+        load: Callable[[], Iterable[Trade]],
+        tz: Optional[tzinfo] = None,
+    ) -> Tuple[Trade, ...]:
+        """get the data for `key`, with naive timestamps in timezone `tz`,
+        loading it with `load` if not yet cached. `load` returns newly
+        constructed trades, which are localized before anything else sees them
+        """
+        cached = (key, tz)
+        data = self._data.get(cached)
+        if data is None:
+            with self._lock:
+                # may have been loaded while we waited
+                data = self._data.get(cached)
+                if data is None:
+                    data = self._data[cached] = tuple(self._localize(load(), tz))
+        return data
+
+    @staticmethod
+    def _localize(trades: Iterable[Trade], tz: Optional[tzinfo]) -> Iterator[Trade]:
+        for trade in trades:
+            if tz and not trade.timestamp.tzinfo:
+                trade.timestamp = trade.timestamp.replace(tzinfo=tz)
+            yield trade
+
+    def since(self, key: Hashable, start: datetime, tz: Optional[tzinfo] = None) -> int:
+        """index of the first of `key`'s cached trades in timezone `tz` at or
+        after `start` (e.g. to start replaying a backtest window without
+        iterating all the trades before it). As this bisects, it is 0 unless
+        the trades are in timestamp order"""
+        cached = (key, tz)
+        data = self._data[cached]
+
+        ordered = self._ordered.get(cached)
+        if ordered is None:
+            ordered = self._ordered[cached] = all(
+                data[i].timestamp <= data[i + 1].timestamp for i in range(len(data) - 1)
+            )
+        if not ordered:
+            return 0
+
+        low, high = 0, len(data)
+        while low < high:
+            mid = (low + high) // 2
+            if data[mid].timestamp < start:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def __contains__(self, key: Hashable) -> bool:
+        return any(cached == key for cached, _ in self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        """drop all cached data"""
+        with self._lock:
+            self._data.clear()
+            self._ordered.clear()
+
+
+historical = HistoricalCache()
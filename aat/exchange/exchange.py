@@ -1,7 +1,8 @@
 from abc import abstractmethod
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
-from aat.core import ExchangeType, Instrument
+from aat.core import Clock, ExchangeType, Instrument, clock
 
 from .base.market_data import _MarketData
 from .base.order_entry import _OrderEntry
@@ -17,12 +18,30 @@ class Exchange(_MarketData, _OrderEntry):
         exchanges can be queried for data, or send data
     """
 
+    # clock of the engine running the exchange, see `setClock`
+    _clock: Clock = clock
+
+    # offline, where the engine's replay window starts, see `seek`
+    _replay_start: Optional[datetime] = None
+
     def __init__(self, exchange: ExchangeType) -> None:
         self._exchange: ExchangeType = exchange
 
     def exchange(self) -> ExchangeType:
         return self._exchange
 
+    def setClock(self, clock: Clock) -> None:
+        """use the clock of the engine running this exchange, e.g. for
+        simulated time in a backtest"""
+        self._clock = clock
+
+    def seek(self, start: Optional[datetime]) -> None:
+        """offline, replay historical data from `start` (the engine's
+        `start_date`) rather than from the beginning. Exchanges replaying
+        cached data can skip straight to it (see `HistoricalCache.since`), the
+        engine drops any earlier events regardless"""
+        self._replay_start = start
+
     @abstractmethod
     async def connect(self) -> None:
         """connect to exchange. should be asynchronous.
@@ -30,6 +49,12 @@ class Exchange(_MarketData, _OrderEntry):
         For OrderEntry-only, can just return None
         """
 
+    async def preload(self) -> None:
+        """load any historical data up front, for later instances of this
+        exchange in the same process to reuse (e.g. across the backtests of
+        a parameter sweep, see `aat.engine.sweep`). By default, does nothing
+        """
+
     async def lookup(self, instrument: Instrument) -> List[Instrument]:
         """lookup an instrument on the exchange"""
         return []
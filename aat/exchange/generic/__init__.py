@@ -1,2 +1,3 @@
 from .csv import CSV  # noqa: F401
 from .kafka import Kafka  # noqa: F401
+from .journal import JournalExchange, JournalReader, JournalWriter  # noqa: F401
@@ -1,11 +1,13 @@
 import asyncio
 import csv
+import itertools
+import os.path
 from collections import deque
-from datetime import datetime
-from typing import List, Deque, AsyncGenerator, Any
+from datetime import datetime, tzinfo
+from typing import List, Deque, AsyncGenerator, Any, Iterator, Optional, Tuple
 from aat.config import EventType, InstrumentType, Side, TradingType
 from aat.core import ExchangeType, Event, Instrument, Trade, Order
-from aat.exchange import Exchange
+from aat.exchange import Exchange, historical
 
 
 class CSV(Exchange):
@@ -16,7 +18,9 @@ class CSV(Exchange):
         self._trading_type = trading_type
         self._verbose = verbose
         self._filename = filename
-        self._data: List[Trade] = []
+        self._data: Tuple[Trade, ...] = ()
+        self._key: Tuple = ()
+        self._tz: Optional[tzinfo] = None
 
         # "Order" management
         self._queued_orders: Deque[Order] = deque()
@@ -26,7 +30,20 @@ class CSV(Exchange):
         """get list of available instruments"""
         return list(set(_.instrument for _ in self._data))
 
+    async def preload(self) -> None:
+        """parse the file into the historical data cache, for every later CSV
+        exchange reading it in this process to share"""
+        await self.connect()
+
     async def connect(self) -> None:
+        # parsed once per process and timezone, see `HistoricalCache`. Trades
+        # carry this exchange, which is named after the file
+        source = (self.exchange().name, os.path.abspath(self._filename))
+        self._key = historical.key(source)
+        self._tz = self._clock.now().tzinfo
+        self._data = historical.get(self._key, self._load, self._tz)
+
+    def _load(self) -> Iterator[Trade]:
         with open(self._filename) as csvfile:
             self._reader = csv.DictReader(csvfile, delimiter=",")
 
@@ -50,17 +67,19 @@ class CSV(Exchange):
                 elif "datetime" in row:
                     order.timestamp = datetime.fromisoformat(row["datetime"])
 
-                self._data.append(
-                    Trade(
-                        volume=float(row["volume"]),
-                        price=float(row["close"]),
-                        maker_orders=[],
-                        taker_order=order,
-                    )
+                yield Trade(
+                    volume=float(row["volume"]),
+                    price=float(row["close"]),
+                    maker_orders=[],
+                    taker_order=order,
                 )
 
     async def tick(self) -> AsyncGenerator[Any, Event]:  # type: ignore[override]
-        for item in self._data:
+        start = 0
+        if self._replay_start is not None and self._data:
+            start = historical.since(self._key, self._replay_start, self._tz)
+
+        for item in itertools.islice(self._data, start, None):
             yield Event(EventType.TRADE, item)
             await asyncio.sleep(0)
 
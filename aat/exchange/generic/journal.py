@@ -0,0 +1,572 @@
+import asyncio
+import pickle
+import struct
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Any,
+    AsyncGenerator,
+    BinaryIO,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from aat.config import (
+    DataType,
+    EventType,
+    InstrumentType,
+    OrderFlag,
+    OrderType,
+    Side,
+    TradingType,
+)
+from aat.core import Clock, Data, Event, ExchangeType, Instrument, Order, Trade, clock
+from aat.exchange import Exchange
+
+# file header, then length prefixed records
+_MAGIC = b"AATJ"
+_VERSION = 1
+_RECORD = struct.Struct("<IB")  # payload length, record kind
+
+# record kinds. Each writer session starts with a session record, after
+# which instruments and exchanges are defined once and referred to by index
+_SESSION = 0
+_INSTRUMENT = 1
+_EXCHANGE = 2
+_EVENT = 3
+
+_SESSION_RECORD = struct.Struct("<H")  # version
+_INSTRUMENT_RECORD = struct.Struct("<B")  # type, followed by name
+
+# event type, strategy index, time of the event (ns since epoch), target kind
+_EVENT_RECORD = struct.Struct("<BHqB")
+_NO_STRATEGY = 0xFFFF
+
+# target kinds
+_NONE = 0
+_ORDER = 1
+_TRADE = 2
+_DATA = 3
+
+# timestamp (us since epoch), timestamp is timezone aware, instrument, exchange,
+# volume, price, notional, filled, side, order type, flag, has stop target.
+# Followed by id, then stop target
+_ORDER_RECORD = struct.Struct("<qBIHddddBBBB")
+
+# volume, price, maker order count, my order (none, taker, or following).
+# Followed by id, taker order, maker orders, then my order
+_TRADE_RECORD = struct.Struct("<ddHB")
+_MY_ORDER_NONE = 0
+_MY_ORDER_TAKER = 1
+_MY_ORDER_OTHER = 2
+
+# timestamp, timestamp is timezone aware, instrument, exchange. Followed by
+# id, then pickled data
+_DATA_RECORD = struct.Struct("<qBIH")
+_NO_INSTRUMENT = 0xFFFFFFFF
+
+# ids are ints or strings
+_INT_ID = struct.Struct("<Bq")
+_STR_ID = struct.Struct("<BH")
+
+# enums by code, and codes by enum. The C++ enums aren't iterable, but both
+# have `__members__`
+_EVENT_TYPES = list(EventType.__members__.values())
+_INSTRUMENT_TYPES = list(InstrumentType.__members__.values())
+_SIDES = list(Side.__members__.values())
+_ORDER_TYPES = list(OrderType.__members__.values())
+_ORDER_FLAGS = list(OrderFlag.__members__.values())
+_CODES = {
+    member: code
+    for members in (_EVENT_TYPES, _INSTRUMENT_TYPES, _SIDES, _ORDER_TYPES, _ORDER_FLAGS)
+    for code, member in enumerate(members)
+}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+# events replayed by `JournalExchange`
+_MARKET_DATA = (
+    EventType.TRADE,
+    EventType.OPEN,
+    EventType.CANCEL,
+    EventType.CHANGE,
+    EventType.FILL,
+    EventType.DATA,
+    EventType.HALT,
+    EventType.CONTINUE,
+)
+
+# order entry events, recorded along with the strategy they were sent to
+_ORDER_ENTRY = (
+    EventType.BOUGHT,
+    EventType.SOLD,
+    EventType.RECEIVED,
+    EventType.REJECTED,
+    EventType.CANCELED,
+)
+
+
+def _encodeTimestamp(timestamp: datetime) -> Tuple[int, int]:
+    """exact microseconds since epoch, naive timestamps as if they were UTC"""
+    if timestamp.tzinfo:
+        return (timestamp - _EPOCH) // _MICROSECOND, 1
+    return (timestamp.replace(tzinfo=timezone.utc) - _EPOCH) // _MICROSECOND, 0
+
+
+def _decodeTimestamp(micros: int, aware: int) -> datetime:
+    timestamp = _EPOCH + timedelta(microseconds=micros)
+    return timestamp if aware else timestamp.replace(tzinfo=None)
+
+
+class JournalWriter(object):
+    """Append only binary journal of the events an engine sees.
+
+    Records exchange events (market data), and order entry events along with
+    the strategy they were sent to, in a compact fixed layout encoding that
+    is much cheaper to write and read back than `Event.json`. Replay a
+    journal with `JournalExchange`, or read it with `JournalReader`.
+
+    Events are stamped with the timestamp of their order, trade, or data, so
+    a backtest is recorded in simulated time. Events without one (e.g. halts)
+    are stamped with the time of `clock`. The session's own fills are
+    recorded as order entry events, not as market data
+
+    Args:
+        filename (str): journal to append to
+        clock (Clock): clock of the engine recording
+    """
+
+    def __init__(self, filename: str, clock: Clock = clock) -> None:
+        self._clock = clock
+        self._file: BinaryIO = open(filename, "ab")
+        if self._file.tell() == 0:
+            self._file.write(_MAGIC)
+
+        self._instruments: Dict[Tuple[str, InstrumentType], int] = {}
+        self._exchanges: Dict[str, int] = {}
+        self._record(_SESSION, _SESSION_RECORD.pack(_VERSION))
+
+    def write(self, event: Event, strategy: Optional[int] = None) -> None:
+        """record an event, sent to the strategy at index `strategy` if its an
+        order entry event. Other engine events (e.g. heartbeats) are ignored"""
+        if event.type not in _MARKET_DATA and event.type not in _ORDER_ENTRY:
+            return
+
+        target = event.target
+        if event.type == EventType.TRADE and getattr(target, "my_order", None):
+            # our own fill, recorded as BOUGHT or SOLD
+            return
+
+        payload = bytearray()
+
+        # by data type rather than class, so C++ targets are recorded too
+        data_type = getattr(target, "type", None)
+        if data_type == DataType.TRADE:
+            kind = _TRADE
+            self._trade(payload, target)  # type: ignore
+        elif data_type == DataType.ORDER:
+            kind = _ORDER
+            self._order(payload, target)  # type: ignore
+        elif data_type == DataType.DATA:
+            kind = _DATA
+            self._data(payload, target)  # type: ignore
+        else:
+            kind = _NONE
+
+        self._record(
+            _EVENT,
+            _EVENT_RECORD.pack(
+                _CODES[event.type],
+                _NO_STRATEGY if strategy is None else strategy,
+                _encodeTimestamp(
+                    getattr(target, "timestamp", None) or self._clock.now()
+                )[0]
+                * 1000,
+                kind,
+            )
+            + payload,
+        )
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def _record(self, kind: int, payload: bytes) -> None:
+        self._file.write(_RECORD.pack(len(payload), kind))
+        self._file.write(payload)
+
+    def _instrument(self, instrument: Optional[Instrument]) -> int:
+        if instrument is None:
+            return _NO_INSTRUMENT
+
+        key = (instrument.name, instrument.type)
+        if key not in self._instruments:
+            self._instruments[key] = len(self._instruments)
+            self._record(
+                _INSTRUMENT,
+                _INSTRUMENT_RECORD.pack(_CODES[instrument.type])
+                + instrument.name.encode(),
+            )
+        return self._instruments[key]
+
+    def _exchange(self, exchange: ExchangeType) -> int:
+        if exchange.name not in self._exchanges:
+            self._exchanges[exchange.name] = len(self._exchanges)
+            self._record(_EXCHANGE, exchange.name.encode())
+        return self._exchanges[exchange.name]
+
+    def _id(self, payload: bytearray, id: Union[int, str]) -> None:
+        if isinstance(id, int):
+            payload += _INT_ID.pack(0, id)
+        else:
+            data = str(id).encode()
+            payload += _STR_ID.pack(1, len(data))
+            payload += data
+
+    def _order(self, payload: bytearray, order: Order) -> None:
+        timestamp, aware = _encodeTimestamp(order.timestamp)
+        payload += _ORDER_RECORD.pack(
+            timestamp,
+            aware,
+            self._instrument(order.instrument),
+            self._exchange(order.exchange),
+            order.volume,
+            order.price,
+            order.notional,
+            order.filled,
+            _CODES[order.side],
+            _CODES[order.order_type],
+            _CODES[order.flag],
+            order.stop_target is not None,
+        )
+        self._id(payload, order.id)
+
+        if order.stop_target is not None:
+            self._order(payload, order.stop_target)
+
+    def _trade(self, payload: bytearray, trade: Trade) -> None:
+        if trade.my_order is None:
+            my_order = _MY_ORDER_NONE
+        elif trade.my_order is trade.taker_order:
+            my_order = _MY_ORDER_TAKER
+        else:
+            my_order = _MY_ORDER_OTHER
+
+        payload += _TRADE_RECORD.pack(
+            trade.volume, trade.price, len(trade.maker_orders), my_order
+        )
+        self._id(payload, trade.id)
+        self._order(payload, trade.taker_order)
+
+        for order in trade.maker_orders:
+            self._order(payload, order)
+
+        if my_order == _MY_ORDER_OTHER:
+            self._order(payload, trade.my_order)
+
+    def _data(self, payload: bytearray, data: Data) -> None:
+        timestamp, aware = _encodeTimestamp(data.timestamp)
+        payload += _DATA_RECORD.pack(
+            timestamp,
+            aware,
+            self._instrument(data.instrument),
+            self._exchange(data.exchange),
+        )
+        self._id(payload, data.id)
+        payload += pickle.dumps(data.data)
+
+
+class JournalReader(object):
+    """Read back a journal written by `JournalWriter`.
+
+    Iterating yields `(recorded, strategy, event)` for each event, where
+    `recorded` is the time of the event (ns since epoch), and `strategy` the
+    index of the strategy an order entry event was sent to, or None. If
+    `exchange` is given, it replaces the exchange of everything read"""
+
+    def __init__(self, filename: str, exchange: Optional[ExchangeType] = None) -> None:
+        self._filename = filename
+        self._exchange = exchange
+
+    def _records(self) -> Iterator[Tuple[int, memoryview]]:
+        with open(self._filename, "rb") as file:
+            data = memoryview(file.read())
+
+        if data[: len(_MAGIC)] != _MAGIC:
+            raise Exception("Not a journal: {}".format(self._filename))
+
+        offset = len(_MAGIC)
+        while offset + _RECORD.size <= len(data):
+            length, kind = _RECORD.unpack_from(data, offset)
+            offset += _RECORD.size
+            if offset + length > len(data):
+                # truncated by a crash mid write
+                break
+            yield kind, data[offset : offset + length]
+            offset += length
+
+    def instruments(self) -> List[Instrument]:
+        """instruments defined in the journal"""
+        instruments = {}
+        for kind, payload in self._records():
+            if kind == _INSTRUMENT:
+                instrument = self._instrument(payload)
+                instruments[(instrument.name, instrument.type)] = instrument
+        return list(instruments.values())
+
+    def __iter__(self) -> Iterator[Tuple[int, Optional[int], Event]]:
+        instruments: List[Instrument] = []
+        exchanges: List[ExchangeType] = []
+
+        for kind, payload in self._records():
+            if kind == _EVENT:
+                event_type, strategy, recorded, target_kind = _EVENT_RECORD.unpack_from(
+                    payload
+                )
+
+                target: Union[Order, Trade, Data, None] = None
+                if target_kind != _NONE:
+                    offset = _EVENT_RECORD.size
+                    if target_kind == _ORDER:
+                        target, _ = self._order(payload, offset, instruments, exchanges)
+                    elif target_kind == _TRADE:
+                        target = self._trade(payload, offset, instruments, exchanges)
+                    else:
+                        target = self._data(payload, offset, instruments, exchanges)
+
+                yield (
+                    recorded,
+                    None if strategy == _NO_STRATEGY else strategy,
+                    Event(type=_EVENT_TYPES[event_type], target=target),
+                )
+
+            elif kind == _INSTRUMENT:
+                instruments.append(self._instrument(payload))
+
+            elif kind == _EXCHANGE:
+                exchanges.append(
+                    self._exchange or ExchangeType(bytes(payload).decode())
+                )
+
+            elif kind == _SESSION:
+                (version,) = _SESSION_RECORD.unpack_from(payload)
+                if version != _VERSION:
+                    raise Exception("Unsupported journal version: {}".format(version))
+
+                # new writer, new definitions
+                instruments = []
+                exchanges = []
+
+    def _instrument(self, payload: memoryview) -> Instrument:
+        (type,) = _INSTRUMENT_RECORD.unpack_from(payload)
+        name = bytes(payload[_INSTRUMENT_RECORD.size :]).decode()
+        if self._exchange is not None:
+            return Instrument(name, _INSTRUMENT_TYPES[type], exchange=self._exchange)
+        return Instrument(name, _INSTRUMENT_TYPES[type])
+
+    def _id(self, payload: memoryview, offset: int) -> Tuple[Union[int, str], int]:
+        if payload[offset] == 0:
+            _, id = _INT_ID.unpack_from(payload, offset)
+            return id, offset + _INT_ID.size
+
+        _, length = _STR_ID.unpack_from(payload, offset)
+        offset += _STR_ID.size
+        return bytes(payload[offset : offset + length]).decode(), offset + length
+
+    def _order(
+        self,
+        payload: memoryview,
+        offset: int,
+        instruments: List[Instrument],
+        exchanges: List[ExchangeType],
+    ) -> Tuple[Order, int]:
+        (
+            timestamp,
+            aware,
+            instrument,
+            exchange,
+            volume,
+            price,
+            notional,
+            filled,
+            side,
+            order_type,
+            flag,
+            stop,
+        ) = _ORDER_RECORD.unpack_from(payload, offset)
+        id, offset = self._id(payload, offset + _ORDER_RECORD.size)
+
+        stop_target = None
+        if stop:
+            stop_target, offset = self._order(payload, offset, instruments, exchanges)
+
+        order = Order(
+            volume=volume,
+            price=price,
+            side=_SIDES[side],
+            instrument=instruments[instrument],
+            exchange=exchanges[exchange],
+            notional=notional,
+            order_type=_ORDER_TYPES[order_type],
+            flag=_ORDER_FLAGS[flag],
+            stop_target=stop_target,
+            id=id,
+            timestamp=_decodeTimestamp(timestamp, aware),
+        )
+        order.filled = filled
+        return order, offset
+
+    def _trade(
+        self,
+        payload: memoryview,
+        offset: int,
+        instruments: List[Instrument],
+        exchanges: List[ExchangeType],
+    ) -> Trade:
+        volume, price, makers, my_order_kind = _TRADE_RECORD.unpack_from(
+            payload, offset
+        )
+        id, offset = self._id(payload, offset + _TRADE_RECORD.size)
+        taker_order, offset = self._order(payload, offset, instruments, exchanges)
+
+        maker_orders = []
+        for _ in range(makers):
+            order, offset = self._order(payload, offset, instruments, exchanges)
+            maker_orders.append(order)
+
+        my_order: Optional[Order] = None
+        if my_order_kind == _MY_ORDER_TAKER:
+            my_order = taker_order
+        elif my_order_kind == _MY_ORDER_OTHER:
+            my_order, offset = self._order(payload, offset, instruments, exchanges)
+
+        return Trade(
+            volume=volume,
+            price=price,
+            taker_order=taker_order,
+            maker_orders=maker_orders,
+            my_order=my_order,
+            id=id,
+        )
+
+    def _data(
+        self,
+        payload: memoryview,
+        offset: int,
+        instruments: List[Instrument],
+        exchanges: List[ExchangeType],
+    ) -> Data:
+        timestamp, aware, instrument, exchange = _DATA_RECORD.unpack_from(
+            payload, offset
+        )
+        id, offset = self._id(payload, offset + _DATA_RECORD.size)
+        return Data(
+            instrument=(
+                None if instrument == _NO_INSTRUMENT else instruments[instrument]
+            ),
+            exchange=exchanges[exchange],
+            data=pickle.loads(payload[offset:]),
+            id=id,  # type: ignore
+            timestamp=_decodeTimestamp(timestamp, aware),
+        )
+
+
+class JournalExchange(Exchange):
+    """Replay the market data recorded in a journal (see `JournalWriter`), as
+    fast as possible, or at `speed` times the pace it was recorded at.
+
+    Everything replayed is attributed to this exchange, and orders are
+    filled immediately at their price, as with `CSV`. Recorded order entry
+    events are not replayed, as the strategies being replayed generate their
+    own"""
+
+    def __init__(
+        self,
+        trading_type: TradingType,
+        verbose: bool,
+        filename: str,
+        speed: Union[str, float] = 0,
+    ) -> None:
+        super().__init__(ExchangeType("journal-{}".format(filename)))
+        self._trading_type = trading_type
+        self._verbose = verbose
+        self._filename = filename
+        self._speed = float(speed)
+        self._reader = JournalReader(filename, self.exchange())
+
+        # "Order" management
+        self._queued_orders: Deque[Order] = deque()
+        self._order_id = 1
+
+    async def connect(self) -> None:
+        pass
+
+    async def instruments(self) -> List[Instrument]:
+        """get list of available instruments"""
+        return self._reader.instruments()
+
+    async def tick(self) -> AsyncGenerator[Any, Event]:  # type: ignore[override]
+        start: Optional[Tuple[float, int]] = None
+
+        for recorded, _, event in self._reader:
+            if event.type not in _MARKET_DATA:
+                continue
+            if event.type == EventType.TRADE and getattr(
+                event.target, "my_order", None
+            ):
+                # the recording session's own fill
+                continue
+
+            if self._speed > 0:
+                # pace relative to the first event
+                if start is None:
+                    start = (time.monotonic(), recorded)
+                delay = (
+                    start[0]
+                    + (recorded - start[1]) / 1e9 / self._speed
+                    - time.monotonic()
+                )
+                await asyncio.sleep(max(delay, 0))
+
+            yield event
+            await asyncio.sleep(0)
+
+            # save timestamp
+            timestamp = getattr(event.target, "timestamp", None) or self._clock.now()
+
+            while self._queued_orders:
+                order = self._queued_orders.popleft()
+                order.timestamp = timestamp
+                order.filled = order.volume
+
+                t = Trade(
+                    volume=order.volume,
+                    price=order.price,
+                    taker_order=order,
+                    maker_orders=[],
+                    my_order=order,
+                )
+
+                yield Event(type=EventType.TRADE, target=t)
+
+    async def cancelOrder(self, order: Order) -> bool:
+        # Can't cancel, orders execute immediately
+        return False
+
+    async def newOrder(self, order: Order) -> bool:
+        if self._trading_type == TradingType.LIVE:
+            raise NotImplementedError("Live OE not available for journal replay")
+
+        order.id = str(self._order_id)
+        self._order_id += 1
+        self._queued_orders.append(order)
+        return True
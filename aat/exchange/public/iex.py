@@ -6,9 +6,9 @@ import pyEX  # type: ignore
 from collections import deque
 from datetime import datetime, timedelta
 from tqdm import tqdm  # type: ignore
-from typing import AsyncGenerator, Any, Deque, List
+from typing import AsyncGenerator, Any, Deque, Iterator, List, Tuple
 
-from aat.exchange import Exchange
+from aat.exchange import Exchange, historical
 from aat.config import InstrumentType, EventType, Side, TradingType
 from aat.core import ExchangeType, Instrument, Event, Trade, Order
 
@@ -166,15 +166,110 @@ class IEX(Exchange):
                 await asyncio.sleep(0)
 
         else:
-            dfs = []
-            insts = set()
+            # loaded once per process and timezone, see `HistoricalCache`
+            key = self._key()
+            tz = self._clock.now().tzinfo
+            trades = historical.get(key, self._history, tz)
+
+            start = 0
+            if self._replay_start is not None and trades:
+                start = historical.since(key, self._replay_start, tz)
+
+            for j in range(start, len(trades)):
+                trade = trades[j]
+                yield Event(type=EventType.TRADE, target=trade)
+                await asyncio.sleep(0)
+
+                if j + 1 < len(trades) and trades[j + 1].timestamp == trade.timestamp:
+                    # fill orders after the last trade at this time
+                    continue
+
+                while self._queued_orders:
+                    order = self._queued_orders.popleft()
+                    order.timestamp = trade.timestamp
+                    order.filled = order.volume
+
+                    t = Trade(
+                        volume=order.volume,
+                        price=order.price,
+                        taker_order=order,
+                        maker_orders=[],
+                        my_order=order,  # FIXME this isnt technically necessary as
+                        # the engine should do this automatically
+                    )
 
-            if self._timeframe != "1d":
-                for i in tqdm(self._subscriptions, desc="Fetching data..."):
-                    if i.name in insts:
-                        # already fetched the data, multiple subscriptions
-                        continue
+                    yield Event(type=EventType.TRADE, target=t)
+                    await asyncio.sleep(0)
 
+    def _key(self) -> Tuple:
+        """historical data cache key for the current subscriptions"""
+        if self._timeframe == "1d":
+            start, end = self._start_date.date(), self._end_date.date()
+        else:
+            # timeframes end today
+            start, end = None, datetime.now().date()
+
+        return historical.key(
+            ("iex", self._timeframe, self._is_sandbox),
+            (i.name for i in self._subscriptions),
+            start,
+            end,
+        )
+
+    def _history(self) -> Iterator[Trade]:
+        """fetch historical data for the current subscriptions"""
+        dfs = []
+        insts = set()
+
+        if self._timeframe != "1d":
+            for i in tqdm(self._subscriptions, desc="Fetching data..."):
+                if i.name in insts:
+                    # already fetched the data, multiple subscriptions
+                    continue
+
+                if self._cache_data:
+                    # first, check if we have this data and its cached already
+                    os.makedirs("_aat_data", exist_ok=True)
+                    data_filename = os.path.join(
+                        "_aat_data",
+                        "iex_{}_{}_{}_{}.pkl".format(
+                            i.name,
+                            self._timeframe,
+                            datetime.now().strftime("%Y%m%d"),
+                            "sand" if self._is_sandbox else "",
+                        ),
+                    )
+
+                    if os.path.exists(data_filename):
+                        print("using cached IEX data for {}".format(i.name))
+                        df = pd.read_pickle(data_filename)
+                    else:
+                        df = self._client.chartDF(i.name, timeframe=self._timeframe)
+                        df.to_pickle(data_filename)
+
+                else:
+                    df = self._client.chartDF(i.name, timeframe=self._timeframe)
+
+                df = df[["close", "volume"]]
+                df.columns = ["close:{}".format(i.name), "volume:{}".format(i.name)]
+                dfs.append(df)
+                insts.add(i.name)
+
+            data_frame = pd.concat(dfs, axis=1)
+            data_frame.sort_index(inplace=True)
+            data_frame = data_frame.groupby(data_frame.index).last()
+            data_frame.drop_duplicates(inplace=True)
+            data_frame.fillna(method="ffill", inplace=True)
+
+        else:
+            for i in tqdm(self._subscriptions, desc="Fetching data..."):
+                if i.name in insts:
+                    # already fetched the data, multiple subscriptions
+                    continue
+
+                date = self._start_date
+                subdfs = []
+                while date <= self._end_date:
                     if self._cache_data:
                         # first, check if we have this data and its cached already
                         os.makedirs("_aat_data", exist_ok=True)
@@ -183,135 +278,68 @@ class IEX(Exchange):
                             "iex_{}_{}_{}_{}.pkl".format(
                                 i.name,
                                 self._timeframe,
-                                datetime.now().strftime("%Y%m%d"),
+                                date,
                                 "sand" if self._is_sandbox else "",
                             ),
                         )
 
                         if os.path.exists(data_filename):
-                            print("using cached IEX data for {}".format(i.name))
-                            df = pd.read_pickle(data_filename)
-                        else:
-                            df = self._client.chartDF(i.name, timeframe=self._timeframe)
-                            df.to_pickle(data_filename)
-
-                    else:
-                        df = self._client.chartDF(i.name, timeframe=self._timeframe)
-
-                    df = df[["close", "volume"]]
-                    df.columns = ["close:{}".format(i.name), "volume:{}".format(i.name)]
-                    dfs.append(df)
-                    insts.add(i.name)
-
-                data_frame = pd.concat(dfs, axis=1)
-                data_frame.sort_index(inplace=True)
-                data_frame = data_frame.groupby(data_frame.index).last()
-                data_frame.drop_duplicates(inplace=True)
-                data_frame.fillna(method="ffill", inplace=True)
-
-            else:
-                for i in tqdm(self._subscriptions, desc="Fetching data..."):
-                    if i.name in insts:
-                        # already fetched the data, multiple subscriptions
-                        continue
-
-                    date = self._start_date
-                    subdfs = []
-                    while date <= self._end_date:
-                        if self._cache_data:
-                            # first, check if we have this data and its cached already
-                            os.makedirs("_aat_data", exist_ok=True)
-                            data_filename = os.path.join(
-                                "_aat_data",
-                                "iex_{}_{}_{}_{}.pkl".format(
-                                    i.name,
-                                    self._timeframe,
-                                    date,
-                                    "sand" if self._is_sandbox else "",
-                                ),
+                            print(
+                                "using cached IEX data for {} - {}".format(i.name, date)
                             )
-
-                            if os.path.exists(data_filename):
-                                print(
-                                    "using cached IEX data for {} - {}".format(
-                                        i.name, date
-                                    )
-                                )
-                                df = pd.read_pickle(data_filename)
-                            else:
-                                df = self._client.chartDF(
-                                    i.name, timeframe="1d", date=date.strftime("%Y%m%d")
-                                )
-                                df.to_pickle(data_filename)
+                            df = pd.read_pickle(data_filename)
                         else:
                             df = self._client.chartDF(
                                 i.name, timeframe="1d", date=date.strftime("%Y%m%d")
                             )
+                            df.to_pickle(data_filename)
+                    else:
+                        df = self._client.chartDF(
+                            i.name, timeframe="1d", date=date.strftime("%Y%m%d")
+                        )
 
-                        if not df.empty:
-                            df = df[["average", "volume"]]
-                            df.columns = [
-                                "close:{}".format(i.name),
-                                "volume:{}".format(i.name),
-                            ]
-                            subdfs.append(df)
-
-                        date += timedelta(days=1)
-
-                    dfs.append(pd.concat(subdfs))
-                    insts.add(i.name)
-
-                data_frame = pd.concat(dfs, axis=1)
-                data_frame.index = [
-                    x
-                    + timedelta(
-                        hours=int(y.split(":")[0]), minutes=int(y.split(":")[1])
-                    )
-                    for x, y in data_frame.index
-                ]
-                data_frame = data_frame.groupby(data_frame.index).last()
-                data_frame.drop_duplicates(inplace=True)
-                data_frame.fillna(method="ffill", inplace=True)
-
-            for index in data_frame.index:
-                for i in self._subscriptions:
-                    volume = data_frame.loc[index]["volume:{}".format(i.name)]
-                    price = data_frame.loc[index]["close:{}".format(i.name)]
-                    if volume == 0:
-                        continue
-
-                    o = Order(
-                        volume=volume,
-                        price=price,
-                        side=Side.BUY,
-                        instrument=i,
-                        exchange=self.exchange(),
-                        filled=volume,
-                        timestamp=index.to_pydatetime(),
-                    )
-                    t = Trade(
-                        volume=volume, price=price, taker_order=o, maker_orders=[]
-                    )
-
-                    yield Event(type=EventType.TRADE, target=t)
-                    await asyncio.sleep(0)
-
-                while self._queued_orders:
-                    order = self._queued_orders.popleft()
-                    order.timestamp = index
-                    order.filled = order.volume
-
-                    t = Trade(
-                        volume=order.volume,
-                        price=order.price,
-                        taker_order=order,
-                        maker_orders=[],
-                        my_order=order,  # FIXME this isnt technically necessary as
-                        # the engine should do this automatically
-                    )
+                    if not df.empty:
+                        df = df[["average", "volume"]]
+                        df.columns = [
+                            "close:{}".format(i.name),
+                            "volume:{}".format(i.name),
+                        ]
+                        subdfs.append(df)
+
+                    date += timedelta(days=1)
+
+                dfs.append(pd.concat(subdfs))
+                insts.add(i.name)
+
+            data_frame = pd.concat(dfs, axis=1)
+            data_frame.index = [
+                x + timedelta(hours=int(y.split(":")[0]), minutes=int(y.split(":")[1]))
+                for x, y in data_frame.index
+            ]
+            data_frame = data_frame.groupby(data_frame.index).last()
+            data_frame.drop_duplicates(inplace=True)
+            data_frame.fillna(method="ffill", inplace=True)
+
+        # one trade per instrument, however many times it was subscribed
+        instruments = {i.name: i for i in self._subscriptions}.values()
+
+        for index in data_frame.index:
+            for i in instruments:
+                volume = data_frame.loc[index]["volume:{}".format(i.name)]
+                price = data_frame.loc[index]["close:{}".format(i.name)]
+                if volume == 0:
+                    continue
 
-                    yield Event(type=EventType.TRADE, target=t)
-                    await asyncio.sleep(0)
+                o = Order(
+                    volume=volume,
+                    price=price,
+                    side=Side.BUY,
+                    instrument=i,
+                    exchange=self.exchange(),
+                    filled=volume,
+                    timestamp=index.to_pydatetime(),
+                )
+                yield Trade(volume=volume, price=price, taker_order=o, maker_orders=[])
 
     # ******************* #
     # Order Entry Methods #
@@ -1,5 +1,4 @@
 import asyncio
-import numpy as np  # type: ignore
 import string
 from datetime import datetime, timedelta
 from collections import deque
@@ -11,6 +10,8 @@ from ...config import TradingType, Side, EventType, OrderType
 
 
 def _getName(n: int = 1) -> List[str]:
+    import numpy as np  # type: ignore
+
     columns = [
         "".join(np.random.choice(list(string.ascii_uppercase), choice((1, 2, 3, 4))))
         + "."
@@ -105,9 +106,11 @@ class SyntheticExchange(Exchange):
                     exchange=self._exchange,
                     order_type=OrderType.LIMIT,
                     id=self._id,
-                    timestamp=self._time
-                    if self._trading_type == TradingType.BACKTEST
-                    else None,
+                    timestamp=(
+                        self._time
+                        if self._trading_type == TradingType.BACKTEST
+                        else None
+                    ),
                 )
 
                 orderbook.add(order)
@@ -133,9 +136,9 @@ class SyntheticExchange(Exchange):
                 instrument=instrument,
                 exchange=self._exchange,
                 id=self._id,
-                timestamp=self._time
-                if self._trading_type == TradingType.BACKTEST
-                else None,
+                timestamp=(
+                    self._time if self._trading_type == TradingType.BACKTEST else None
+                ),
             )
 
             orderbook.add(order)
@@ -4,11 +4,8 @@ import types
 from datetime import datetime
 from typing import Optional, Any, Callable, Set, TYPE_CHECKING
 
-import matplotlib.pyplot as plt  # type: ignore
-import numpy as np  # type: ignore
-import pandas as pd  # type: ignore
-
-
+# NOTE: matplotlib, numpy, and pandas are imported where used, so
+# that strategies which never chart don't pay for importing them
 if TYPE_CHECKING:
     from .portfolio import Portfolio
 
@@ -153,6 +150,8 @@ class CalculationsMixin(object):
             ax.set_ylabel("PNL")
 
     def plotUpDown(self, ax: Optional[Any] = None, **plot_kwargs: Any) -> None:
+        import numpy as np  # type: ignore
+
         self._df_pnl = self.portfolio().getPnl(self)  # type: ignore # mixin
         self._df_pnl.fillna(0.0, inplace=True)
 
@@ -180,6 +179,8 @@ class CalculationsMixin(object):
             ax.set_ylabel("Alpha")
 
     def plotUpDownAll(self, ax: Optional[Any] = None, **plot_kwargs: Any) -> None:
+        import numpy as np  # type: ignore
+
         self._df_pnl_all = self.portfolio().getPnlAll()
         self._df_pnl_all.fillna(0.0, inplace=True)
 
@@ -207,6 +208,8 @@ class CalculationsMixin(object):
             ax.set_ylabel("Alpha")
 
     def plotReturnHistograms(self, ax: Any, **plot_kwargs: Any) -> None:
+        import pandas as pd  # type: ignore
+
         self._df_notional = self.portfolio().getNotional(self)  # type: ignore # mixin
         self._df_notional.columns = [
             c.replace("n:", "") for c in self._df_notional.columns
@@ -234,6 +237,8 @@ class CalculationsMixin(object):
             )
 
     def plotReturnHistogramsAll(self, ax: Any, **plot_kwargs: Any) -> None:
+        import pandas as pd  # type: ignore
+
         self._df_notional_all = self.portfolio().getNotionalAll()
         self._df_notional_all.columns = [
             c.replace("n:", "") for c in self._df_notional_all.columns
@@ -294,6 +299,8 @@ class CalculationsMixin(object):
             ax.set_ylabel("Std.")
 
     def plotSharpe(self, ax: Any, **plot_kwargs: Any) -> None:
+        import numpy as np  # type: ignore
+
         self._df_notional = self.portfolio().getNotional(self)  # type: ignore # mixin
         self._df_notional.columns = [
             c.replace("n:", "") for c in self._df_notional.columns
@@ -319,6 +326,8 @@ class CalculationsMixin(object):
             ax.set_ylabel("Sharpe")
 
     def plotSharpeAll(self, ax: Any, **plot_kwargs: Any) -> None:
+        import numpy as np  # type: ignore
+
         self._df_notional_all = self.portfolio().getNotionalAll()
         self._df_notional_all.columns = [
             c.replace("n:", "") for c in self._df_notional_all.columns
@@ -346,6 +355,8 @@ class CalculationsMixin(object):
     def performanceByStrategy(
         self, save: bool = False, save_data: bool = False
     ) -> None:
+        import matplotlib.pyplot as plt  # type: ignore
+
         fig, axes = plt.subplots(
             8,
             1,
@@ -388,6 +399,8 @@ class CalculationsMixin(object):
             self._writeoutPerf(self.name())  # type: ignore # mixin
 
     def performanceByAsset(self, save: bool = False, save_data: bool = False) -> None:
+        import matplotlib.pyplot as plt  # type: ignore
+
         fig, axes = plt.subplots(
             8,
             1,
@@ -470,6 +483,8 @@ class CalculationsMixin(object):
 
         if len(CalculationsMixin.__perf_charts) == CalculationsMixin.__total_count:
             if CalculationsMixin.__total_count < 5 and render:
+                import matplotlib.pyplot as plt  # type: ignore
+
                 # Show plot
                 plt.show()
             elif render:
@@ -1,8 +1,8 @@
-import pandas as pd
 from typing import Optional, List, Union, TYPE_CHECKING
 from aat.core import Instrument, ExchangeType, Position
 
 if TYPE_CHECKING:
+    import pandas as pd  # type: ignore
     from aat.engine import StrategyManager
     from aat.engine.dispatch import Portfolio
 
@@ -33,7 +33,7 @@ class StrategyPortfolioMixin(object):
 
     def priceHistory(
         self, instrument: Optional[Instrument] = None
-    ) -> Union[dict, pd.DataFrame]:
+    ) -> Union[dict, "pd.DataFrame"]:
         """Get price history for asset
 
         Args:
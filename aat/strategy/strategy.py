@@ -6,7 +6,7 @@ from .portfolio import StrategyPortfolioMixin
 from .risk import StrategyRiskMixin
 from .utils import StrategyUtilsMixin
 from ..config import Side
-from ..core import Event, EventHandler, Order, Instrument
+from ..core import Event, EventBatch, EventHandler, Order, Instrument
 from ..common import id_generator
 
 
@@ -60,6 +60,24 @@ class Strategy(
         """Called whenever other data is received"""
         pass
 
+    async def onTradeBatch(self, batch: EventBatch) -> None:
+        """Called with a batch of consecutive `Trade` events when the engine is
+        configured to batch market data, in place of `onTrade`
+
+        Args:
+            batch (EventBatch): the trade events, with columnar `prices`, `volumes`, and `timestamps`
+        """
+        pass
+
+    async def onDataBatch(self, batch: EventBatch) -> None:
+        """Called with a batch of consecutive data events when the engine is
+        configured to batch market data, in place of `onData`
+
+        Args:
+            batch (EventBatch): the data events
+        """
+        pass
+
     async def onHalt(self, event: Event) -> None:
         """Called whenever an exchange `Halt` event is received, i.e. an event to stop trading"""
         pass
@@ -223,6 +241,8 @@ setattr(Strategy.onCancel, "_original", 1)
 setattr(Strategy.onChange, "_original", 1)
 setattr(Strategy.onFill, "_original", 1)
 setattr(Strategy.onData, "_original", 1)
+setattr(Strategy.onTradeBatch, "_original", 1)
+setattr(Strategy.onDataBatch, "_original", 1)
 setattr(Strategy.onHalt, "_original", 1)
 setattr(Strategy.onContinue, "_original", 1)
 setattr(Strategy.onError, "_original", 1)
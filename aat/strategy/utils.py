@@ -110,9 +110,25 @@ class StrategyUtilsMixin(object):
         """Return list of all accounts"""
         raise NotImplementedError()
 
-    async def subscribe(self, instrument: Instrument) -> None:
-        """Subscribe to market data for the given instrument"""
-        return await self._manager.subscribe(instrument=instrument, strategy=self)  # type: ignore # mixin
+    async def subscribe(
+        self, instrument: Instrument, conflate: bool = False, vwap: bool = False
+    ) -> None:
+        """Subscribe to market data for the given instrument
+
+        Args:
+            instrument (Instrument): instrument to subscribe to
+            conflate (bool): while this strategy's callbacks for the instrument are
+                             still running, collapse further OPEN/CHANGE events for
+                             each order to the latest
+            vwap (bool): when conflating, also aggregate trades into a single
+                         volume weighted print
+        """
+        return await self._manager.subscribe(
+            instrument=instrument,
+            strategy=self,  # type: ignore # mixin
+            conflate=conflate,
+            vwap=vwap,
+        )
 
     async def lookup(
         self, instrument: Optional[Instrument], exchange: Optional[ExchangeType] = None
@@ -0,0 +1,45 @@
+# type: ignore
+from datetime import datetime, timezone
+
+import numpy as np
+from aat.core import Event, EventBatch, Trade, Order, Instrument, ExchangeType
+from aat.config import EventType
+
+_INSTRUMENT = Instrument("TE.ST")
+
+
+def _trade(price, volume, timestamp):
+    order = Order(
+        volume=volume,
+        price=price,
+        side=Order.Sides.BUY,
+        exchange=ExchangeType(""),
+        instrument=_INSTRUMENT,
+        filled=volume,
+        timestamp=timestamp,
+    )
+    return Event(type=EventType.TRADE, target=Trade(volume, price, taker_order=order))
+
+
+class TestEventBatch:
+    def test_columns(self):
+        events = [
+            _trade(1.0, 2.0, datetime(2020, 1, 1, 0, 0, 1)),
+            _trade(1.5, 3.0, datetime(2020, 1, 1, 0, 0, 2, tzinfo=timezone.utc)),
+            Event(type=EventType.TRADE, target=None),
+        ]
+        batch = EventBatch(EventType.TRADE, events)
+
+        assert len(batch) == 3
+        assert list(batch) == events
+        assert batch[0] is events[0]
+        assert batch.instruments == [_INSTRUMENT, _INSTRUMENT, None]
+
+        assert np.array_equal(batch.prices, [1.0, 1.5, np.nan], equal_nan=True)
+        assert np.array_equal(batch.volumes, [2.0, 3.0, np.nan], equal_nan=True)
+        assert batch.timestamps.dtype == np.dtype("datetime64[ns]")
+        assert batch.timestamps[1] - batch.timestamps[0] == np.timedelta64(1, "s")
+        assert np.isnat(batch.timestamps[2])
+
+        # columns are cached
+        assert batch.prices is batch.prices
@@ -0,0 +1,57 @@
+from aat.core.order_book.levels import _MAX_TICKS, _SortedLevels, _TickLadder
+
+
+class TestLevels:
+    def test_sorted_levels(self):
+        levels = _SortedLevels()
+        for price in (2.0, 1.0, 3.0, 1.5):
+            assert levels.add(price)
+        assert levels.add(1.5) is False
+        assert levels == [1.0, 1.5, 2.0, 3.0]
+
+        levels.remove(1.5)
+        assert levels.popLow(1) == [1.0]
+        assert levels.popHigh(1) == [3.0]
+        assert levels == [2.0]
+
+    def test_tick_ladder(self):
+        ladder = _TickLadder(0.5, size=4)
+        for price in (5.0, 1.0, 9.5, 3.5, 7.0):
+            assert ladder.fits(price)
+            assert ladder.add(price)
+        assert ladder.add(3.5) is False
+
+        assert len(ladder) == 5
+        assert ladder == [1.0, 3.5, 5.0, 7.0, 9.5]
+        assert list(reversed(ladder)) == [9.5, 7.0, 5.0, 3.5, 1.0]
+        assert [ladder[i] for i in (0, 2, 1, 4, -2, -5)] == [
+            1.0,
+            5.0,
+            3.5,
+            9.5,
+            7.0,
+            1.0,
+        ]
+
+        ladder.remove(1.0)
+        ladder.remove(9.5)
+        assert ladder[0] == 3.5
+        assert ladder[-1] == 7.0
+
+        assert ladder.popLow(1) == [3.5]
+        assert ladder.popHigh(5) == [5.0, 7.0]
+        assert len(ladder) == 0
+        assert ladder == []
+
+        # recentered once empty
+        assert ladder.add(1000.0)
+        assert ladder == [1000.0]
+
+    def test_tick_ladder_fits(self):
+        ladder = _TickLadder(0.01)
+        assert ladder.fits(1.23)
+        assert not ladder.fits(1.234)
+
+        ladder.add(1.0)
+        assert ladder.fits(1.0 + (_MAX_TICKS - 1) * 0.01)
+        assert not ladder.fits(1.0 + _MAX_TICKS * 0.01)
@@ -1,5 +1,8 @@
-from aat.config import Side
+import numpy as np  # type: ignore
+
+from aat.config import OrderFlag, Side
 from aat.core import Instrument, OrderBook, Order
+from aat.core.order_book.levels import _SortedLevels, _TickLadder
 from .helpers import _seed
 
 _INSTRUMENT = Instrument("TE.ST")
@@ -79,6 +82,185 @@ class TestOrderBook:
             Side.SELL: [[0.0, 90.0], [5.5, 1.0], [6.0, 1.0]],
         }
 
+    def test_order_book_find_cancel_change(self):
+        ob = OrderBook(_INSTRUMENT)
+
+        orders = [
+            Order(
+                volume=1.0,
+                price=1.0 + i % 2,
+                side=Order.Sides.BUY,
+                instrument=_INSTRUMENT,
+                order_type=Order.Types.LIMIT,
+                id=str(i),
+            )
+            for i in range(10)
+        ]
+        for order in orders:
+            ob.add(order)
+
+        assert ob.find(orders[4]) is orders[4]
+        assert ob.topOfBook()[Side.BUY] == [2.0, 5.0]
+
+        ob.change(
+            Order(
+                volume=3.0,
+                price=1.0,
+                side=Order.Sides.BUY,
+                instrument=_INSTRUMENT,
+                order_type=Order.Types.LIMIT,
+                id="4",
+            )
+        )
+        assert orders[4].volume == 3.0
+        assert ob.levels(2)[Side.BUY] == [[2.0, 5.0], [1.0, 7.0]]
+
+        for order in orders[1::2]:
+            ob.cancel(order)
+
+        # emptied levels are removed
+        assert ob.find(orders[1]) is None
+        assert ob.levels(2)[Side.BUY] == [[1.0, 7.0], [0.0, 0.0]]
+        assert ob.topOfBook()[Side.BUY] == [1.0, 7.0]
+
+    def test_order_book_cancel_without_id(self):
+        ob = OrderBook(_INSTRUMENT)
+
+        orders = [
+            Order(
+                volume=volume,
+                price=1.0,
+                side=Order.Sides.SELL,
+                instrument=_INSTRUMENT,
+                order_type=Order.Types.LIMIT,
+            )
+            for volume in (1.0, 2.0, 3.0)
+        ]
+        for order in orders:
+            ob.add(order)
+
+        ob.cancel(orders[1])
+        assert ob.topOfBook()[Side.SELL] == [1.0, 4.0]
+        assert ob.find(orders[1]) is None
+        assert ob.find(orders[2]) is orders[2]
+
+        # assigned an id after resting
+        orders[2].id = "3"
+        assert ob.find(orders[2]) is orders[2]
+        ob.cancel(orders[2])
+        assert ob.topOfBook()[Side.SELL] == [1.0, 1.0]
+
+    def test_order_book_tick_ladder(self):
+        instrument = Instrument("TE.ST2", price_increment=0.5)
+        ob = OrderBook(instrument)
+        _seed(ob, instrument)
+
+        assert isinstance(ob._buy_levels, _TickLadder)
+        assert ob.topOfBook() == {Side.BUY: [5.0, 1.0], Side.SELL: [5.5, 1.0]}
+
+        data = Order(
+            volume=5.0,
+            price=4.5,
+            side=Order.Sides.SELL,
+            instrument=instrument,
+            order_type=Order.Types.LIMIT,
+        )
+        ob.add(data)
+
+        assert ob.levels(3) == {
+            Side.BUY: [[4.0, 1.0], [3.5, 1.0], [3.0, 1.0]],
+            Side.SELL: [[4.5, 3.0], [5.5, 1.0], [6.0, 1.0]],
+        }
+        assert ob._buy_levels == [0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0]
+
+        # off the ladder, falls back to sorted levels
+        data = Order(
+            volume=1.0,
+            price=4.25,
+            side=Order.Sides.BUY,
+            instrument=instrument,
+            order_type=Order.Types.LIMIT,
+        )
+        ob.add(data)
+
+        assert isinstance(ob._buy_levels, _SortedLevels)
+        assert isinstance(ob._sell_levels, _TickLadder)
+        assert ob.topOfBook() == {Side.BUY: [4.25, 1.0], Side.SELL: [4.5, 3.0]}
+
+    def test_order_book_depth(self):
+        ob = OrderBook(_INSTRUMENT)
+        _seed(ob, _INSTRUMENT)
+
+        depth = ob.depth(3)
+        assert depth.shape == (2, 3, 3)
+        assert depth[0].tolist() == [[5.0, 4.5, 4.0], [1.0, 1.0, 1.0], [1.0, 1.0, 1.0]]
+        assert depth[1].tolist() == [[5.5, 6.0, 6.5], [1.0, 1.0, 1.0], [1.0, 1.0, 1.0]]
+
+        # filled in place, past the end of the book
+        out = np.ones((2, 3, 12))
+        assert ob.depth(12, out) is out
+        assert out[0, 0, 9] == 0.5
+        assert np.isnan(out[0, 0, 10:]).all()
+        assert (out[0, 1:, 10:] == 0).all()
+        assert out[1, 0, 8] == 9.5
+        assert np.isnan(out[1, 0, 9:]).all()
+
+    def test_order_book_level_callback(self):
+        ob = OrderBook(_INSTRUMENT)
+        _seed(ob, _INSTRUMENT)
+
+        changes = []
+        ob.setLevelCallback(lambda *args: changes.append(args))
+
+        data = Order(
+            volume=5.0,
+            price=4.5,
+            side=Order.Sides.SELL,
+            instrument=_INSTRUMENT,
+            order_type=Order.Types.LIMIT,
+            id="2",
+        )
+        ob.add(data)
+
+        # crossed two levels, rested the remainder
+        assert changes == [
+            (Side.BUY, 5.0, 0.0, 0),
+            (Side.BUY, 4.5, 0.0, 0),
+            (Side.SELL, 4.5, 3.0, 1),
+        ]
+
+        changes.clear()
+        ob.change(
+            Order(
+                volume=4.0,
+                price=4.5,
+                side=Order.Sides.SELL,
+                instrument=_INSTRUMENT,
+                order_type=Order.Types.LIMIT,
+                id="2",
+            )
+        )
+        ob.cancel(data)
+        assert changes == [(Side.SELL, 4.5, 2.0, 1), (Side.SELL, 4.5, 0.0, 0)]
+
+        # a fill or kill which can't fill doesn't change any levels
+        changes.clear()
+        ob.add(
+            Order(
+                volume=5.0,
+                price=4.0,
+                side=Order.Sides.SELL,
+                instrument=_INSTRUMENT,
+                order_type=Order.Types.LIMIT,
+                flag=OrderFlag.FILL_OR_KILL,
+            )
+        )
+        assert changes == []
+
+        ob.setLevelCallback(None)
+        ob.add(data)
+        assert changes == []
+
     # def test_order_book_iter(self):
     #     ob = OrderBook(Instrument('TEST'),
     #                    ExchangeType(""))
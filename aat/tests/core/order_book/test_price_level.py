@@ -1,6 +1,22 @@
+import os
+import subprocess
+import sys
+
+import pytest  # type: ignore
+
+from aat.config import OrderFlag, OrderType, Side
+from aat.core import Instrument, Order
 from aat.core.order_book.price_level import _PriceLevel
 from aat.core.order_book.collector import _Collector
 
+_INSTRUMENT = Instrument("TE.ST")
+
+
+def _order(volume, side=Side.BUY, flag=OrderFlag.NONE, id=""):
+    return Order(
+        volume, 5.0, side, _INSTRUMENT, order_type=OrderType.LIMIT, flag=flag, id=id
+    )
+
 
 class TestOrderBook:
     def test_price_level(self):
@@ -8,6 +24,56 @@ class TestOrderBook:
         pl = _PriceLevel(5.0, _Collector())
         assert bool(pl) is False
 
+    def test_price_level_volume(self):
+        pl = _PriceLevel(5.0, _Collector())
+        orders = [_order(v, id=str(v)) for v in (1.0, 2.0, 3.0)]
+        for order in orders:
+            pl.add(order)
+        assert pl.volume == 6.0
+
+        # the resting order is updated, even if already modified
+        orders[1].volume = 4.0
+        pl.modify(orders[1])
+        assert pl.volume == 8.0
+
+        pl.remove(orders[0])
+        assert pl.volume == 7.0
+        assert len(pl) == 2
+
+        # partially fill the first order
+        taker = _order(2.0, Side.SELL)
+        assert pl.cross(taker) == (None, [])
+        assert orders[1].filled == 2.0
+        assert pl.volume == 5.0
+        assert list(pl) == [orders[1], orders[2]]
+
+    def test_price_level_revert(self):
+        pl = _PriceLevel(5.0, _Collector())
+        maker = _order(3.0, id="1")
+        maker.filled = 1.0
+        pl.add(maker)
+
+        # fills the rest of the maker, then reverts
+        taker = _order(5.0, Side.SELL, OrderFlag.FILL_OR_KILL)
+        trade, _ = pl.cross(taker)
+        assert trade is taker
+        assert pl.volume == 0.0
+
+        pl.revert()
+        assert maker.filled == 1.0
+        assert pl.volume == 2.0
+        assert list(pl) == [maker]
+
+    def test_price_level_cpp(self):
+        # the same tests, against the C++ price level
+        pytest.importorskip("aat.binding")
+        subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider"]
+            + [__file__, "-k", "not cpp"],
+            env=dict(os.environ, AAT_USE_CPP="1"),
+            check=True,
+        )
+
     # def test_price_level_iter(self):
     #     pl = _PriceLevel(5, _Collector())
     #     orders = [Order(10 + i, 5, Side.BUY, Instrument('TEST'), ExchangeType(""), 0.0, OrderType.LIMIT, OrderFlag.NONE, None) for i in range(2)]
@@ -0,0 +1,129 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytz  # type: ignore
+
+from aat import Event, Instrument, Order, Side, Strategy
+from aat.core import Clock, clock
+from aat.engine import TradingEngine
+
+from aat.tests.engine.test_sweep import _FILENAME
+
+
+class _NowStrategy(Strategy):
+    def __init__(self) -> None:
+        super().__init__()
+        self.seen = []
+
+    async def onTrade(self, event: Event) -> None:
+        order = Order(1, 1, Side.BUY, event.target.instrument)
+        self.seen.append((event.target.timestamp, self.now(), order.timestamp))
+
+
+class _SyncNowStrategy(_NowStrategy):
+    def onTrade(self, event: Event) -> None:  # type: ignore
+        # run in the engine's executor
+        order = Order(1, 1, Side.BUY, event.target.instrument)
+        self.seen.append((event.target.timestamp, self.now(), order.timestamp))
+
+
+class TestClock:
+    def test_default(self):
+        c = Clock()
+        assert abs(c.now() - datetime.now()) < timedelta(seconds=1)
+        assert c.now() is not c.now()
+        assert c.monotonic_ns() < c.monotonic_ns()
+
+    def test_live(self):
+        c = Clock()
+        c.live(pytz.timezone("America/New_York"))
+        now, ns = c.now(), c.time_ns()
+        assert now is c.now()
+        assert now.tzinfo is not None
+        assert now == datetime.fromtimestamp(ns // 1000 / 1e6, tz=pytz.utc)
+        assert c.monotonic_ns() == c.monotonic_ns()
+
+        time.sleep(0.01)
+        c.tick()
+        assert c.now() > now
+        assert c.time_ns() > ns
+
+        c.reset()
+        assert c.now().tzinfo is None
+
+    def test_simulate(self):
+        c = Clock()
+        when = datetime(2020, 1, 1)
+        c.simulate(when)
+        assert c.now() is when
+
+        c.reset()
+        assert c.now() > when
+
+    def test_backtest(self):
+        engine = TradingEngine(
+            general={"verbose": 0, "trading_type": "backtest"},
+            exchange={"exchanges": [["aat.exchange.generic:CSV", _FILENAME]]},
+            strategy={"strategies": ["aat.tests.core.test_clock:_NowStrategy"]},
+        )
+        engine.start()
+
+        # the time of the data being replayed
+        seen = engine.strategies[0].seen
+        assert len(seen) == 64
+        assert all(when == now and now is timestamp for when, now, timestamp in seen)
+
+        # the engine keeps the time of the last event once done, but its
+        # clock is its own
+        assert engine.now() == seen[-1][0]
+        assert Order(1, 1, Side.BUY, Instrument("TE.ST")).timestamp > datetime(
+            2021, 1, 1
+        )
+        assert clock.now().year > 2020
+
+    def test_backtest_executor(self):
+        engine = TradingEngine(
+            general={
+                "verbose": 0,
+                "trading_type": "backtest",
+                "inline_callbacks": 0,
+            },
+            exchange={"exchanges": [["aat.exchange.generic:CSV", _FILENAME]]},
+            strategy={"strategies": ["aat.tests.core.test_clock:_SyncNowStrategy"]},
+        )
+        engine.start()
+
+        # handlers in the executor see the engine's clock too
+        # (which the engine doesn't wait for, so may not all have run)
+        seen = engine.strategies[0].seen
+        assert seen
+        assert all(
+            now < datetime(2021, 1, 1) and timestamp < datetime(2021, 1, 1)
+            for _, now, timestamp in seen
+        )
+
+    def test_concurrent_backtests(self):
+        engines = [
+            TradingEngine(
+                general={
+                    "verbose": 0,
+                    "trading_type": "backtest",
+                    "start_date": start_date,
+                },
+                exchange={"exchanges": [["aat.exchange.generic:CSV", _FILENAME]]},
+                strategy={"strategies": ["aat.tests.core.test_clock:_NowStrategy"]},
+            )
+            for start_date in (None, "2020-08-01")
+        ]
+        asyncio.get_event_loop().run_until_complete(
+            asyncio.gather(*(engine.run() for engine in engines))
+        )
+
+        # interleaved, each engine still hands out the time of its own data
+        first, second = (engine.strategies[0].seen for engine in engines)
+        assert len(first) == 64
+        assert 0 < len(second) < 64
+        for seen in (first, second):
+            assert all(when == now == timestamp for when, now, timestamp in seen)
+        assert [engine.now() for engine in engines] == [first[-1][0], second[-1][0]]
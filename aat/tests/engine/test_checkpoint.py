@@ -0,0 +1,98 @@
+import time
+
+import pytest  # type: ignore
+
+from aat import parseConfig
+from aat.engine import EngineCheckpoint, TradingEngine
+
+from aat.tests.engine.test_sweep import _FILENAME, _STRATEGY
+
+
+def _engine(path, strategy=(_STRATEGY, "5"), **general):
+    return TradingEngine(
+        general=dict(general, verbose=0, trading_type="backtest", checkpoint=str(path)),
+        exchange={"exchanges": [["aat.exchange.generic:CSV", _FILENAME]]},
+        strategy={"strategies": [list(strategy)]},
+    )
+
+
+class TestEngineCheckpoint:
+    def test_restore(self, tmp_path):
+        path = tmp_path / "engine.ckpt"
+
+        # saved on exit
+        engine = _engine(path)
+        engine.start()
+        assert path.exists()
+
+        strategy = engine.strategies[0]
+        trades = engine.manager.trades(strategy)
+        position = engine.manager.positions(strategy)[0]
+        assert len(trades) == 2
+
+        restored = _engine(path, restore=1)
+        restored_strategy = restored.strategies[0]
+        restored_trades = restored.manager.trades(restored_strategy)
+        assert [(t.side, t.price, t.volume) for t in restored_trades] == [
+            (t.side, t.price, t.volume) for t in trades
+        ]
+
+        restored_position = restored.manager.positions(restored_strategy)[0]
+        assert restored_position.pnl == position.pnl
+        assert restored.order_manager._past_orders.keys() == (
+            engine.order_manager._past_orders.keys()
+        )
+        assert all(
+            s is restored_strategy
+            for _, s in restored.order_manager._past_orders.values()
+        )
+
+        # the strategy already traded, so doesn't again
+        restored.start()
+        assert len(restored.manager.trades(restored_strategy)) == 2
+        assert restored.manager.positions(restored_strategy)[0].pnl == position.pnl
+
+    def test_no_restore(self, tmp_path):
+        path = tmp_path / "engine.ckpt"
+        _engine(path).start()
+
+        engine = _engine(path)
+        assert engine.manager.trades(engine.strategies[0]) == []
+
+    def test_strategy_mismatch(self, tmp_path):
+        path = tmp_path / "engine.ckpt"
+        _engine(path).start()
+
+        with pytest.raises(Exception, match="Checkpoint is for strategies"):
+            _engine(
+                path,
+                strategy=("aat.strategy.sample.readonly:ReadOnlyStrategy",),
+                restore=1,
+            )
+
+    def test_interval(self, tmp_path):
+        path = tmp_path / "engine.ckpt"
+        checkpoint = EngineCheckpoint(_engine(path), str(path), 0.05)
+
+        # nothing changed
+        time.sleep(0.05)
+        checkpoint.heartbeat()
+        assert not path.exists()
+
+        # too soon
+        checkpoint.save()
+        modified = path.stat().st_mtime_ns
+        checkpoint.changed()
+        checkpoint.heartbeat()
+        assert path.stat().st_mtime_ns == modified
+
+        time.sleep(0.05)
+        checkpoint.heartbeat()
+        assert path.stat().st_mtime_ns != modified
+
+    def test_parse_config(self):
+        config = parseConfig(
+            ["--checkpoint", "engine.ckpt", "--restore", "--exchanges", "a:B"]
+        )
+        assert config["general"]["checkpoint"] == "engine.ckpt"
+        assert config["general"]["restore"] is True
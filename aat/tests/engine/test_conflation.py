@@ -0,0 +1,124 @@
+import asyncio
+from typing import Any
+
+from aat import Strategy, Event, Instrument, Order, Trade, Side
+from aat.config import EventType
+from aat.engine.dispatch import vwap
+
+from aat.tests.engine.test_engine import _engine
+
+
+class SlowStrategy(Strategy):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super(SlowStrategy, self).__init__(*args, **kwargs)
+        self.events: list = []
+        self.release = asyncio.Event()
+
+    async def _record(self, event: Event) -> None:
+        self.events.append(event)
+        await self.release.wait()
+
+    async def onTrade(self, event: Event) -> None:
+        await self._record(event)
+
+    async def onOpen(self, event: Event) -> None:
+        await self._record(event)
+
+    async def onChange(self, event: Event) -> None:
+        await self._record(event)
+
+    async def onCancel(self, event: Event) -> None:
+        await self._record(event)
+
+
+def _order(engine, instrument, id, price=1.0, volume=1.0, filled=0.0):
+    return Order(
+        volume,
+        price,
+        Side.BUY,
+        instrument,
+        engine.exchanges[0].exchange(),
+        id=id,
+        filled=filled,
+    )
+
+
+class TestConflation:
+    def _setup(self, **kwargs):
+        engine = _engine(strategy="aat.tests.engine.test_conflation:SlowStrategy")
+        strategy = engine.strategies[0]
+        instrument = Instrument("CO.NF", exchange=engine.exchanges[0].exchange())
+
+        engine.event_loop.run_until_complete(
+            engine.manager.subscribe(instrument, strategy, **kwargs)
+        )
+        return engine, strategy, instrument
+
+    def _run(self, engine, strategy, events):
+        async def _process():
+            for event in events:
+                await engine.processEvent(event)
+            await asyncio.sleep(0)
+            strategy.release.set()
+            await asyncio.sleep(0)
+            await asyncio.gather(*engine._futures)
+
+        engine.event_loop.run_until_complete(_process())
+
+    def test_conflate(self):
+        engine, strategy, instrument = self._setup(conflate=True)
+
+        events = [
+            Event(EventType.OPEN, _order(engine, instrument, 1)),
+            Event(EventType.CHANGE, _order(engine, instrument, 1, price=2)),
+            Event(EventType.CHANGE, _order(engine, instrument, 2, price=3)),
+            Event(EventType.CHANGE, _order(engine, instrument, 1, price=4)),
+            Event(EventType.CANCEL, _order(engine, instrument, 2)),
+        ]
+        self._run(engine, strategy, events)
+
+        # first dispatched immediately, rest held while busy
+        assert [(e.type, e.target.id, e.target.price) for e in strategy.events] == [
+            (EventType.OPEN, 1, 1.0),
+            (EventType.CHANGE, 1, 4.0),
+            (EventType.CHANGE, 2, 3.0),
+            (EventType.CANCEL, 2, 1.0),
+        ]
+        assert engine.manager.conflator(strategy, instrument).pending() == 0
+
+    def test_conflate_vwap(self):
+        engine, strategy, instrument = self._setup(vwap=True)
+
+        def _trade(price, volume):
+            order = _order(engine, instrument, 0, price, volume, filled=volume)
+            return Event(EventType.TRADE, Trade(volume, price, taker_order=order))
+
+        self._run(engine, strategy, [_trade(1, 1), _trade(2, 1), _trade(5, 3)])
+
+        assert len(strategy.events) == 2
+        aggregated = strategy.events[1].target
+        assert aggregated.volume == 4
+        assert aggregated.price == 4.25
+
+    def test_vwap_no_volume(self):
+        engine, _, instrument = self._setup()
+
+        def _trade(price, volume):
+            order = _order(engine, instrument, 0, price, volume, filled=volume)
+            return Trade(volume, price, taker_order=order)
+
+        # rounds to no volume, so nothing to weight by
+        later = _trade(2, 1e-9)
+        assert vwap(_trade(1, 1e-9), later) is later
+        assert vwap(_trade(1, 1), _trade(3, 1)).price == 2
+
+    def test_no_conflation(self):
+        engine, strategy, instrument = self._setup()
+        assert engine.manager.conflator(strategy, instrument) is None
+
+        events = [
+            Event(EventType.CHANGE, _order(engine, instrument, 1, price=p))
+            for p in (1, 2, 3)
+        ]
+        self._run(engine, strategy, events)
+        assert len(strategy.events) == 3
@@ -0,0 +1,465 @@
+import asyncio
+import random
+from datetime import datetime, timedelta
+from typing import Any
+
+import numpy as np  # type: ignore
+import pytest  # type: ignore
+
+from aat import (
+    Strategy,
+    Event,
+    EventBatch,
+    Instrument,
+    Order,
+    Trade,
+    Side,
+    runInExecutor,
+)
+from aat.config import EventType, TradingType
+from aat.engine import BacktestEngine, TradingEngine
+from aat.engine.backtest import _MAX_SPINS
+
+from .test_sweep import _FILENAME
+
+
+class SyncStrategy(Strategy):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super(SyncStrategy, self).__init__(*args, **kwargs)
+        self.trades = 0
+        self.exits = 0
+
+    def onTrade(self, event: Event) -> None:
+        self.trades += 1
+
+    @runInExecutor
+    def onExit(self, event: Event) -> None:
+        self.exits += 1
+
+
+class RaisingStrategy(SyncStrategy):
+    def onTrade(self, event: Event) -> None:
+        raise ValueError("bug in strategy")
+
+
+class AsyncRaisingStrategy(SyncStrategy):
+    async def onTrade(self, event: Event) -> None:  # type: ignore
+        self.trades += 1
+        raise ValueError("bug in strategy")
+
+
+class TaskStrategy(SyncStrategy):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super(TaskStrategy, self).__init__(*args, **kwargs)
+        self.tasks: list = []
+        self.done = 0
+
+    async def onTrade(self, event: Event) -> None:  # type: ignore
+        self.trades += 1
+        self.tasks.append(asyncio.current_task())
+        async with asyncio.timeout(1):
+            # busy, then blocked on a future of the event loop
+            for _ in range(_MAX_SPINS + 1):
+                await asyncio.sleep(0)
+            await asyncio.sleep(0.001)
+        self.done += 1
+
+
+class BatchStrategy(SyncStrategy):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super(BatchStrategy, self).__init__(*args, **kwargs)
+        self.batches: list = []
+
+    def onTradeBatch(self, batch: EventBatch) -> None:
+        self.batches.append(batch)
+
+
+class OrderStrategy(SyncStrategy):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super(OrderStrategy, self).__init__(*args, **kwargs)
+        self.bought = 0
+        self.order_events: list = []
+
+    def onBought(self, event: Event) -> None:
+        self.bought += 1
+        self.order_events.append("fill")
+
+    def onReceived(self, event: Event) -> None:
+        self.order_events.append("ack")
+
+
+def _engine(
+    engine: type = TradingEngine, strategy: str = "SyncStrategy", **general: Any
+) -> TradingEngine:
+    general.update({"verbose": 0, "trading_type": "backtest"})
+    return engine(
+        general=general,
+        exchange={"exchanges": [["aat.exchange:SyntheticExchange", "1", "10"]]},
+        strategy={
+            "strategies": [
+                (
+                    strategy
+                    if ":" in strategy
+                    else "aat.tests.engine.test_engine:" + strategy
+                )
+            ]
+        },
+    )
+
+
+def _trade(engine: TradingEngine, name: str, **kwargs: Any) -> Event:
+    instrument = Instrument(name, exchange=engine.exchanges[0].exchange())
+    order = Order(
+        1, 1, Side.BUY, instrument, engine.exchanges[0].exchange(), filled=1, **kwargs
+    )
+    return Event(type=EventType.TRADE, target=Trade(1, 1, taker_order=order))
+
+
+def _handlers(engine: TradingEngine, event_type: EventType) -> dict:
+    return {h: i for _, h, i in engine._handler_subscriptions[event_type]}
+
+
+class TestEngineCallbacks:
+    def test_sync_callbacks_inline(self):
+        engine = _engine()
+        strategy = engine.strategies[0]
+
+        assert _handlers(engine, EventType.TRADE)[strategy] is True
+
+        # inline callback runs immediately, no future created for it
+        futures = engine.event_loop.run_until_complete(
+            engine.processEvent(_trade(engine, "TE.ST"))
+        )
+        assert len(futures) == 1  # manager
+        assert strategy.trades == 1
+        engine.event_loop.run_until_complete(asyncio.gather(*futures))
+
+        # executor callback is opt-in via decorator
+        assert _handlers(engine, EventType.EXIT)[strategy] is False
+
+    def test_sync_callback_raises(self):
+        engine = TradingEngine(
+            general={"verbose": 0, "trading_type": "backtest"},
+            exchange={"exchanges": [["aat.exchange:SyntheticExchange", "1", "10"]]},
+            strategy={
+                "strategies": [
+                    "aat.tests.engine.test_engine:RaisingStrategy",
+                    "aat.tests.engine.test_engine:SyncStrategy",
+                ]
+            },
+        )
+        other = engine.strategies[1]
+
+        # the other strategies' handlers still run...
+        futures = engine.event_loop.run_until_complete(
+            engine.processEvent(_trade(engine, "TE.ST"))
+        )
+        assert other.trades == 1
+
+        # ...and the error surfaces as a failed callback future would
+        engine._futures.extend(futures)
+        engine.event_loop.run_until_complete(
+            asyncio.gather(*futures, return_exceptions=True)
+        )
+        with pytest.raises(ValueError):
+            engine._futures.raiseErrors()
+
+    def test_sync_callbacks_executor(self):
+        engine = _engine(inline_callbacks=0)
+        strategy = engine.strategies[0]
+
+        assert _handlers(engine, EventType.TRADE)[strategy] is False
+
+        futures = engine.event_loop.run_until_complete(
+            engine.processEvent(_trade(engine, "TE.ST"))
+        )
+        assert len(futures) == 2
+        engine.event_loop.run_until_complete(asyncio.gather(*futures))
+        assert strategy.trades == 1
+
+
+class TestEngineDataRoutes:
+    def test_routes_follow_subscriptions(self):
+        engine = _engine()
+        strategy = engine.strategies[0]
+        subscribed = _trade(engine, "SU.B")
+        other = _trade(engine, "OT.HER")
+
+        # no subscriptions, receives everything
+        route = engine._dataRoute(subscribed)
+        assert strategy in [h for _, h, _ in route]
+        assert engine._dataRoute(subscribed) is route
+
+        engine.event_loop.run_until_complete(
+            engine.manager.subscribe(subscribed.target.instrument, strategy)
+        )
+
+        # routing table rebuilt after subscribe
+        assert strategy in [h for _, h, _ in engine._dataRoute(subscribed)]
+        assert strategy not in [h for _, h, _ in engine._dataRoute(other)]
+
+        # manager always receives market data
+        assert engine.manager in [h for _, h, _ in engine._dataRoute(other)]
+
+        engine.event_loop.run_until_complete(engine.processEvent(other))
+        assert strategy.trades == 0
+        engine.event_loop.run_until_complete(engine.processEvent(subscribed))
+        assert strategy.trades == 1
+
+
+class TestBacktestEngine:
+    def test_backtest_engine(self):
+        random.seed(0)
+        np.random.seed(0)
+        engine = _engine(BacktestEngine)
+        strategy = engine.strategies[0]
+        engine.start()
+
+        assert strategy.trades > 0
+        assert strategy.exits == 1
+
+    def test_backtest_engine_matches_trading_engine(self):
+        trades = []
+        for cls in (TradingEngine, BacktestEngine):
+            random.seed(0)
+            np.random.seed(0)
+            engine = _engine(cls)
+            engine.start()
+            trades.append(engine.strategies[0].trades)
+        assert trades[0] == trades[1]
+
+    @pytest.mark.skipif(not hasattr(asyncio, "timeout"), reason="Python 3.11+")
+    def test_backtest_engine_tasks(self):
+        engine = BacktestEngine(
+            general={"verbose": 0, "trading_type": "backtest"},
+            exchange={"exchanges": [["aat.exchange.generic:CSV", _FILENAME]]},
+            strategy={"strategies": ["aat.tests.engine.test_engine:TaskStrategy"]},
+        )
+        strategy = engine.strategies[0]
+        engine.start()
+
+        # each callback ran to completion in its own task
+        assert strategy.trades == 64
+        assert strategy.done == strategy.trades
+        assert None not in strategy.tasks
+        assert len(set(strategy.tasks)) == strategy.trades
+
+    def test_backtest_engine_raises(self):
+        random.seed(0)
+        np.random.seed(0)
+        engine = _engine(BacktestEngine, strategy="AsyncRaisingStrategy")
+        strategy = engine.strategies[0]
+
+        # surfaced with the event which raised, before the next is dispatched
+        with pytest.raises(ValueError):
+            engine.start()
+        assert strategy.trades == 1
+
+    def test_backtest_engine_offline_only(self):
+        with pytest.raises(Exception, match="Invalid trading type"):
+            BacktestEngine(
+                general={"verbose": 0, "trading_type": "sandbox"},
+                exchange={"exchanges": [["aat.exchange:SyntheticExchange", "1", "10"]]},
+                strategy={"strategies": []},
+            )
+
+
+class TestEngineOrderedMerge:
+    def test_ordered_merge(self):
+        engine = _engine()
+
+        async def _tick(*seconds):
+            for second in seconds:
+                yield _trade(
+                    engine, "TE.ST", timestamp=datetime(2020, 1, 1, 0, 0, second)
+                )
+            yield Event(type=EventType.EXIT, target=None)
+
+        async def _collect():
+            return [
+                event
+                async for event in engine._ordered(
+                    [_tick(1, 4, 5), _tick(2, 3, 6), _tick()]
+                )
+            ]
+
+        events = engine.event_loop.run_until_complete(_collect())
+        assert [e.target.timestamp.second for e in events[:-1]] == [1, 2, 3, 4, 5, 6]
+        assert events[-1].type == EventType.EXIT
+
+    def test_replay_window(self):
+        engine = _engine(
+            start_date="2020-01-01T00:00:02", end_date=datetime(2020, 1, 1, 0, 0, 5)
+        )
+
+        async def _tick(*seconds):
+            for second in seconds:
+                yield _trade(
+                    engine, "TE.ST", timestamp=datetime(2020, 1, 1, 0, 0, second)
+                )
+
+        async def _collect():
+            return [
+                event
+                async for event in engine._ordered([_tick(1, 4, 5), _tick(2, 3, 6)])
+            ]
+
+        events = engine.event_loop.run_until_complete(_collect())
+        assert [e.target.timestamp.second for e in events[:-1]] == [2, 3, 4]
+        assert events[-1].type == EventType.EXIT
+
+
+class TestEnginePriority:
+    def test_drain_targeted(self):
+        engine = _engine(strategy="OrderStrategy", max_priority_events=3)
+        strategy = engine.strategies[0]
+
+        async def _drain():
+            engine._queued_targeted_events = asyncio.Queue()
+            engine._targeted_pending = asyncio.Event()
+            for _ in range(5):
+                trade = _trade(engine, "TE.ST").target
+                bought = Event(type=EventType.BOUGHT, target=trade)
+                engine._queued_targeted_events.put_nowait((bought, strategy))
+
+            # bounded, so market data isn't starved
+            await engine._drainTargeted()
+            assert strategy.bought == 3
+            await engine._drainTargeted()
+            assert strategy.bought == 5
+
+        engine.event_loop.run_until_complete(_drain())
+        assert engine._queued_targeted_events.empty()
+
+    def test_targeted_order(self):
+        engine = _engine(strategy="OrderStrategy")
+        strategy = engine.strategies[0]
+
+        async def _run():
+            engine._queued_targeted_events = asyncio.Queue()
+            engine._targeted_pending = asyncio.Event()
+            wake = engine._wake_queued_targeted_events()
+
+            trade = _trade(engine, "TE.ST").target
+            received = Event(type=EventType.RECEIVED, target=trade.taker_order)
+            await engine.pushTargetedEvent(strategy, received)
+
+            # the main event loop is woken, but the ack is left queued...
+            await wake.__anext__()
+            assert engine._queued_targeted_events.qsize() == 1
+
+            # ...so a fill queued before it drains is still delivered after
+            bought = Event(type=EventType.BOUGHT, target=trade)
+            await engine.pushTargetedEvent(strategy, bought)
+            await engine._drainTargeted()
+
+        engine.event_loop.run_until_complete(_run())
+        assert strategy.order_events == ["ack", "fill"]
+
+
+class TestEngineBatches:
+    def _run(self, engine, *events):
+        async def _process():
+            futures = []
+            for event in events:
+                futures.extend(await engine.processEvent(event))
+            await asyncio.gather(*futures)
+
+        engine.event_loop.run_until_complete(_process())
+
+    def test_batches(self):
+        engine = _engine(strategy="BatchStrategy", batch_size=3, batch_latency=60)
+        strategy = engine.strategies[0]
+        heartbeat = Event(type=EventType.HEARTBEAT, target=None)
+
+        self._run(engine, *(_trade(engine, "TE.ST") for _ in range(4)), heartbeat)
+
+        # first batch delivered at size, per-event callback replaced
+        assert [len(b) for b in strategy.batches] == [3]
+        assert strategy.trades == 0
+
+        # different event type flushes the pending batch
+        self._run(engine, Event(type=EventType.EXIT, target=None))
+        assert [len(b) for b in strategy.batches] == [3, 1]
+        assert strategy.batches[0].prices.tolist() == [1.0, 1.0, 1.0]
+
+    def test_batch_latency(self):
+        engine = _engine(strategy="BatchStrategy", batch_size=100, batch_latency=0)
+        strategy = engine.strategies[0]
+
+        # live, budgets are measured by the wall clock
+        engine.trading_type = TradingType.SANDBOX
+
+        self._run(engine, _trade(engine, "TE.ST"), _trade(engine, "TE.ST"))
+        assert [len(b) for b in strategy.batches][:1] == [1]
+
+        # the second, once its (empty) budget is spent
+        engine.event_loop.run_until_complete(asyncio.sleep(0.01))
+        assert [len(b) for b in strategy.batches] == [1, 1]
+
+    def test_batch_latency_quiet(self):
+        engine = _engine(strategy="BatchStrategy", batch_size=100, batch_latency=0.01)
+        strategy = engine.strategies[0]
+        engine.trading_type = TradingType.SANDBOX
+
+        async def _quiet():
+            engine._futures.extend(await engine.processEvent(_trade(engine, "TE.ST")))
+
+            # nothing else arrives, the batch is delivered on its budget
+            await asyncio.sleep(0.1)
+            await asyncio.gather(*engine._futures)
+
+        engine.event_loop.run_until_complete(_quiet())
+        assert [len(b) for b in strategy.batches] == [1]
+        assert engine._batch_timer is None
+
+    def test_batch_latency_offline(self):
+        start = datetime(2020, 1, 1)
+        offsets = (0, 0.02, 0.06, 0.07, 0.2)
+
+        def _batches(pause):
+            engine = _engine(
+                strategy="BatchStrategy", batch_size=100, batch_latency=0.05
+            )
+
+            async def _process():
+                futures = []
+                for offset in offsets:
+                    event = _trade(
+                        engine, "TE.ST", timestamp=start + timedelta(seconds=offset)
+                    )
+                    futures.extend(await engine.processEvent(event))
+                    await asyncio.sleep(pause)
+                exit = Event(type=EventType.EXIT, target=None)
+                futures.extend(await engine.processEvent(exit))
+                await asyncio.gather(*futures)
+
+            engine.event_loop.run_until_complete(_process())
+            return [len(b) for b in engine.strategies[0].batches]
+
+        # offline, budgets are measured by the events' timestamps, so
+        # batches don't depend on how fast the backtest runs
+        assert _batches(0) == _batches(0.06) == [2, 2, 1]
+
+    def test_batches_disabled(self):
+        engine = _engine(strategy="BatchStrategy")
+        strategy = engine.strategies[0]
+
+        # falls back to per-event callbacks
+        self._run(engine, _trade(engine, "TE.ST"), _trade(engine, "TE.ST"))
+        assert strategy.batches == []
+        assert strategy.trades == 2
+
+    def test_batch_subscriptions(self):
+        engine = _engine(strategy="BatchStrategy", batch_size=3)
+        strategy = engine.strategies[0]
+        subscribed = _trade(engine, "SU.B")
+
+        engine.event_loop.run_until_complete(
+            engine.manager.subscribe(subscribed.target.instrument, strategy)
+        )
+        self._run(engine, subscribed, _trade(engine, "OT.HER"), subscribed)
+        assert len(strategy.batches) == 1
+        assert [e.target.instrument for e in strategy.batches[0]] == [
+            subscribed.target.instrument
+        ] * 2
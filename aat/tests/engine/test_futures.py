@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest  # type: ignore
+
+from aat.engine.futures import FutureTracker
+
+
+class TestFutureTracker:
+    def test_reaping(self):
+        loop = asyncio.new_event_loop()
+
+        async def ok():
+            return 1
+
+        async def fail():
+            raise ValueError()
+
+        async def block(event):
+            await event.wait()
+
+        async def _run():
+            tracker = FutureTracker()
+            event = asyncio.Event()
+            tracker.extend(asyncio.ensure_future(c) for c in (ok(), block(event)))
+            assert len(tracker) == 2
+
+            # done futures remove themselves
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            assert len(tracker) == 1
+            tracker.raiseErrors()
+
+            # failures surface on raiseErrors
+            tracker.append(asyncio.ensure_future(fail()))
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            with pytest.raises(ValueError):
+                tracker.raiseErrors()
+            tracker.raiseErrors()
+
+            # cancellation too
+            blocked = next(iter(tracker))
+            blocked.cancel()
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            assert len(tracker) == 0
+            with pytest.raises(asyncio.CancelledError):
+                tracker.raiseErrors()
+
+        loop.run_until_complete(_run())
+        loop.close()
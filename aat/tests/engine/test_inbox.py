@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest  # type: ignore
+
+from aat import Event, Instrument, Trade
+from aat.config import EventType
+from aat.engine.inbox import StrategyInbox
+
+from aat.tests.engine.test_conflation import _order
+from aat.tests.engine.test_engine import _engine
+
+
+class TestStrategyInbox:
+    def _setup(self, maxsize, policy):
+        engine = _engine()
+        instrument = Instrument("IN.BOX", exchange=engine.exchanges[0].exchange())
+        return engine, StrategyInbox(engine, maxsize, policy), instrument
+
+    def _run(self, engine, inbox, callback, events, droppable=True):
+        async def _process():
+            for event in events:
+                await inbox.put(callback, event, False, droppable=droppable)
+            await inbox.join()
+
+        engine.event_loop.run_until_complete(_process())
+
+    def _trade(self, engine, instrument, price):
+        order = _order(engine, instrument, None, price=price, filled=1.0)
+        return Event(EventType.TRADE, Trade(1.0, price, taker_order=order))
+
+    def test_in_order(self):
+        engine, inbox, instrument = self._setup(2, "block")
+        seen = []
+        running = []
+
+        async def _callback(event):
+            running.append(event)
+            assert len(running) == 1
+            await asyncio.sleep(0)
+            seen.append(event.target.price)
+            running.pop()
+
+        events = [self._trade(engine, instrument, p) for p in range(1, 6)]
+        self._run(engine, inbox, _callback, events)
+
+        # blocked rather than dropped, and run one at a time
+        assert seen == [1, 2, 3, 4, 5]
+        assert inbox.json()["processed"] == 5
+        assert inbox.json()["high_water"] == 2
+        assert inbox.dropped == 0
+
+    def test_drop_oldest(self):
+        engine, inbox, instrument = self._setup(2, "drop-oldest")
+        seen = []
+
+        async def _callback(event):
+            seen.append(event.target.price)
+
+        events = [self._trade(engine, instrument, p) for p in range(1, 6)]
+        self._run(engine, inbox, _callback, events)
+        assert seen == [4, 5]
+        assert inbox.dropped == 3
+
+    def test_drop_oldest_order_entry(self):
+        engine, inbox, instrument = self._setup(1, "drop-oldest")
+        seen = []
+
+        async def _callback(event):
+            seen.append(event.target.price)
+
+        # order entry events are never dropped
+        events = [self._trade(engine, instrument, p) for p in range(1, 4)]
+        self._run(engine, inbox, _callback, events, droppable=False)
+        assert seen == [1, 2, 3]
+        assert inbox.dropped == 0
+
+    def test_conflate(self):
+        engine, inbox, instrument = self._setup(10, "conflate")
+        seen = []
+
+        async def _callback(event):
+            seen.append((event.type, event.target.id, event.target.price))
+
+        events = [
+            Event(EventType.OPEN, _order(engine, instrument, 1)),
+            Event(EventType.CHANGE, _order(engine, instrument, 1, price=2)),
+            Event(EventType.CHANGE, _order(engine, instrument, 2, price=3)),
+            Event(EventType.CHANGE, _order(engine, instrument, 1, price=4)),
+            self._trade(engine, instrument, 1),
+            self._trade(engine, instrument, 3),
+        ]
+        self._run(engine, inbox, _callback, events)
+
+        assert [s[:2] for s in seen] == [
+            (EventType.OPEN, 1),
+            (EventType.CHANGE, 1),
+            (EventType.CHANGE, 2),
+            (EventType.TRADE, seen[-1][1]),
+        ]
+        # latest state of the order, and a volume weighted trade
+        assert seen[1][2] == 4
+        assert seen[3][2] == 2
+        assert inbox.conflated == 2
+
+    def test_invalid_policy(self):
+        with pytest.raises(Exception):
+            StrategyInbox(_engine(), 1, "unknown")
+
+
+class TestEngineInbox:
+    def test_slow_strategy(self):
+        engine = _engine(
+            strategy="aat.tests.engine.test_conflation:SlowStrategy",
+            inbox_size=2,
+            inbox_policy="drop-oldest",
+        )
+        strategy = engine.strategies[0]
+        inbox = engine.inbox(strategy)
+        instrument = Instrument("SL.OW", exchange=engine.exchanges[0].exchange())
+
+        async def _process():
+            for id in range(1, 6):
+                event = Event(EventType.OPEN, _order(engine, instrument, id))
+                await engine.processEvent(event)
+                if id == 1:
+                    # worker picks up the first
+                    await asyncio.sleep(0)
+
+            await asyncio.sleep(0)
+            assert len(inbox) == 2
+            strategy.release.set()
+            await inbox.join()
+
+        engine.event_loop.run_until_complete(_process())
+
+        assert [e.target.id for e in strategy.events] == [1, 4, 5]
+        assert inbox.dropped == 2
+
+    def test_backtest_engine(self):
+        from aat.engine import BacktestEngine
+
+        engine = _engine(engine=BacktestEngine, inbox_size=2)
+        assert engine.inbox(engine.strategies[0]) is None
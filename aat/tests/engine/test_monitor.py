@@ -0,0 +1,60 @@
+import asyncio
+import time
+
+from aat.engine import EngineMonitor
+from aat.tests.engine.test_engine import _engine
+
+
+class TestEngineMonitor:
+    def test_thresholds(self):
+        monitor = EngineMonitor(max_lag=0.5, max_queued=10, max_futures=10)
+        snapshots = []
+        monitor.addCallback(snapshots.append)
+
+        monitor.expectHeartbeat(time.monotonic())
+        assert monitor.heartbeat(1, 1, 1) == []
+        assert snapshots == []
+
+        # heartbeat processed a second late, with a backlog
+        monitor.expectHeartbeat(time.monotonic() - 1)
+        monitor.heartbeat(10, 1, 1)
+        assert len(snapshots) == 1
+        assert snapshots[0]["breached"] == ["lag", "queued"]
+        assert snapshots[0]["lag"] >= 1
+        assert snapshots[0]["queued_events"] == 10
+
+        # still behind, not notified again
+        monitor.heartbeat(10, 1, 1)
+        assert len(snapshots) == 1
+
+        # newly breached
+        monitor.heartbeat(10, 1, 11)
+        assert len(snapshots) == 2
+
+        # recovered
+        monitor.expectHeartbeat(time.monotonic())
+        monitor.heartbeat(0, 0, 0)
+        assert len(snapshots) == 3
+        assert snapshots[-1]["breached"] == []
+        assert monitor.snapshot()["max_lag"] >= 1
+
+    def test_async_callback(self):
+        monitor = EngineMonitor(max_futures=0)
+        snapshots = []
+
+        async def callback(snapshot):
+            snapshots.append(snapshot)
+
+        monitor.addCallback(callback)
+
+        async def _run():
+            await asyncio.gather(*monitor.heartbeat(0, 0, 1))
+
+        asyncio.get_event_loop().run_until_complete(_run())
+        assert snapshots[0]["breached"] == ["futures"]
+
+    def test_engine_monitor(self):
+        engine = _engine(max_lag=2, max_queued=5, max_futures=6)
+        assert engine.monitor().max_lag == 2.0
+        assert engine.monitor().max_queued == 5
+        assert engine.monitor().max_futures == 6
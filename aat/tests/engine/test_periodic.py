@@ -1,5 +1,6 @@
 import asyncio
-from datetime import datetime
+import itertools
+from datetime import datetime, timedelta
 from typing import Optional, Union, List
 
 from aat.engine.dispatch import Periodic
@@ -11,17 +12,31 @@ class TestMixin(PeriodicManagerMixin):
         if isinstance(periodic, Periodic):
             periodic = [periodic]
         self._periodics = periodic
+        self._periodic_schedule = []
+        self._periodic_scheduled = 0
+        self._periodic_counter = itertools.count()
 
 
 class TestPeriodic:
     def create_periodic_mixin(
-        self, second: Optional[int], minute: Optional[int], hour: Optional[int]
+        self,
+        second: Optional[int],
+        minute: Optional[int],
+        hour: Optional[int],
+        last: Optional[datetime] = None,
+        interval: bool = False,
     ):
         async def noop():
             pass
 
         return Periodic(
-            asyncio.get_event_loop(), datetime.now(), noop, second, minute, hour
+            asyncio.get_event_loop(),
+            last or datetime.now(),
+            noop,
+            second,
+            minute,
+            hour,
+            interval,
         )
 
     def test_secondly_periodic(self):
@@ -36,6 +51,102 @@ class TestPeriodic:
         periodic = TestMixin(self.create_periodic_mixin(10, 2, None))
         assert periodic.periodicIntervals() == 3600
 
+    def test_next_expiry(self):
+        last = datetime(2020, 1, 1, 10, 30, 15, 500)
+        secondly = self.create_periodic_mixin(None, None, None)
+        assert secondly.nextExpiry(last) == datetime(2020, 1, 1, 10, 30, 16)
+
+        minutely = self.create_periodic_mixin(5, None, None)
+        assert minutely.nextExpiry(last) == datetime(2020, 1, 1, 10, 31, 5)
+
+        hourly = self.create_periodic_mixin(0, 0, None)
+        assert hourly.nextExpiry(last) == datetime(2020, 1, 1, 11, 0, 0)
+
+        daily = self.create_periodic_mixin(0, 0, 1)
+        assert daily.nextExpiry(last) == datetime(2020, 1, 2, 1, 0, 0)
+
+        interval = self.create_periodic_mixin(30, 1, None, interval=True)
+        assert interval.nextExpiry(last) == last + timedelta(seconds=91)
+
+        # unset fields finer than those given fire at their first boundary
+        minute = self.create_periodic_mixin(None, 5, None)
+        assert minute.nextExpiry(last) == datetime(2020, 1, 1, 11, 5, 0)
+
+        hour = self.create_periodic_mixin(None, None, 10)
+        assert hour.nextExpiry(last) == datetime(2020, 1, 2, 10, 0, 0)
+
+        hour_second = self.create_periodic_mixin(10, None, 10)
+        assert hour_second.nextExpiry(last) == datetime(2020, 1, 2, 10, 0, 10)
+
+        # every field given has to match
+        second_minute = self.create_periodic_mixin(56, 18, None)
+        assert second_minute.nextExpiry(last) == datetime(2020, 1, 1, 11, 18, 56)
+
+        second_minute_hour = self.create_periodic_mixin(7, 34, 22)
+        assert second_minute_hour.nextExpiry(last) == datetime(2020, 1, 1, 22, 34, 7)
+
+    def test_expired_periodics(self):
+        start = datetime(2020, 1, 1)
+        end = start + timedelta(days=30)
+
+        # a month gap only costs the number of hourly firings
+        hourly = self.create_periodic_mixin(0, 0, None, last=start)
+        mixin = TestMixin(hourly)
+        expired = list(mixin.expiredPeriodics(start, end, inclusive=False))
+        assert len(expired) == 30 * 24 - 1
+        assert expired[0] == (datetime(2020, 1, 1, 1), [hourly])
+        assert expired[-1][0] == end - timedelta(hours=1)
+        assert list(mixin.expiredPeriodics(end, end)) == [(end, [hourly])]
+
+        # firings are in time order, grouped by time
+        hourly = self.create_periodic_mixin(0, 0, None, last=start)
+        minutely = self.create_periodic_mixin(0, None, None, last=start)
+        mixin = TestMixin([hourly, minutely])
+        expired = list(mixin.expiredPeriodics(start, start + timedelta(hours=2)))
+        assert len(expired) == 120
+        assert [ts for ts, _ in expired] == sorted(ts for ts, _ in expired)
+        assert expired[59] == (datetime(2020, 1, 1, 1), [hourly, minutely])
+
+        # stopped periodics no longer fire
+        hourly.stop()
+        expired = list(mixin.expiredPeriodics(start, end))
+        assert all(periodics == [minutely] for _, periodics in expired)
+
+        # newly installed periodics fire no earlier than now
+        mixin = TestMixin(self.create_periodic_mixin(0, None, None, last=start))
+        expired = list(mixin.expiredPeriodics(end, end))
+        assert expired[0][0] == end
+
+    def test_expired_periodics_match_expires(self):
+        start = datetime(2020, 1, 1, 9, 30, 17)
+        end = start + timedelta(days=2)
+
+        for second, minute, hour, interval in (
+            (None, 5, None, False),
+            (None, None, 10, False),
+            (30, None, None, False),
+            (30, 1, None, True),
+            (56, 18, None, False),
+            (7, 34, 22, False),
+        ):
+            # fire by checking `expires` every second, as the live engine does
+            periodic = self.create_periodic_mixin(
+                second, minute, hour, last=start, interval=interval
+            )
+            expected = []
+            timestamp = start
+            while timestamp < end:
+                timestamp += timedelta(seconds=1)
+                if periodic.expires(timestamp):
+                    periodic._last = timestamp
+                    expected.append(timestamp)
+
+            periodic = self.create_periodic_mixin(
+                second, minute, hour, last=start, interval=interval
+            )
+            mixin = TestMixin(periodic)
+            assert [ts for ts, _ in mixin.expiredPeriodics(start, end)] == expected
+
     # no longer necessary
     # def test_removal_of_asterisk(self):
     #     with pytest.raises(Exception):
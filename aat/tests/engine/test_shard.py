@@ -0,0 +1,265 @@
+import asyncio
+import json
+import os
+import pickle
+import random
+from typing import Any
+
+import numpy as np  # type: ignore
+import pytest  # type: ignore
+
+from aat import Strategy, Event, Order, Trade, Side
+from aat.config import EventType
+from aat.engine import TradingEngine
+from aat.engine.shard import RingBuffer, ShardedEngine
+
+
+class BuyingStrategy(Strategy):
+    """buy on every 10th trade, and write what was seen to `path` on exit"""
+
+    def __init__(self, path: str, *args: Any, **kwargs: Any) -> None:
+        super(BuyingStrategy, self).__init__(*args, **kwargs)
+        self.path = path
+        self.trades = 0
+        self.bought = 0
+
+    async def onTrade(self, event: Event) -> None:
+        trade: Trade = event.target  # type: ignore
+        self.trades += 1
+
+        if self.trades % 5 == 0:
+            await self.newOrder(
+                Order(
+                    side=Side.BUY,
+                    price=trade.price,
+                    volume=1,
+                    instrument=trade.instrument,
+                    exchange=trade.exchange,
+                )
+            )
+
+    async def onBought(self, event: Event) -> None:
+        self.bought += 1
+
+    async def onExit(self, event: Event) -> None:
+        with open(self.path, "w") as fp:
+            json.dump(
+                {
+                    "trades": self.trades,
+                    "bought": self.bought,
+                    "positions": len(self.positions()),
+                    "orders": len(self.orders()),
+                },
+                fp,
+            )
+
+
+class DyingStrategy(BuyingStrategy):
+    """kill its worker partway through"""
+
+    async def onTrade(self, event: Event) -> None:
+        await super(DyingStrategy, self).onTrade(event)
+        if self.trades == 50:
+            os._exit(1)
+
+
+class TestRingBuffer:
+    def test_broadcast(self):
+        ring = RingBuffer.create(4, 64, 2)
+        try:
+            readers = [RingBuffer.attach(ring.name, i) for i in range(2)]
+
+            for i in range(4):
+                assert ring.publish(bytes([i]) * (i + 1))
+
+            # full until the slowest reader reads
+            assert len(ring) == 4
+            assert not ring.publish(b"x")
+            assert [readers[0].read() for _ in range(5)] == [
+                b"\x00",
+                b"\x01\x01",
+                b"\x02\x02\x02",
+                b"\x03\x03\x03\x03",
+                None,
+            ]
+            assert not ring.publish(b"x")
+
+            assert readers[1].read() == b"\x00"
+            assert ring.publish(b"x")
+            assert readers[0].read() == b"x"
+            assert len(ring) == 4
+
+            for reader in readers:
+                reader.close()
+        finally:
+            ring.close()
+            ring.unlink()
+
+    def test_detach(self):
+        ring = RingBuffer.create(4, 64, 2)
+        try:
+            reader = RingBuffer.attach(ring.name, 0)
+            for _ in range(4):
+                assert ring.publish(b"x")
+            assert not ring.publish(b"x")
+
+            # a reader that has gone away no longer holds the ring up
+            ring.detach(1)
+            assert len(ring) == 4
+            for _ in range(10):
+                assert reader.read() == b"x"
+                assert ring.publish(b"x")
+
+            ring.detach(0)
+            assert len(ring) == 0
+
+            reader.close()
+        finally:
+            ring.close()
+            ring.unlink()
+
+    def test_chunks(self):
+        ring = RingBuffer.create(4, 64, 1)
+        try:
+            reader = RingBuffer.attach(ring.name, 0)
+            assert ring.capacity() == 48
+
+            # split over as many slots as needed
+            assert ring.publish(b"x" * 49)
+            assert len(ring) == 2
+            assert ring.publish(b"y" * 96)
+            assert not ring.publish(b"z")
+            assert reader.read() == b"x" * 49
+            assert reader.read() == b"y" * 96
+            assert reader.read() is None
+
+            # wrapping around the end of the ring
+            assert ring.publish(b"z" * 144)
+            assert reader.read() == b"z" * 144
+
+            # but must fit in the ring
+            with pytest.raises(Exception):
+                ring.publish(b"x" * (48 * 4 + 1))
+
+            reader.close()
+        finally:
+            ring.close()
+            ring.unlink()
+
+
+class TestShardedEngine:
+    def _run(self, cls, tmp_path, **general):
+        random.seed(0)
+        np.random.seed(0)
+        paths = [str(tmp_path / "{}-{}.json".format(cls.__name__, i)) for i in range(3)]
+        engine = cls(
+            general=dict(general, verbose=0, trading_type="backtest", shards=2),
+            exchange={"exchanges": [["aat.exchange:SyntheticExchange", "1", "500"]]},
+            strategy={
+                "strategies": [
+                    ["aat.tests.engine.test_shard:BuyingStrategy", path]
+                    for path in paths
+                ]
+            },
+        )
+        engine.start()
+
+        results = []
+        for path in paths:
+            with open(path) as fp:
+                results.append(json.load(fp))
+        return engine, results
+
+    def test_sharded_engine(self, tmp_path):
+        engine, results = self._run(ShardedEngine, tmp_path)
+
+        # 3 strategies over 2 workers
+        assert [p.shard for p in engine.strategies] == [0, 1, 0]
+        assert [p.index for p in engine.strategies] == [0, 0, 1]
+        assert all(not p.is_alive() for p in engine._processes)
+
+        # orders were executed by the main process
+        for proxy, result in zip(engine.strategies, results):
+            assert result["bought"] > 0
+            assert result["bought"] == len(engine.manager.trades(proxy))
+
+        # backtests run in lockstep, so match running in process
+        _, expected = self._run(TradingEngine, tmp_path)
+        assert results == expected
+
+    def test_small_ring(self, tmp_path):
+        # events split over several slots, and the ring often full
+        engine, results = self._run(
+            ShardedEngine, tmp_path, ring_slots=16, ring_slot_size=128
+        )
+        assert not engine._backlog
+
+        _, expected = self._run(TradingEngine, tmp_path)
+        assert results == expected
+
+    def test_backlog(self, tmp_path):
+        engine = ShardedEngine(
+            general={"verbose": 0, "trading_type": "backtest", "ring_slots": 2},
+            exchange={"exchanges": [["aat.exchange:SyntheticExchange", "1", "500"]]},
+            strategy={
+                "strategies": [
+                    ["aat.tests.engine.test_shard:BuyingStrategy", str(tmp_path / "x")]
+                ]
+            },
+        )
+        try:
+            reader = RingBuffer.attach(engine._ring.name, 0)
+            events = [Event(type=EventType.DATA, target=i) for i in range(4)]
+            for event in events:
+                engine._publish(event)
+
+            # queued in order once the ring is full
+            assert engine._published == 4
+            assert len(engine._backlog) == 2
+
+            async def _catchUp():
+                catching = asyncio.ensure_future(engine._catchUp())
+                await asyncio.sleep(0.01)
+
+                # waiting on the reader, without blocking the event loop
+                assert not catching.done()
+                read = [reader.read(), reader.read()]
+                await asyncio.wait_for(catching, 1)
+                return read + [reader.read(), reader.read(), reader.read()]
+
+            read = engine.event_loop.run_until_complete(_catchUp())
+            assert [pickle.loads(r).target for r in read[:4]] == [0, 1, 2, 3]
+            assert read[4] is None
+            assert not engine._backlog
+
+            reader.close()
+        finally:
+            engine._ring.close()
+            engine._ring.unlink()
+
+    def test_worker_exits(self, tmp_path):
+        paths = [str(tmp_path / "{}.json".format(i)) for i in range(2)]
+        engine = ShardedEngine(
+            general={
+                "verbose": 0,
+                "trading_type": "backtest",
+                "shards": 2,
+                "ring_slots": 4,
+            },
+            exchange={"exchanges": [["aat.exchange:SyntheticExchange", "1", "500"]]},
+            strategy={
+                "strategies": [
+                    ["aat.tests.engine.test_shard:DyingStrategy", paths[0]],
+                    ["aat.tests.engine.test_shard:BuyingStrategy", paths[1]],
+                ]
+            },
+        )
+        engine.start()
+
+        # the other worker carried on to the end
+        assert engine._processes[0].exitcode == 1
+        assert engine._processes[1].exitcode == 0
+        assert not os.path.exists(paths[0])
+        with open(paths[1]) as fp:
+            assert json.load(fp)["trades"] > 50
+        assert not engine._backlog
@@ -0,0 +1,66 @@
+import asyncio
+
+from aat.config import EventType
+from aat.engine.stats import BUCKETS, EngineStats, Histogram
+
+from aat.tests.engine.test_engine import _engine, _trade
+
+
+class TestHistogram:
+    def test_record(self):
+        h = Histogram()
+        for value in (500, 1500, 1500, 2 * 10**9):
+            h.record(value)
+
+        assert h.count == 4
+        assert h.max == 2 * 10**9
+        assert h.counts[0] == 1
+        assert h.counts[1] == 2
+        assert h.counts[-1] == 1
+        assert h.percentile(50) == BUCKETS[1]
+        assert h.percentile(100) == 2 * 10**9
+        assert Histogram().percentile(50) == 0
+
+
+class TestEngineStats:
+    def test_wrap(self):
+        stats = EngineStats()
+        calls = []
+
+        def sync(event):
+            calls.append(event)
+
+        async def coro(event):
+            calls.append(event)
+
+        stats.wrap(sync, "handler", EventType.TRADE, True)(1)
+        asyncio.get_event_loop().run_until_complete(
+            stats.wrap(coro, "handler", EventType.DATA, False)(2)
+        )
+
+        assert calls == [1, 2]
+        assert stats.get("handler", EventType.TRADE).count == 1
+        assert stats.get("handler", EventType.DATA).count == 1
+        assert {row["type"] for row in stats.json()} == {"TRADE", "DATA"}
+        assert "handler" in stats.table()
+
+        stats.reset()
+        assert stats.json() == []
+
+    def test_engine_stats(self):
+        assert _engine().stats() is None
+
+        engine = _engine(instrument=1)
+        strategy = engine.strategies[0]
+        futures = engine.event_loop.run_until_complete(
+            engine.processEvent(_trade(engine, "TE.ST"))
+        )
+        engine.event_loop.run_until_complete(asyncio.gather(*futures))
+
+        rows = {(row["handler"], row["type"]): row for row in engine.stats().json()}
+        assert rows[(strategy.name(), "TRADE")]["count"] == 1
+        assert rows[("StrategyManager", "TRADE")]["count"] == 1
+
+        # manager fan-out
+        for mgr in ("PortfolioManager", "RiskManager", "OrderManager"):
+            assert rows[(mgr, "TRADE")]["count"] == 1
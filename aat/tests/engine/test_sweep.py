@@ -0,0 +1,145 @@
+import asyncio
+import os.path
+from datetime import datetime, timedelta
+
+import pytest  # type: ignore
+
+from aat.config import TradingType
+from aat.engine import TradingEngine, summarize, sweep, walkForward
+from aat.engine.sweep import _grid, windows
+from aat.exchange import historical
+from aat.exchange.generic import CSV
+
+_FILENAME = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "..",
+    "strategy",
+    "sample",
+    "csv",
+    "data",
+    "aapl.csv",
+)
+
+_STRATEGY = "aat.strategy.sample.sell_plus_percent:SellPlusPercentStrategy"
+
+
+def _config() -> dict:
+    return {
+        "general": {"verbose": 0, "trading_type": "backtest"},
+        "exchange": {"exchanges": [["aat.exchange.generic:CSV", _FILENAME]]},
+        "strategy": {"strategies": [[_STRATEGY, "5"]]},
+    }
+
+
+class TestSweep:
+    def test_grid(self):
+        assert _grid({"a": [1, 2], "b": ["x", "y"]}) == [
+            {"a": 1, "b": "x"},
+            {"a": 1, "b": "y"},
+            {"a": 2, "b": "x"},
+            {"a": 2, "b": "y"},
+        ]
+
+    def test_summarize(self):
+        engine = TradingEngine(**_config())
+        engine.start()
+        strategy = engine.strategies[0]
+        summary = summarize(engine, strategy)
+
+        # bought, then sold up 5%
+        position = engine.manager.positions(strategy)[0]
+        assert summary["trades"] == 2
+        assert summary["pnl"] == position.pnl + position.unrealizedPnl
+        assert summary["pnl"] > 0
+        assert summary["drawdown"] >= 0
+
+    def test_preload(self):
+        try:
+            exchange = CSV(TradingType.BACKTEST, False, _FILENAME)
+            asyncio.get_event_loop().run_until_complete(exchange.preload())
+
+            # later exchanges reuse the parsed file
+            other = CSV(TradingType.BACKTEST, False, _FILENAME)
+            asyncio.get_event_loop().run_until_complete(other.connect())
+            assert other._data is exchange._data
+        finally:
+            historical.clear()
+
+    def test_sweep(self):
+        df = sweep(_config(), _STRATEGY, {"percent": [2, 5, 10]}, workers=2)
+        assert list(df.columns) == ["percent", "pnl", "sharpe", "drawdown", "trades"]
+        assert list(df["percent"]) == [2, 5, 10]
+
+        # wider targets, bigger wins
+        assert (df["trades"] == 2).all()
+        assert df["pnl"].is_monotonic_increasing
+
+
+class TestWalkForward:
+    def test_windows(self):
+        day = timedelta(days=1)
+        start = datetime(2020, 1, 1)
+        assert windows(start, start + 10 * day, 4 * day, 3 * day) == [
+            (start, start + 4 * day, start + 7 * day),
+            (start + 3 * day, start + 7 * day, start + 10 * day),
+        ]
+        # last out of sample period cut short
+        assert windows(start, start + 10 * day, 4 * day, 4 * day) == [
+            (start, start + 4 * day, start + 8 * day),
+            (start + 4 * day, start + 8 * day, start + 10 * day),
+        ]
+
+    def test_walk_forward(self):
+        df = walkForward(
+            _config(),
+            _STRATEGY,
+            {"percent": [1, 5, 10]},
+            datetime(2020, 6, 11),
+            datetime(2020, 9, 11),
+            timedelta(days=30),
+            timedelta(days=30),
+            objective="pnl",
+            workers=2,
+        )
+        assert list(df["out_of_sample_start"]) == [
+            datetime(2020, 7, 11),
+            datetime(2020, 8, 10),
+            datetime(2020, 9, 9),
+        ]
+        assert list(df["out_of_sample_end"]) == [
+            datetime(2020, 8, 10),
+            datetime(2020, 9, 9),
+            datetime(2020, 9, 11),
+        ]
+
+        # the chosen parameters were the best in sample
+        for _, row in df.iterrows():
+            in_sample = sweep(
+                dict(
+                    _config(),
+                    general=dict(
+                        _config()["general"],
+                        start_date=row["in_sample_start"],
+                        end_date=row["out_of_sample_start"],
+                    ),
+                ),
+                _STRATEGY,
+                {"percent": [1, 5, 10]},
+                workers=1,
+            )
+            assert row["in_sample_pnl"] == in_sample["pnl"].max()
+            assert row["percent"] == in_sample["percent"][in_sample["pnl"].idxmax()]
+
+    def test_unknown_objective(self):
+        with pytest.raises(Exception):
+            walkForward(
+                _config(),
+                _STRATEGY,
+                {"percent": [1]},
+                datetime(2020, 6, 11),
+                datetime(2020, 9, 11),
+                timedelta(days=30),
+                timedelta(days=30),
+                objective="unknown",
+            )
@@ -0,0 +1,152 @@
+import asyncio
+import os.path
+from datetime import datetime, timedelta, timezone
+
+from aat.config import TradingType
+from aat.core import Clock
+from aat.exchange import HistoricalCache, historical
+from aat.exchange.generic import CSV
+
+from aat.tests.engine.test_sweep import _FILENAME
+
+
+async def _targets(exchange):
+    return [event.target async for event in exchange.tick()]
+
+
+class TestHistoricalCache:
+    def test_get(self):
+        cache = HistoricalCache()
+        loads = []
+
+        def _load():
+            loads.append(1)
+            return iter(range(3))
+
+        key = cache.key("test", ["A", "B", "A"])
+        assert key == ("test", ("A", "B"), None, None)
+
+        data = cache.get(key, _load)
+        assert data == (0, 1, 2)
+
+        # loaded once, then shared
+        assert cache.get(key, _load) is data
+        assert loads == [1]
+        assert key in cache
+        assert len(cache) == 1
+
+        cache.clear()
+        assert key not in cache
+        cache.get(key, _load)
+        assert loads == [1, 1]
+
+    def test_csv(self):
+        try:
+            exchange = CSV(TradingType.BACKTEST, False, _FILENAME)
+            asyncio.get_event_loop().run_until_complete(exchange.connect())
+            assert len(historical) == 1
+
+            # trades carry their exchange, named after the file as given
+            other = CSV(TradingType.BACKTEST, False, os.path.abspath(_FILENAME))
+            asyncio.get_event_loop().run_until_complete(other.connect())
+            assert len(historical) == 2
+
+            # same file, same trades
+            again = CSV(TradingType.BACKTEST, False, _FILENAME)
+            asyncio.get_event_loop().run_until_complete(again.connect())
+            assert len(historical) == 2
+            assert again._data is exchange._data
+            assert again._data[0] is exchange._data[0]
+        finally:
+            historical.clear()
+
+    def test_since(self):
+        class _Trade:
+            def __init__(self, timestamp):
+                self.timestamp = timestamp
+
+        cache = HistoricalCache()
+        ordered = cache.get(
+            "ordered", lambda: (_Trade(datetime(2020, 1, day)) for day in (1, 2, 2, 5))
+        )
+        assert len(ordered) == 4
+        assert cache.since("ordered", datetime(2019, 1, 1)) == 0
+        assert cache.since("ordered", datetime(2020, 1, 2)) == 1
+        assert cache.since("ordered", datetime(2020, 1, 3)) == 3
+        assert cache.since("ordered", datetime(2021, 1, 1)) == 4
+
+        # naive timestamps in the given timezone, localized as loaded
+        tz = timezone(timedelta(hours=-5))
+        local = cache.get(
+            "ordered",
+            lambda: (_Trade(datetime(2020, 1, day)) for day in (1, 2, 2, 5)),
+            tz,
+        )
+        assert local is not ordered
+        assert all(trade.timestamp.tzinfo is tz for trade in local)
+        assert all(trade.timestamp.tzinfo is None for trade in ordered)
+        assert (
+            cache.since("ordered", datetime(2020, 1, 2, 5, tzinfo=timezone.utc), tz)
+            == 1
+        )
+        assert (
+            cache.since("ordered", datetime(2020, 1, 2, 6, tzinfo=timezone.utc), tz)
+            == 3
+        )
+
+        # can't bisect out of order trades
+        cache.get(
+            "unordered", lambda: (_Trade(datetime(2020, 1, day)) for day in (2, 1, 3))
+        )
+        assert cache.since("unordered", datetime(2020, 1, 3)) == 0
+
+    def test_csv_seek(self):
+        async def _timestamps(exchange):
+            return [event.target.timestamp async for event in exchange.tick()]
+
+        try:
+            exchange = CSV(TradingType.BACKTEST, False, _FILENAME)
+            asyncio.get_event_loop().run_until_complete(exchange.connect())
+            everything = asyncio.get_event_loop().run_until_complete(
+                _timestamps(exchange)
+            )
+
+            start = datetime(2020, 8, 1)
+            exchange.seek(start)
+            window = asyncio.get_event_loop().run_until_complete(_timestamps(exchange))
+            assert window == [when for when in everything if when >= start]
+            assert 0 < len(window) < len(everything)
+        finally:
+            historical.clear()
+
+    def test_replay(self):
+        from aat.engine import TradingEngine
+        from aat.tests.engine.test_sweep import _config
+
+        try:
+            config = _config()
+            config["general"] = dict(
+                config["general"], api=False, timezone="America/New_York"
+            )
+            TradingEngine(**config).start()
+
+            # cached in the engine's timezone, localized once as loaded
+            (_, tz), data = next(iter(historical._data.items()))
+            assert tz is not None
+            assert all(trade.timestamp.tzinfo is tz for trade in data)
+            before = [trade.json() for trade in data]
+
+            # engines replay the cached trades themselves, without modifying them
+            exchange = CSV(TradingType.BACKTEST, False, _FILENAME)
+            clock = Clock()
+            clock.simulate(datetime.fromtimestamp(0, tz=tz))
+            exchange.setClock(clock)
+            asyncio.get_event_loop().run_until_complete(exchange.connect())
+            replayed = asyncio.get_event_loop().run_until_complete(_targets(exchange))
+            assert all(a is b for a, b in zip(replayed, data))
+
+            TradingEngine(**config).start()
+            assert len(historical) == 1
+            assert [trade.json() for trade in data] == before
+        finally:
+            historical.clear()
@@ -0,0 +1,251 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import pytest  # type: ignore
+
+from aat import Data, Event, ExchangeType, Instrument, Order, Side, Strategy, Trade
+from aat.config import EventType, OrderType, TradingType
+from aat.engine import TradingEngine
+from aat.exchange.generic import JournalExchange, JournalReader, JournalWriter
+
+from aat.tests.engine.test_sweep import _FILENAME, _STRATEGY
+
+_EXCHANGE = ExchangeType("journal-test")
+
+_CPP_ROUND_TRIP = """
+import tempfile
+from aat.config import EventType, Side
+from aat.core import Event, Instrument, Order
+from aat.exchange.generic import JournalReader, JournalWriter
+
+with tempfile.TemporaryDirectory() as path:
+    writer = JournalWriter(path + "/journal.aat")
+    writer.write(Event(EventType.OPEN, Order(1.0, 10.0, Side.SELL, Instrument("JO.URNAL"))))
+    writer.close()
+    event = list(JournalReader(path + "/journal.aat"))[0][2]
+    assert event.type == EventType.OPEN
+    assert event.target.side == Side.SELL
+"""
+
+
+class _EveryStrategy(Strategy):
+    """buy every `n` trades"""
+
+    def __init__(self, n: str) -> None:
+        super().__init__()
+        self._n = int(n)
+        self._seen = 0
+
+    async def onTrade(self, event: Event) -> None:
+        self._seen += 1
+        if self._seen % self._n == 0:
+            trade = event.target
+            await self.newOrder(
+                Order(1.0, trade.price, Side.BUY, trade.instrument, trade.exchange)
+            )
+
+
+def _order(id, price=10.0, **kwargs):
+    return Order(
+        volume=2.0,
+        price=price,
+        side=Side.BUY,
+        instrument=Instrument("JO.URNAL"),
+        exchange=_EXCHANGE,
+        id=id,
+        **kwargs,
+    )
+
+
+def _events():
+    taker = _order("a", filled=2.0, timestamp=datetime(2020, 1, 1, 9, 30, 0, 1))
+    maker = _order(2, order_type=OrderType.LIMIT)
+    stop = Order(
+        volume=0,
+        price=9.0,
+        side=Side.SELL,
+        instrument=Instrument("JO.URNAL"),
+        exchange=_EXCHANGE,
+        order_type=OrderType.STOP,
+        stop_target=_order(3),
+        timestamp=datetime(2020, 1, 1, tzinfo=timezone.utc),
+    )
+    return [
+        Event(EventType.TRADE, Trade(2.0, 10.0, taker, [maker], id="t1")),
+        Event(EventType.OPEN, maker),
+        Event(EventType.RECEIVED, stop),
+        Event(
+            EventType.DATA,
+            Data(Instrument("JO.URNAL"), _EXCHANGE, {"a": [1, 2]}, id=7),
+        ),
+        Event(EventType.HALT, None),
+        Event(EventType.HEARTBEAT, None),
+    ]
+
+
+def _order_fields(order):
+    return (
+        order.id,
+        order.timestamp,
+        order.instrument,
+        order.exchange,
+        order.volume,
+        order.price,
+        order.filled,
+        order.side,
+        order.order_type,
+        order.flag,
+    )
+
+
+class TestJournal:
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "journal.aat")
+        events = _events()
+
+        writer = JournalWriter(path)
+        for event in events:
+            writer.write(event, 1 if event.type == EventType.RECEIVED else None)
+        writer.close()
+
+        read = list(JournalReader(path))
+        assert len(read) == 5
+        assert [r[1] for r in read] == [None, None, 1, None, None]
+
+        # stamped with the time of the event, naive timestamps as UTC
+        assert read[0][0] == 1577871000000001000
+        assert read[2][0] == 1577836800000000000
+
+        trade = read[0][2].target
+        assert read[0][2].type == EventType.TRADE
+        assert (trade.id, trade.volume, trade.price) == ("t1", 2.0, 10.0)
+        assert _order_fields(trade.taker_order) == _order_fields(
+            events[0].target.taker_order
+        )
+        assert _order_fields(trade.maker_orders[0]) == _order_fields(
+            events[0].target.maker_orders[0]
+        )
+
+        stop = read[2][2].target
+        assert _order_fields(stop) == _order_fields(events[2].target)
+        assert stop.timestamp.tzinfo is not None
+        assert stop.stop_target.id == 3
+
+        data = read[3][2].target
+        assert (data.id, data.instrument, data.data) == (
+            7,
+            Instrument("JO.URNAL"),
+            {"a": [1, 2]},
+        )
+        assert read[4][2].type == EventType.HALT
+        assert read[4][2].target is None
+
+    def test_append(self, tmp_path):
+        path = str(tmp_path / "journal.aat")
+        for id in ("a", "b"):
+            writer = JournalWriter(path)
+            writer.write(Event(EventType.OPEN, _order(id)))
+            writer.close()
+
+        # partially written record at the end
+        with open(path, "ab") as file:
+            file.write(b"\x40\x00\x00\x00\x03\x00")
+
+        read = list(JournalReader(path, ExchangeType("other")))
+        assert [r[2].target.id for r in read] == ["a", "b"]
+        assert read[1][2].target.exchange == ExchangeType("other")
+
+    def test_record_and_replay(self, tmp_path):
+        path = str(tmp_path / "journal.aat")
+
+        def _run(exchange, **general):
+            engine = TradingEngine(
+                general=dict(general, verbose=0, trading_type="backtest"),
+                exchange={"exchanges": [exchange]},
+                strategy={"strategies": [[_STRATEGY, "5"]]},
+            )
+            engine.start()
+            strategy = engine.strategies[0]
+            return [
+                (t.side, t.price, t.volume, t.timestamp)
+                for t in engine.manager.trades(strategy)
+            ]
+
+        recorded = _run(["aat.exchange.generic:CSV", _FILENAME], journal=path)
+        replayed = _run(["aat.exchange.generic:JournalExchange", path])
+        assert len(recorded) == 2
+        assert replayed == recorded
+
+        # the recording includes the strategy's fills
+        entries = [r for r in JournalReader(path) if r[1] is not None]
+        assert [r[2].type for r in entries] == [
+            EventType.RECEIVED,
+            EventType.BOUGHT,
+            EventType.RECEIVED,
+            EventType.SOLD,
+        ]
+
+    def test_replay_traded(self, tmp_path):
+        path = str(tmp_path / "journal.aat")
+
+        def _run(exchange, n, **general):
+            engine = TradingEngine(
+                general=dict(general, verbose=0, trading_type="backtest"),
+                exchange={"exchanges": [exchange]},
+                strategy={
+                    "strategies": [
+                        ["aat.tests.exchange.test_journal:_EveryStrategy", n]
+                    ]
+                },
+            )
+            engine.start()
+            return engine.strategies[0]
+
+        recorded = _run(["aat.exchange.generic:CSV", _FILENAME], "20", journal=path)
+        assert len(recorded.trades()) == 3
+
+        # the session's own fills aren't market data
+        assert not any(
+            r[2].type == EventType.TRADE and r[2].target.my_order is not None
+            for r in JournalReader(path)
+        )
+
+        replayed = _run(["aat.exchange.generic:JournalExchange", path], "30")
+        assert replayed._seen - len(replayed.trades()) == recorded._seen - len(
+            recorded.trades()
+        )
+        assert len(replayed.trades()) == 2
+
+    def test_cpp_enums(self):
+        pytest.importorskip("aat.binding")
+        subprocess.run(
+            [sys.executable, "-c", _CPP_ROUND_TRIP],
+            env=dict(os.environ, AAT_USE_CPP="1"),
+            check=True,
+        )
+
+    def test_speed(self, tmp_path):
+        path = str(tmp_path / "journal.aat")
+        writer = JournalWriter(path)
+        for id in ("a", "b"):
+            writer.write(Event(EventType.OPEN, _order(id)))
+            time.sleep(0.1)
+        writer.close()
+
+        async def _replay(speed):
+            exchange = JournalExchange(TradingType.SIMULATION, False, path, speed)
+            start = time.monotonic()
+            events = [event async for event in exchange.tick()]
+            return events, time.monotonic() - start
+
+        events, elapsed = asyncio.get_event_loop().run_until_complete(_replay("0"))
+        assert [e.target.id for e in events] == ["a", "b"]
+        assert events[0].target.exchange == ExchangeType("journal-{}".format(path))
+        assert elapsed < 0.1
+
+        _, elapsed = asyncio.get_event_loop().run_until_complete(_replay("0.5"))
+        assert elapsed >= 0.2
@@ -0,0 +1,26 @@
+import json
+import subprocess
+import sys
+
+_CODE = """
+import json, sys
+import aat
+aat.TradingEngine(
+    general={"verbose": 0, "trading_type": "backtest"},
+    exchange={"exchanges": [["aat.exchange:SyntheticExchange", "1", "10"]]},
+    strategy={"strategies": ["aat.strategy.sample.readonly:ReadOnlyStrategy"]},
+)
+print(json.dumps(list(sys.modules)))
+"""
+
+
+class TestImports:
+    def test_lazy_imports(self):
+        out = subprocess.run(
+            [sys.executable, "-c", _CODE], check=True, capture_output=True, text=True
+        ).stdout
+        modules = json.loads(out.splitlines()[-1])
+
+        # only imported by the features which need them
+        for module in ("matplotlib", "numpy", "pandas", "perspective", "tornado"):
+            assert module not in modules
@@ -0,0 +1,109 @@
+"""Benchmark the engine's event dispatch on the `SyntheticExchange` backtest.
+
+Runs the same deterministic backtest with synchronous strategy callbacks
+dispatched through the executor, inline on the event loop, and through the
+`BacktestEngine` (whose async callbacks are started eagerly on Python 3.12+),
+and reports events/sec for each. It also reports how fast the exchange
+generates the events on its own, which bounds any engine's speedup.
+
+    python -m benchmarks.engine_dispatch [cycles]
+"""
+
+import asyncio
+import random
+import sys
+import time
+from typing import Any, Dict, Type
+
+import numpy as np  # type: ignore
+
+from aat import Strategy, Event, BacktestEngine, TradingEngine
+from aat.config import EventType, TradingType
+from aat.exchange import SyntheticExchange
+
+# events seen by `SyncStrategy`
+_COUNTED = (EventType.TRADE, EventType.OPEN, EventType.CANCEL, EventType.CHANGE)
+
+
+class SyncStrategy(Strategy):
+    """Strategy with purely synchronous callbacks"""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super(SyncStrategy, self).__init__(*args, **kwargs)
+        self.count = 0
+
+    def onTrade(self, event: Event) -> None:  # type: ignore[override]
+        self.count += 1
+
+    def onOpen(self, event: Event) -> None:  # type: ignore[override]
+        self.count += 1
+
+    def onCancel(self, event: Event) -> None:  # type: ignore[override]
+        self.count += 1
+
+    def onChange(self, event: Event) -> None:  # type: ignore[override]
+        self.count += 1
+
+
+def _config(cycles: int, inline: bool) -> Dict[str, Dict[str, Any]]:
+    return {
+        "general": {
+            "verbose": 0,
+            "trading_type": "backtest",
+            "inline_callbacks": int(inline),
+        },
+        "exchange": {
+            "exchanges": [["aat.exchange:SyntheticExchange", "1", str(cycles)]]
+        },
+        "strategy": {"strategies": ["benchmarks.engine_dispatch:SyncStrategy"]},
+    }
+
+
+def run(
+    cycles: int, inline: bool, engine_type: Type[TradingEngine] = TradingEngine
+) -> float:
+    """run one backtest, return events/sec seen by the strategy"""
+    random.seed(0)
+    np.random.seed(0)
+
+    engine = engine_type(**_config(cycles, inline))
+    start = time.perf_counter()
+    engine.start()
+    elapsed = time.perf_counter() - start
+
+    count = engine.strategies[0].count
+    return count / elapsed
+
+
+def generate(cycles: int) -> float:
+    """pull the same events from the exchange with no engine, return events/sec"""
+    random.seed(0)
+    np.random.seed(0)
+
+    async def _generate() -> int:
+        exchange = SyntheticExchange(TradingType.BACKTEST, False, 1, cycles)
+        await exchange.connect()
+        return sum([1 async for event in exchange.tick() if event.type in _COUNTED])
+
+    start = time.perf_counter()
+    count = asyncio.new_event_loop().run_until_complete(_generate())
+    elapsed = time.perf_counter() - start
+    return count / elapsed
+
+
+def main(cycles: int = 5000) -> None:
+    executor = run(cycles, inline=False)
+    inline = run(cycles, inline=True)
+    backtest = run(cycles, inline=True, engine_type=BacktestEngine)
+    exchange = generate(cycles)
+    print("executor: {:>12.1f} events/sec".format(executor))
+    print("inline:   {:>12.1f} events/sec".format(inline))
+    print("backtest: {:>12.1f} events/sec".format(backtest))
+    print("exchange: {:>12.1f} events/sec (no engine)".format(exchange))
+    print("speedup:  {:>12.2f}x (inline)".format(inline / executor))
+    print("speedup:  {:>12.2f}x (backtest)".format(backtest / executor))
+    print("speedup:  {:>12.2f}x (exchange, upper bound)".format(exchange / executor))
+
+
+if __name__ == "__main__":
+    main(*(int(_) for _ in sys.argv[1:2]))
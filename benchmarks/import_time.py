@@ -0,0 +1,74 @@
+"""Benchmark the cost of importing aat, and of constructing an engine.
+
+Times `python -c "import aat"` in fresh interpreters, and constructing a
+backtest `TradingEngine` on the `SyntheticExchange` in an interpreter which
+has only imported aat, and reports which of the heavy optional dependencies
+(plotting, dataframes, web server) each loaded.
+
+    python -m benchmarks.import_time [runs]
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+# dependencies only some features need, which shouldn't be imported otherwise
+HEAVY = ("matplotlib", "numpy", "pandas", "perspective", "tornado")
+
+_IMPORT = """
+import json, sys, time
+start = time.perf_counter()
+import aat
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": list(sys.modules)}))
+"""
+
+_ENGINE = """
+import json, sys, time
+import aat
+start = time.perf_counter()
+aat.TradingEngine(
+    general={"verbose": 0, "trading_type": "backtest"},
+    exchange={"exchanges": [["aat.exchange:SyntheticExchange", "1", "10"]]},
+    strategy={"strategies": ["aat.strategy.sample.readonly:ReadOnlyStrategy"]},
+)
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": list(sys.modules)}))
+"""
+
+
+def _run(code: str) -> Dict[str, Any]:
+    out = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def _heavy(modules: List[str]) -> List[str]:
+    return [m for m in HEAVY if m in modules]
+
+
+def run(code: str, runs: int) -> Dict[str, Any]:
+    """run `code` in `runs` fresh interpreters, return the median time it
+    reported and the heavy modules it loaded"""
+    results = [_run(code) for _ in range(runs)]
+    return {
+        "elapsed": statistics.median(r["elapsed"] for r in results),
+        "heavy": _heavy(results[-1]["modules"]),
+    }
+
+
+def main(runs: int = 5) -> None:
+    for name, code in (("import aat:", _IMPORT), ("engine:", _ENGINE)):
+        result = run(code, runs)
+        print(
+            "{:<12}{:>9.1f} ms  (loaded: {})".format(
+                name, result["elapsed"] * 1000, ", ".join(result["heavy"]) or "-"
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(_) for _ in sys.argv[1:2]))